@@ -4,7 +4,7 @@ import sys
 import pkg_resources
 from spacy.util import run_command
 from .training.train import TrainingManager
-from .manager import COMMON_MODELS_PACKAGE_NAMEPART
+from .manager import COMMON_MODELS_PACKAGE_NAMEPART, convert_installed_models
 
 DOWNLOAD_URL = "https://github.com/explosion/coreferee/raw/master/models"
 
@@ -126,5 +126,6 @@ elif args.command == "install":
                 )
             )
         )
+    convert_installed_models(args.lang)
 else:
     parser.print_help()
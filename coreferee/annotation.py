@@ -1,82 +1,261 @@
-from typing import Dict, Set, List, Deque, cast
+from typing import Set, List, Deque, Optional, Tuple, Union, cast
 from collections import deque
+from copy import copy
+from time import perf_counter
 from spacy.tokens import Doc, Token, Span
 from spacy.language import Language
 from thinc.model import Model
+from wasabi import Printer  # type: ignore[import]
 from .data_model import Mention, Chain, FeatureTable
+from .errors import InvalidSettingError
+from .mention_sets import MentionSets
 from .rules import RulesAnalyzerFactory
 from .tendencies import TendenciesAnalyzer
+from .tendencies import create_partial_ensemble, get_ensemble_members
+
+
+class RetrySearch:
+    """Tracks the work done by a single call to *Annotator.attempt_retry()*."""
+
+    def __init__(self, anaphor_indexes: List[int], node_budget: int):
+
+        # The indexes of the anaphors whose interpretations may change during the search
+        self.anaphor_indexes = anaphor_indexes
+
+        # The number of further attempts to link an anaphor that may be made
+        self.remaining_nodes = node_budget
+
+        # States from which replaying the remaining anaphors is known to fail
+        self.failed_states: Set[Tuple[Optional[int], ...]] = set()
+
+    def get_state(self, working_token: Token, mention_sets: MentionSets) -> Tuple:
+        """Returns a key for the chains built up to *working_token*, which depend only on
+        the potential referreds chosen for the preceding anaphors."""
+        return (working_token.i,) + tuple(
+            mention_sets.referred_indexes.get(anaphor_index)
+            for anaphor_index in self.anaphor_indexes
+            if anaphor_index < working_token.i
+        )
+
+
+class TimeBudget:
+    """Tracks the time spent annotating a single document against a budget. As more of the
+    budget is used up, the stages in *STAGES* are skipped in turn. Each stage that has been
+    skipped is recorded in *skipped_stages* and stays skipped.
+
+    The clock runs from creation until *stop()* is called and again after each call to
+    *start()*, so that when documents are annotated in a batch, each document is only
+    charged for the work done on it."""
+
+    # Each stage with the fraction of the budget after which it is skipped: retrying
+    # alternative interpretations of anaphors, scoring potential pairs with the neural
+    # ensemble rather than ordering them by rules, and annotating further sentences
+    STAGES = (("retries", 0.25), ("scoring", 0.5), ("annotation", 1.0))
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.elapsed = 0.0
+        self.start_time: Optional[float] = perf_counter()
+        self.skipped_stages: List[str] = []
+
+    def start(self) -> None:
+        if self.start_time is None:
+            self.start_time = perf_counter()
+
+    def stop(self) -> None:
+        if self.start_time is not None:
+            self.elapsed += perf_counter() - self.start_time
+            self.start_time = None
+
+    def charge(self, seconds: float) -> None:
+        """Adds time spent on work shared with other documents."""
+        self.elapsed += seconds
+
+    def permits(self, stage: str) -> bool:
+        if stage in self.skipped_stages:
+            return False
+        elapsed = self.elapsed
+        if self.start_time is not None:
+            elapsed += perf_counter() - self.start_time
+        for working_stage, fraction in self.STAGES:
+            if (
+                elapsed >= self.seconds * fraction
+                and working_stage not in self.skipped_stages
+            ):
+                self.skipped_stages.append(working_stage)
+        return stage not in self.skipped_stages
 
 
 class Annotator:
 
     RETRY_DEPTH = 5
 
+    # The number of seconds after which the annotation of a document is degraded as
+    # described for *TimeBudget*, or *None* if there is no limit
+    TIME_BUDGET: Optional[float] = None
+
+    # The maximum number of attempts to link an anaphor that a single call to
+    # *attempt_retry()* may make. Once it is used up, the original interpretation is kept.
+    RETRY_NODE_BUDGET = 60
+
     def __init__(
         self,
         nlp: Language,
         vectors_nlp: Language,
         feature_table: FeatureTable,
         thinc_ensemble: Model,
+        *,
+        artifact_filename: Optional[str] = None
     ):
         self.thinc_ensemble = thinc_ensemble
+
+        # The ensemble as trained; differs from *thinc_ensemble* if *with_settings()* was
+        # used to reduce the number of members
+        self.trained_thinc_ensemble = thinc_ensemble
+
+        # The model artifact from which *feature_table* and *thinc_ensemble* were read, if any
+        self.artifact_filename = artifact_filename
         self.rules_analyzer = RulesAnalyzerFactory().get_rules_analyzer(nlp)
         self.tendencies_analyzer = TendenciesAnalyzer(
             self.rules_analyzer, vectors_nlp, feature_table
         )
+        self.tendencies_analyzer.reduced_vector_tables = {}
+
+    def with_settings(
+        self,
+        *,
+        retry_depth: Optional[int] = None,
+        ensemble_size: Optional[int] = None,
+        maximum_anaphora_sentence_referential_distance: Optional[int] = None,
+        maximum_coreferring_nouns_sentence_referential_distance: Optional[int] = None,
+        time_budget: Optional[float] = None
+    ) -> "Annotator":
+        """Returns an annotator that shares the rules, the feature table and the ensemble
+        weights of this annotator but uses the settings that are not *None* in place of the
+        defaults. *ensemble_size* may not exceed the number of members the ensemble was
+        trained with; using fewer members speeds up scoring at the expense of accuracy.
+        """
+
+        def validate(
+            name: str,
+            value: Optional[Union[int, float]],
+            minimum: Union[int, float],
+            maximum: Optional[int] = None,
+            *,
+            permit_float: bool = False
+        ) -> None:
+            if value is None:
+                return
+            if (
+                not isinstance(value, (int, float) if permit_float else int)
+                or isinstance(value, bool)
+                or value < minimum
+                or (maximum is not None and value > maximum)
+                or (permit_float and value == minimum)
+            ):
+                error_msg = "".join(
+                    (
+                        "Coreferee setting '",
+                        name,
+                        "' must be a number greater than "
+                        if permit_float
+                        else "' must be an integer of at least ",
+                        str(minimum),
+                        "" if maximum is None else " and at most " + str(maximum),
+                        ", not ",
+                        repr(value),
+                        ".",
+                    )
+                )
+                Printer().fail(error_msg)
+                raise InvalidSettingError(error_msg)
+
+        validate("retry_depth", retry_depth, 1)
+        validate(
+            "ensemble_size",
+            ensemble_size,
+            1,
+            len(get_ensemble_members(self.trained_thinc_ensemble)),
+        )
+        validate(
+            "maximum_anaphora_sentence_referential_distance",
+            maximum_anaphora_sentence_referential_distance,
+            0,
+        )
+        validate(
+            "maximum_coreferring_nouns_sentence_referential_distance",
+            maximum_coreferring_nouns_sentence_referential_distance,
+            0,
+        )
+        validate("time_budget", time_budget, 0, permit_float=True)
+        annotator = copy(self)
+        if retry_depth is not None:
+            annotator.RETRY_DEPTH = retry_depth
+        if time_budget is not None:
+            annotator.TIME_BUDGET = time_budget
+        if ensemble_size is not None:
+            annotator.thinc_ensemble = create_partial_ensemble(
+                self.trained_thinc_ensemble, ensemble_size
+            )
+        if (
+            maximum_anaphora_sentence_referential_distance is not None
+            or maximum_coreferring_nouns_sentence_referential_distance is not None
+        ):
+            rules_analyzer = annotator.rules_analyzer = copy(self.rules_analyzer)
+            if maximum_anaphora_sentence_referential_distance is not None:
+                rules_analyzer.maximum_anaphora_sentence_referential_distance = (
+                    maximum_anaphora_sentence_referential_distance
+                )
+            if maximum_coreferring_nouns_sentence_referential_distance is not None:
+                rules_analyzer.maximum_coreferring_nouns_sentence_referential_distance = (
+                    maximum_coreferring_nouns_sentence_referential_distance
+                )
+        return annotator
 
     @staticmethod
     def record_mention(
-        preceding_mention: Mention,
-        token: Token,
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
+        preceding_mention: Mention, token: Token, mention_sets: MentionSets
     ) -> None:
-        """*token_indexes_without_coordination_to_mention_sets* is the main means of
-        generating and tracking chains.
-
-        *token_indexes_with_coordination_to_mention_sets* tracks the ends of chains that
-        end in a mention with coordination. It is necessary for the case where two anaphors
-        both refer to a mention with coordination. It has to be kept separate from the main
-        dictionary to cover the case where a mention with coordination itself contains an
-        anaphor that belongs to a separate chain.
+        """*mention_sets.without_coordination* is the main means of generating and tracking
+        chains.
+
+        *mention_sets.with_coordination* tracks the ends of chains that end in a mention with
+        coordination. It is necessary for the case where two anaphors both refer to a mention
+        with coordination. It has to be kept separate from the main dictionary to cover the
+        case where a mention with coordination itself contains an anaphor that belongs to a
+        separate chain.
         """
+        without_coordination = mention_sets.without_coordination
         if len(preceding_mention.token_indexes) > 1:
-            if (
-                preceding_mention.root_index
-                in token_indexes_with_coordination_to_mention_sets
-            ):
-                mention_set = token_indexes_with_coordination_to_mention_sets[
+            if preceding_mention.root_index in mention_sets.with_coordination:
+                mention_set = mention_sets.with_coordination[
                     preceding_mention.root_index
                 ]
             else:
                 mention_set = {preceding_mention}
                 for token_index in preceding_mention.token_indexes:
-                    token_indexes_with_coordination_to_mention_sets[
-                        token_index
-                    ] = mention_set
+                    mention_sets.set_item(
+                        mention_sets.with_coordination, token_index, mention_set
+                    )
         else:
             preceding_token = token.doc[preceding_mention.root_index]
-            if preceding_token.i in token_indexes_without_coordination_to_mention_sets:
-                mention_set = token_indexes_without_coordination_to_mention_sets[
-                    preceding_token.i
-                ]
+            if preceding_token.i in without_coordination:
+                mention_set = without_coordination[preceding_token.i]
             else:
                 mention_set = {preceding_mention}
-                token_indexes_without_coordination_to_mention_sets[
-                    preceding_token.i
-                ] = mention_set
-        mention_set.add(Mention(token, False))
-        if token.i in token_indexes_without_coordination_to_mention_sets:
-            mention_set.update(
-                token_indexes_without_coordination_to_mention_sets[token.i]
-            )
-            for mention in token_indexes_without_coordination_to_mention_sets[token.i]:
-                token_indexes_without_coordination_to_mention_sets[
-                    mention.root_index
-                ] = mention_set
+                mention_sets.set_item(
+                    without_coordination, preceding_token.i, mention_set
+                )
+        mention_sets.add_mentions(mention_set, (Mention(token, False),))
+        if token.i in without_coordination:
+            token_mention_set = without_coordination[token.i]
+            mention_sets.add_mentions(mention_set, token_mention_set)
+            for mention in list(token_mention_set):
+                mention_sets.set_item(
+                    without_coordination, mention.root_index, mention_set
+                )
         else:
-            token_indexes_without_coordination_to_mention_sets[token.i] = mention_set
+            mention_sets.set_item(without_coordination, token.i, mention_set)
 
     def get_compatibility(self, token: Token, mention_set: Set[Mention]) -> int:
         """Checks the compatibility of *token* with the possible chain represented by *mention_set*
@@ -103,61 +282,54 @@ class Annotator:
         self,
         token: Token,
         sentence_deque: Deque[Span],
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
+        mention_sets: MentionSets,
     ) -> None:
+        """Links *token* to the closest preceding token within *sentence_deque* that either
+        forms a potential coreferring noun pair with *token* or belongs to an existing chain
+        containing a noun that does. Only tokens that share a key with *token* within the
+        document's *CoreferringNounIndex* are examined."""
         doc = token.doc
         if not token._.coref_chains.temp_potentially_referring:
             return
-        for sent in sentence_deque:
-            for preceding_token in (
-                doc[index]
-                for index in range(sent.end, sent.start - 1, -1)
-                if index < token.i
+        noun_index = doc._.coref_chains.temp_coreferring_noun_index
+        start_index = sentence_deque[-1].start
+        direct_index = start_index - 1
+        for candidate_index in noun_index.get_candidate_indexes(token.i, start_index):
+            preceding_token = doc[candidate_index]
+            if (
+                preceding_token._.coref_chains.temp_potentially_referring
+                and self.rules_analyzer.is_potential_coreferring_noun_pair(
+                    preceding_token, token
+                )
             ):
+                direct_index = candidate_index
+                break
+        # a closer token may belong to an existing chain; it may be an anaphor linked to a
+        # noun that can form a noun pair with *token*
+        for preceding_index in range(token.i - 1, direct_index, -1):
+            if preceding_index not in mention_sets.without_coordination:
+                continue
+            for mention in mention_sets.without_coordination[preceding_index]:
                 if (
-                    preceding_token._.coref_chains.temp_potentially_referring
+                    len(mention.token_indexes) == 1
+                    and noun_index.may_corefer(mention.root_index, token.i)
                     and self.rules_analyzer.is_potential_coreferring_noun_pair(
-                        preceding_token, token
+                        doc[mention.root_index], token
                     )
                 ):
                     self.record_mention(
-                        Mention(preceding_token, False),
-                        token,
-                        token_indexes_without_coordination_to_mention_sets,
-                        token_indexes_with_coordination_to_mention_sets,
+                        Mention(doc[preceding_index], False), token, mention_sets
                     )
                     return
-                if (
-                    preceding_token.i
-                    in token_indexes_without_coordination_to_mention_sets
-                ):
-                    # existing chain; *preceding_token* may be an anaphor linked to a noun
-                    # that can form a noun pair with *token*
-                    mention_set = token_indexes_without_coordination_to_mention_sets[
-                        preceding_token.i
-                    ]
-                    for mention in (
-                        mention
-                        for mention in mention_set
-                        if len(mention.token_indexes) == 1
-                    ):
-                        if self.rules_analyzer.is_potential_coreferring_noun_pair(
-                            token.doc[mention.root_index], token
-                        ):
-                            self.record_mention(
-                                Mention(preceding_token, False),
-                                token,
-                                token_indexes_without_coordination_to_mention_sets,
-                                token_indexes_with_coordination_to_mention_sets,
-                            )
-                            return
+        if direct_index >= start_index:
+            self.record_mention(
+                Mention(doc[direct_index], False), token, mention_sets
+            )
 
     def temp_annotate_any_anaphoric_link(
         self,
         token: Token,
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
+        mention_sets: MentionSets,
         permitted_start_index: int = 0,
     ) -> bool:
         """Returns *True* if an annotation occurred."""
@@ -183,13 +355,11 @@ class Annotator:
                 if len(potential_referred.token_indexes) == 1:
                     if (
                         potential_referred.root_index
-                        in token_indexes_without_coordination_to_mention_sets
+                        in mention_sets.without_coordination
                     ):
-                        mention_set = (
-                            token_indexes_without_coordination_to_mention_sets[
-                                potential_referred.root_index
-                            ]
-                        )
+                        mention_set = mention_sets.without_coordination[
+                            potential_referred.root_index
+                        ]
                         compatibility = self.get_compatibility(token, mention_set)
                         if compatibility == 0 or (
                             compatibility == 1 and not allow_uncertainty
@@ -197,20 +367,18 @@ class Annotator:
                             continue
                 if self.rules_analyzer.is_reflexive_anaphor(token) == 0 and (
                     check_mention_sets_for_reflexive_relationships(
-                        potential_referred,
-                        token_indexes_without_coordination_to_mention_sets,
+                        potential_referred, mention_sets.without_coordination
                     )
                     or check_mention_sets_for_reflexive_relationships(
-                        potential_referred,
-                        token_indexes_with_coordination_to_mention_sets,
+                        potential_referred, mention_sets.with_coordination
                     )
                 ):
                     continue
+                mention_sets.set_item(mention_sets.referred_indexes, token.i, index)
                 self.record_mention(
                     potential_referred,
                     token,
-                    token_indexes_without_coordination_to_mention_sets,
-                    token_indexes_with_coordination_to_mention_sets,
+                    mention_sets,
                 )
                 return True
             return False
@@ -219,129 +387,113 @@ class Annotator:
             return True
         return intern_temp_annotate_any_anaphoric_link(True)
 
-    def delete_from_collections_for_rewind(
-        self,
-        previous_token: Token,
-        token: Token,
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
-    ) -> None:
-        def intern_delete_from_collections_for_rewind(
-            dictionary: Dict[int, Set[Mention]], working_token: Token
-        ):
-            if working_token.i in dictionary:
-                mention_set = dictionary[working_token.i]
-                working_mention = Mention(working_token, False)
-                if working_mention in mention_set:
-                    mention_set.remove(working_mention)
-                del dictionary[working_token.i]
-                if len(mention_set) == 1:
-                    remaining_mention = list(mention_set)[0]
-                    if remaining_mention.root_index in dictionary:
-                        # is not the case where *remaining_mention* involves coordination
-                        del dictionary[remaining_mention.root_index]
-
-        doc = token.doc
-        for working_token in doc[previous_token.i : token.i + 1]:
-            intern_delete_from_collections_for_rewind(
-                token_indexes_without_coordination_to_mention_sets, working_token
-            )
-            intern_delete_from_collections_for_rewind(
-                token_indexes_with_coordination_to_mention_sets, working_token
-            )
-
     def attempt_rewind_with_previous_token_and_retry_index(
         self,
         retry_index: int,
         previous_token: Token,
         token: Token,
         sentence_deque: Deque[Span],
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
+        mention_sets: MentionSets,
+        retry_search: RetrySearch,
     ) -> bool:
-        """Returns *True* if the rewind attempt succeeded."""
+        """Returns *True* if the rewind attempt succeeded. *mention_sets* must have been rolled
+        back to the point before *previous_token* was linked."""
+        if retry_search.remaining_nodes <= 0:
+            return False
+        retry_search.remaining_nodes -= 1
         doc = token.doc
-        if self.temp_annotate_any_anaphoric_link(
+        mention_sets.mark_anaphor(previous_token.i)
+        if not self.temp_annotate_any_anaphoric_link(
             previous_token,
-            token_indexes_without_coordination_to_mention_sets,
-            token_indexes_with_coordination_to_mention_sets,
+            mention_sets,
             retry_index,
         ):
-            for working_token in doc[previous_token.i + 1 : token.i + 1]:
-                self.temp_annotate_any_coreferring_noun_link(
+            return False
+        visited_states = []
+        for working_token in doc[previous_token.i + 1 : token.i + 1]:
+            self.temp_annotate_any_coreferring_noun_link(
+                working_token,
+                sentence_deque,
+                mention_sets,
+            )
+            if hasattr(working_token._.coref_chains, "temp_potential_referreds"):
+                state = retry_search.get_state(working_token, mention_sets)
+                if state in retry_search.failed_states:
+                    # this state has already been reached by another alternative
+                    retry_search.failed_states.update(visited_states)
+                    return False
+                if retry_search.remaining_nodes <= 0:
+                    return False
+                retry_search.remaining_nodes -= 1
+                visited_states.append(state)
+                mention_sets.mark_anaphor(working_token.i)
+                if not self.temp_annotate_any_anaphoric_link(
                     working_token,
-                    sentence_deque,
-                    token_indexes_without_coordination_to_mention_sets,
-                    token_indexes_with_coordination_to_mention_sets,
-                )
-                if hasattr(working_token._.coref_chains, "temp_potential_referreds"):
-                    if not self.temp_annotate_any_anaphoric_link(
-                        working_token,
-                        token_indexes_without_coordination_to_mention_sets,
-                        token_indexes_with_coordination_to_mention_sets,
-                    ):
-                        return False
-            return True
-        return False
+                    mention_sets,
+                ):
+                    retry_search.failed_states.update(visited_states)
+                    return False
+        return True
 
     def attempt_retry(
         self,
         token: Token,
         coreferring_deque: Deque[Token],
         sentence_deque: Deque[Span],
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]],
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]],
+        mention_sets: MentionSets,
     ) -> bool:
         """Called when an anaphor could not be assigned to a chain; attempts alternative
         interpretations of the preceding anaphors to see whether any allow all anaphors to be
-        assigned. Returns *True* if the rewind attempt succeeded."""
-        previous_token = None
+        assigned. Returns *True* if the rewind attempt succeeded.
+
+        Alternatives that lead to a state that has already failed are abandoned, and at most
+        *RETRY_NODE_BUDGET* attempts to link an anaphor are made. The alternatives are always
+        tried in the same order, so the result does not depend on timing.
+        """
+        # we only need start with *previous_token* because any different interpretations of
+        # *token* have already been tried out unsuccessfully
+        previous_tokens = [
+            t
+            for t in coreferring_deque
+            if token._.coref_chains.temp_sent_index - t._.coref_chains.temp_sent_index
+            <= self.rules_analyzer.maximum_anaphora_sentence_referential_distance
+        ]
+        if len(previous_tokens) == 0:
+            return False
+        doc = token.doc
+        retry_search = RetrySearch(
+            [
+                t.i
+                for t in doc[previous_tokens[-1].i : token.i + 1]
+                if hasattr(t._.coref_chains, "temp_potential_referreds")
+            ],
+            self.RETRY_NODE_BUDGET,
+        )
         for retry_index in range(
             1,
             min(
                 self.RETRY_DEPTH, len(token._.coref_chains.temp_potential_referreds) + 1
             ),
         ):
-            # we only need start with *previous_token* because any different interpretations of
-            # *token* have already been tried out unsuccessfully
-            for previous_token in (
-                t
-                for t in coreferring_deque
-                if token._.coref_chains.temp_sent_index
-                - t._.coref_chains.temp_sent_index
-                <= self.rules_analyzer.maximum_anaphora_sentence_referential_distance
-            ):
-                self.delete_from_collections_for_rewind(
-                    previous_token,
-                    token,
-                    token_indexes_without_coordination_to_mention_sets,
-                    token_indexes_with_coordination_to_mention_sets,
+            for previous_token in previous_tokens:
+                if retry_search.remaining_nodes <= 0:
+                    return False
+                undone_entries = mention_sets.rollback(
+                    mention_sets.anaphor_checkpoints[previous_token.i]
                 )
+                checkpoint = mention_sets.checkpoint()
                 if self.attempt_rewind_with_previous_token_and_retry_index(
                     retry_index,
                     previous_token,
                     token,
                     sentence_deque,
-                    token_indexes_without_coordination_to_mention_sets,
-                    token_indexes_with_coordination_to_mention_sets,
+                    mention_sets,
+                    retry_search,
                 ):
                     return True
-        if previous_token is not None:
-            # All attempts have failed, so return to the original interpretation
-            self.delete_from_collections_for_rewind(
-                previous_token,
-                token,
-                token_indexes_without_coordination_to_mention_sets,
-                token_indexes_with_coordination_to_mention_sets,
-            )
-            self.attempt_rewind_with_previous_token_and_retry_index(
-                0,
-                previous_token,
-                token,
-                sentence_deque,
-                token_indexes_without_coordination_to_mention_sets,
-                token_indexes_with_coordination_to_mention_sets,
-            )
+                # return to the original interpretation before trying the next alternative
+                mention_sets.rollback(checkpoint)
+                mention_sets.reapply(undone_entries)
         return False
 
     def get_most_specific_mention(self, mentions: List[Mention], doc: Doc) -> Mention:
@@ -372,37 +524,113 @@ class Annotator:
                 stored_mention = mention
         return cast(Mention, stored_mention)
 
-    def annotate(self, doc: Doc, used_in_training=False) -> Doc:
+    def get_time_budget(self) -> Optional[TimeBudget]:
+        return None if self.TIME_BUDGET is None else TimeBudget(self.TIME_BUDGET)
+
+    @staticmethod
+    def order_by_rules(doc: Doc) -> None:
+        """Used in place of scoring when the time budget does not permit it. Orders the
+        potential referreds of each anaphor in *doc* as *TendenciesAnalyzer.score()* does,
+        but with the closest potential referreds in place of the highest-scoring ones."""
+        for referring in (
+            t for t in doc if hasattr(t._.coref_chains, "temp_potential_referreds")
+        ):
+            referring._.coref_chains.temp_potential_referreds.sort(
+                key=lambda potential_referred: (
+                    potential_referred.temp_is_uncertain,
+                    abs(potential_referred.root_index - referring.i),
+                )
+            )
+
+    def annotate(self, doc: Doc, used_in_training=False, token_chains=True) -> Doc:
+        time_budget = None if used_in_training else self.get_time_budget()
         if not used_in_training:
             self.rules_analyzer.initialize(doc)
-        self.tendencies_analyzer.score(doc, self.thinc_ensemble)
-        token_indexes_without_coordination_to_mention_sets: Dict[int, Set[Mention]] = {}
-        token_indexes_with_coordination_to_mention_sets: Dict[int, Set[Mention]] = {}
+        if time_budget is None or time_budget.permits("scoring"):
+            self.tendencies_analyzer.score(doc, self.thinc_ensemble)
+        else:
+            self.order_by_rules(doc)
+        return self.annotate_scored_doc(doc, used_in_training, token_chains, time_budget)
+
+    def annotate_docs(self, docs: List[Doc], token_chains=True) -> List[Doc]:
+        """Annotates *docs*, scoring the potential pairs within all the documents with a
+        single call to the neural ensemble. The time budget of each document is charged
+        with the work done on that document and with a share of the scoring time in
+        proportion to its length."""
+        time_budgets = []
+        for doc in docs:
+            time_budget = self.get_time_budget()
+            self.rules_analyzer.initialize(doc)
+            if time_budget is not None:
+                time_budget.stop()
+            time_budgets.append(time_budget)
+        scoring_permitted = [
+            time_budget is None or time_budget.permits("scoring")
+            for time_budget in time_budgets
+        ]
+        docs_to_score = [doc for doc, scored in zip(docs, scoring_permitted) if scored]
+        for doc, scored in zip(docs, scoring_permitted):
+            if not scored:
+                self.order_by_rules(doc)
+        scoring_start_time = perf_counter()
+        self.tendencies_analyzer.score_docs(docs_to_score, self.thinc_ensemble)
+        scoring_seconds = perf_counter() - scoring_start_time
+        scored_tokens = sum(len(doc) for doc in docs_to_score)
+        for doc, time_budget, scored in zip(docs, time_budgets, scoring_permitted):
+            if time_budget is not None:
+                if scored and scored_tokens > 0:
+                    time_budget.charge(scoring_seconds * len(doc) / scored_tokens)
+                time_budget.start()
+            self.annotate_scored_doc(
+                doc, token_chains=token_chains, time_budget=time_budget
+            )
+            if time_budget is not None:
+                time_budget.stop()
+        return docs
+
+    def annotate_scored_doc(
+        self,
+        doc: Doc,
+        used_in_training=False,
+        token_chains=True,
+        time_budget: Optional[TimeBudget] = None,
+    ) -> Doc:
+        """Builds the chains for *doc* once the potential pairs have been scored. If
+        *token_chains* is *False*, the chains are only added to *doc._.coref_chains* and
+        the holders for the tokens are derived from them if they are requested later.
+
+        If *time_budget* is used up, retries are skipped and then the remaining sentences
+        are left unannotated; the stages that were skipped are recorded in
+        *doc._.coref_chains.skipped_stages*."""
+        mention_sets = MentionSets()
         sentence_deque: Deque[Span] = deque(
             maxlen=self.rules_analyzer.maximum_coreferring_nouns_sentence_referential_distance
             + 1
         )
         coreferring_deque: Deque[Token] = deque(maxlen=self.RETRY_DEPTH)
         for sent in doc.sents:
+            if time_budget is not None and not time_budget.permits("annotation"):
+                break
             sentence_deque.appendleft(sent)
             for token in sent:
                 self.temp_annotate_any_coreferring_noun_link(
                     token,
                     sentence_deque,
-                    token_indexes_without_coordination_to_mention_sets,
-                    token_indexes_with_coordination_to_mention_sets,
+                    mention_sets,
                 )
                 if hasattr(token._.coref_chains, "temp_potential_referreds"):
+                    mention_sets.mark_anaphor(token.i)
                     if self.temp_annotate_any_anaphoric_link(
                         token,
-                        token_indexes_without_coordination_to_mention_sets,
-                        token_indexes_with_coordination_to_mention_sets,
-                    ) or self.attempt_retry(
-                        token,
-                        coreferring_deque,
-                        sentence_deque,
-                        token_indexes_without_coordination_to_mention_sets,
-                        token_indexes_with_coordination_to_mention_sets,
+                        mention_sets,
+                    ) or (
+                        (time_budget is None or time_budget.permits("retries"))
+                        and self.attempt_retry(
+                            token,
+                            coreferring_deque,
+                            sentence_deque,
+                            mention_sets,
+                        )
                     ):
                         coreferring_deque.appendleft(token)
 
@@ -411,7 +639,7 @@ class Annotator:
         for (
             token_index,
             mention_set,
-        ) in token_indexes_without_coordination_to_mention_sets.items():
+        ) in mention_sets.without_coordination.items():
             if token_index in visited_token_indexes:
                 continue
             mention_list = sorted(
@@ -428,30 +656,20 @@ class Annotator:
 
         for index, chain in enumerate(chains):
             chain.index = index
-            for mention in chain.mentions:
-                for token in (
-                    doc[token_index] for token_index in mention.token_indexes
-                ):
-                    token._.coref_chains.chains.append(chain)
+            if token_chains or used_in_training:
+                for mention in chain.mentions:
+                    for token in (
+                        doc[token_index] for token_index in mention.token_indexes
+                    ):
+                        token._.coref_chains.chains.append(chain)
 
         doc._.coref_chains.chains = chains
+        if time_budget is not None:
+            doc._.coref_chains.skipped_stages = tuple(time_budget.skipped_stages)
 
         if not used_in_training:
-            # get rid of the *temp_* properties on the various objects
-            for temp_entry in [
-                t for t in doc._.coref_chains.__dict__ if t.startswith("temp_")
-            ][:]:
-                doc._.coref_chains.__dict__.pop(temp_entry)
-            for token in doc:
-                for temp_entry in [
-                    t for t in token._.coref_chains.__dict__ if t.startswith("temp_")
-                ][:]:
-                    token._.coref_chains.__dict__.pop(temp_entry)
-                    for chain in token._.coref_chains:
-                        for mention in chain:
-                            for inner_temp_entry in [
-                                t for t in mention.__dict__ if t.startswith("temp_")
-                            ][:]:
-                                mention.__dict__.pop(inner_temp_entry)
+            # get rid of the *temp_* properties on the various objects and of the holders
+            # for tokens that do not belong to any chains
+            doc._.coref_chains.release_scratch_arena(token_chains)
 
         return doc
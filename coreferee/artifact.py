@@ -0,0 +1,179 @@
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+import struct
+import numpy
+import srsly  # type:ignore[import]
+from thinc.model import Model
+from .data_model import FeatureTable
+from .errors import ModelArtifactError
+from .tendencies import create_thinc_model
+
+ARTIFACT_MAGIC = b"COREFEREE\x00"
+
+ARTIFACT_FORMAT_VERSION = 1
+
+# Arrays are aligned to this number of bytes within the file so that they can be used
+# directly from a memory map
+ARTIFACT_ALIGNMENT = 64
+
+_HEADER_LENGTH_FORMAT = "<Q"
+
+
+def _align(length: int) -> int:
+    return -(-length // ARTIFACT_ALIGNMENT) * ARTIFACT_ALIGNMENT
+
+
+def write_artifact(
+    filename: str,
+    feature_table: FeatureTable,
+    model: Model,
+    *,
+    source_fingerprint: Optional[str] = None
+) -> None:
+    """Writes *feature_table* and the weights of *model* to a single file. The file consists
+    of *ARTIFACT_MAGIC*, the length of the header, a msgpack header and the float32 weight
+    arrays, each of which is aligned to *ARTIFACT_ALIGNMENT* bytes.
+
+    If the artifact is converted from other files, *source_fingerprint* identifies their
+    contents so that the artifact can be recognised as stale once they change.
+    """
+    nodes: List[Dict[str, Any]] = []
+    arrays: List[numpy.ndarray] = []
+    offset = 0
+    for node in model.walk():
+        params = {}
+        for param_name in node.param_names:
+            if not node.has_param(param_name):
+                continue
+            array = numpy.ascontiguousarray(
+                model.ops.to_numpy(node.get_param(param_name)), dtype="<f4"
+            )
+            params[param_name] = {"offset": offset, "shape": list(array.shape)}
+            arrays.append(array)
+            offset += _align(array.nbytes)
+        nodes.append(
+            {
+                "name": node.name,
+                "dims": {
+                    dim_name: node.maybe_get_dim(dim_name)
+                    for dim_name in node.dim_names
+                },
+                "params": params,
+            }
+        )
+    header = srsly.msgpack_dumps(
+        {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "feature_table": feature_table.__dict__,
+            "nodes": nodes,
+            "source_fingerprint": source_fingerprint,
+        }
+    )
+    prefix_length = len(ARTIFACT_MAGIC) + struct.calcsize(_HEADER_LENGTH_FORMAT)
+    data_start = _align(prefix_length + len(header))
+    with open(filename, "wb") as file:
+        file.write(ARTIFACT_MAGIC)
+        file.write(struct.pack(_HEADER_LENGTH_FORMAT, len(header)))
+        file.write(header)
+        file.write(b"\x00" * (data_start - prefix_length - len(header)))
+        for array in arrays:
+            file.write(array.tobytes())
+            file.write(b"\x00" * (_align(array.nbytes) - array.nbytes))
+
+
+def _read_header(file: BinaryIO, filename: str) -> Dict[str, Any]:
+    magic = file.read(len(ARTIFACT_MAGIC))
+    if magic != ARTIFACT_MAGIC:
+        raise ModelArtifactError(
+            "".join((filename, " is not a Coreferee model artifact."))
+        )
+    (header_length,) = struct.unpack(
+        _HEADER_LENGTH_FORMAT, file.read(struct.calcsize(_HEADER_LENGTH_FORMAT))
+    )
+    header = srsly.msgpack_loads(file.read(header_length))
+    if header.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ModelArtifactError(
+            "".join(
+                (
+                    filename,
+                    " has format version ",
+                    str(header.get("format_version")),
+                    " but this version of Coreferee reads format version ",
+                    str(ARTIFACT_FORMAT_VERSION),
+                    ".",
+                )
+            )
+        )
+    return header
+
+
+def read_artifact_source_fingerprint(filename: str) -> Optional[str]:
+    """Returns the *source_fingerprint* the file written by *write_artifact()* was written
+    with, which is *None* if the artifact was not converted from other files."""
+    with open(filename, "rb") as file:
+        return _read_header(file, filename).get("source_fingerprint")
+
+
+def read_artifact(
+    filename: str, *, memory_map: bool = True
+) -> Tuple[FeatureTable, Model]:
+    """Reads a file written by *write_artifact()*. If *memory_map==True*, the weights of
+    the returned model are read-only views of a memory map of the file, so that processes
+    loading the same file share its pages.
+    """
+    with open(filename, "rb") as file:
+        header = _read_header(file, filename)
+        data_start = _align(file.tell())
+        if memory_map:
+            data = numpy.memmap(filename, dtype="<f4", mode="r", offset=data_start)
+        else:
+            file.seek(data_start)
+            data = numpy.frombuffer(file.read(), dtype="<f4")
+
+    feature_table = FeatureTable(**header["feature_table"])
+    model = create_thinc_model()
+    nodes = list(model.walk())
+    for index, (node, node_info) in enumerate(zip(nodes, header["nodes"])):
+        if node.name != node_info["name"]:
+            raise ModelArtifactError(
+                "".join(
+                    (
+                        filename,
+                        " does not match the structure of the model used by this version",
+                        " of Coreferee: node ",
+                        str(index),
+                        " is '",
+                        str(node_info["name"]),
+                        "' in the artifact but '",
+                        node.name,
+                        "' in the model.",
+                    )
+                )
+            )
+    if len(nodes) != len(header["nodes"]) or any(
+        param_name not in node.param_names
+        for node, node_info in zip(nodes, header["nodes"])
+        for param_name in node_info["params"]
+    ):
+        raise ModelArtifactError(
+            "".join(
+                (
+                    filename,
+                    " does not match the structure of the model used by this version of",
+                    " Coreferee.",
+                )
+            )
+        )
+    for node, node_info in zip(nodes, header["nodes"]):
+        for dim_name, value in node_info["dims"].items():
+            if value is not None:
+                node.set_dim(dim_name, value)
+        for param_name, param_info in node_info["params"].items():
+            start = param_info["offset"] // 4
+            size = int(numpy.prod(param_info["shape"]))
+            node.set_param(
+                param_name,
+                node.ops.asarray(
+                    data[start : start + size].reshape(param_info["shape"])
+                ),
+            )
+    return feature_table, model
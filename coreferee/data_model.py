@@ -1,18 +1,116 @@
-from typing import List, Union, Dict, Tuple, Iterator, Set, Optional, cast
+from typing import Any, List, Union, Dict, Tuple, Iterator, Set, Optional, cast
+from array import array
 from os import linesep
-from spacy.tokens import Token
+import sys
+from spacy.tokens import Doc, Token
 from srsly import msgpack_decoders, msgpack_encoders  # type:ignore[import]
 
 
-class ChainHolder:
-    """The object returned by *token._.coref_chains*."""
+class ScratchArena:
+    """Holds the temporary state that is built up for a document while it is being processed.
+    *ChainHolder* and *Mention* objects created for the document store their temp_*
+    attributes here rather than on the objects themselves, so that all the temporary state
+    can be discarded in a single step with *clear()*.
+    """
 
     def __init__(self):
-        self.chains = []
+        self.clear()
+
+    def clear(self) -> None:
+        # Maps the ids of owner objects to their temp_* attributes
+        self.entries: Dict[int, Dict[str, Any]] = {}
+
+        # Keeps the owner objects alive so that their ids are not reused
+        self.owners: List[Any] = []
+
+    def get_entries(self, owner: Any) -> Dict[str, Any]:
+        entries = self.entries.get(id(owner))
+        if entries is None:
+            entries = self.entries[id(owner)] = {}
+            self.owners.append(owner)
+        return entries
+
+
+class ScratchAttributesMixin:
+    """Redirects temp_* attributes to the *ScratchArena* of the object. An object without
+    an arena is given one of its own the first time a temp_* attribute is set on it."""
+
+    __slots__ = ()
+
+    # Values returned for temp_* attributes that have not been set
+    scratch_defaults: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # only called when normal attribute lookup fails
+        if name.startswith("temp_"):
+            scratch_arena = getattr(self, "scratch_arena", None)
+            if scratch_arena is not None:
+                entries = scratch_arena.entries.get(id(self))
+                if entries is not None and name in entries:
+                    return entries[name]
+            if name in self.scratch_defaults:
+                return self.scratch_defaults[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("temp_"):
+            scratch_arena = getattr(self, "scratch_arena", None)
+            if scratch_arena is None:
+                scratch_arena = ScratchArena()
+                object.__setattr__(self, "scratch_arena", scratch_arena)
+            scratch_arena.get_entries(self)[name] = value
+            return
+        object.__setattr__(self, name, value)
+
+
+class ChainHolder(ScratchAttributesMixin):
+    """The object returned by *doc._.coref_chains* and *token._.coref_chains*. The holders
+    for the tokens of a document are stored within the holder for the document and retrieved
+    with *get_token_chain_holder()*."""
+
+    __slots__ = (
+        "_chains",
+        "chain_columns",
+        "resolution_table",
+        "scratch_arena",
+        "skipped_stages",
+        "token_chain_holders",
+    )
+
+    scratch_defaults = {"temp_governing_sibling": None, "temp_has_or_coordination": False}
+
+    def __init__(self, scratch_arena: Optional[ScratchArena] = None):
+        self._chains: Optional[Union[List["Chain"], Tuple["Chain", ...]]] = []
+
+        # Within a deserialized holder for a document, holds the chains until they are first
+        # requested
+        self.chain_columns: Optional[ChainColumns] = None
+
+        # Within the holder for a document, caches the result of *resolve_all()* until the
+        # chains are replaced
+        self.resolution_table: Optional[ResolutionTable] = None
+
+        # Holds the 'temp*' properties, which will be removed before processing ends
+        self.scratch_arena = scratch_arena
+
+        # Within the holder for a document, the stages of annotation that were skipped
+        # because the time budget was used up
+        self.skipped_stages: Tuple[str, ...] = ()
+
+        # Within the holder for a document, maps token indexes to the holders for the tokens
+        self.token_chain_holders: Optional[Dict[int, "ChainHolder"]] = None
+
+    @property
+    def chains(self) -> Union[List["Chain"], Tuple["Chain", ...]]:
+        if self._chains is None:
+            self._chains = self.chain_columns.get_chains()
+        return self._chains
 
-        # 'temp*' properties will be removed before processing ends
-        self.temp_governing_sibling = None
-        self.temp_has_or_coordination = False
+    @chains.setter
+    def chains(self, chains: Union[List["Chain"], Tuple["Chain", ...]]) -> None:
+        self._chains = chains
+        self.chain_columns = None
+        self.resolution_table = None
 
     def __str__(self) -> str:
         return str(self.chains)
@@ -24,9 +122,11 @@ class ChainHolder:
         print(linesep.join(chain.pretty_representation for chain in self.chains))
 
     def __iter__(self) -> Iterator["Chain"]:
-        return iter(self.chains.copy())
+        return iter(self.chains[:])
 
     def __len__(self) -> int:
+        if self._chains is None:
+            return len(self.chain_columns)
         return len(self.chains)
 
     def __getitem__(self, key: str) -> "Chain":
@@ -36,97 +136,382 @@ class ChainHolder:
     def pretty_representation(self) -> str:
         return "; ".join(chain.pretty_representation for chain in self.chains)
 
+    @staticmethod
+    def get_token_chain_holder(token: Token) -> Optional["ChainHolder"]:
+        """The getter for *token._.coref_chains*. While the document is being processed,
+        a holder is created for each token the first time it is requested; once processing
+        has finished, tokens that do not belong to any chains share *EMPTY_CHAIN_HOLDER*.
+        """
+        doc_chain_holder = token.doc._.coref_chains
+        if doc_chain_holder is None:
+            return None
+        if doc_chain_holder.token_chain_holders is None:
+            # the holder was deserialized
+            doc_chain_holder.derive_token_chain_holders()
+        token_chain_holder = doc_chain_holder.token_chain_holders.get(token.i)
+        if token_chain_holder is None:
+            if doc_chain_holder.scratch_arena is None:
+                return EMPTY_CHAIN_HOLDER
+            token_chain_holder = ChainHolder(doc_chain_holder.scratch_arena)
+            doc_chain_holder.token_chain_holders[token.i] = token_chain_holder
+        return token_chain_holder
+
+    def derive_token_chain_holders(self) -> None:
+        """Creates the holders for the tokens that belong to the chains of this document
+        holder."""
+        self.token_chain_holders = {}
+        for chain in self.chains:
+            for mention in chain.mentions:
+                for token_index in mention.token_indexes:
+                    if token_index not in self.token_chain_holders:
+                        self.token_chain_holders[token_index] = ChainHolder()
+                    self.token_chain_holders[token_index].chains.append(chain)
+
+    def release_scratch_arena(self, keep_token_chain_holders: bool = True) -> None:
+        """Called on the holder for a document once processing has finished. Discards the
+        temp_* attributes held for the document along with the holders for tokens that do
+        not belong to any chains. If *keep_token_chain_holders* is *False*, the holders for
+        all tokens are discarded and derived from the chains if they are requested later."""
+        self.scratch_arena.clear()
+        self.scratch_arena = None
+        if keep_token_chain_holders:
+            self.token_chain_holders = {
+                index: token_chain_holder
+                for index, token_chain_holder in self.token_chain_holders.items()
+                if len(token_chain_holder.chains) > 0
+            }
+            for token_chain_holder in self.token_chain_holders.values():
+                token_chain_holder.scratch_arena = None
+        else:
+            self.token_chain_holders = None
+        for chain in self.chains:
+            for mention in chain.mentions:
+                mention.scratch_arena = None
+
     @staticmethod
     def resolve(token: Token) -> Optional[List[Token]]:
         """If *token* is an anaphor, returns a list of tokens to which *token* points;
         otherwise returns *None*.
         """
+        doc = token.doc
+        resolution_table = doc._.coref_chains.resolve_all(doc)
+        referent_indexes = resolution_table.get_referent_indexes(token.i)
+        if referent_indexes is None:
+            return None
+        return [doc[index] for index in referent_indexes]
+
+    def resolve_all(self, doc: Doc) -> "ResolutionTable":
+        """Called on the holder for *doc*. Resolves every token in *doc* in a single pass and
+        returns a *ResolutionTable*, which is cached on the holder until its chains are
+        replaced."""
+        if self.resolution_table is not None:
+            return self.resolution_table
+        if self.token_chain_holders is None:
+            self.derive_token_chain_holders()
+        token_chain_holders = cast(Dict[int, ChainHolder], self.token_chain_holders)
+
+        # Maps token indexes to the indexes of the tokens they resolve to
+        resolved_indexes: Dict[int, Set[int]] = {}
+
+        # The indexes of the tokens currently being resolved, which guards against cycles
+        indexes_in_progress: Set[int] = set()
+
+        def resolve_recursively(token_index: int) -> Set[int]:
+            if token_index in resolved_indexes:
+                return resolved_indexes[token_index]
+            if (
+                token_index in indexes_in_progress
+                or token_index not in token_chain_holders
+            ):
+                return {token_index}
+            indexes_in_progress.add(token_index)
+            indexes_to_return = resolve_chains(
+                token_index, token_chain_holders[token_index].chains
+            )
+            indexes_in_progress.remove(token_index)
+            resolved_indexes[token_index] = indexes_to_return
+            return indexes_to_return
 
-        def resolve_recursively(token: Token) -> Set[Token]:
-            tokens_to_return = set()
-            for chain in token._.coref_chains.chains:
+        def resolve_chains(token_index: int, chains: List[Chain]) -> Set[int]:
+            for chain in chains:
                 for mention in (
                     mention
                     for mention in chain.mentions
                     if len(mention.token_indexes) > 1
-                    and token.i not in mention.token_indexes
+                    and token_index not in mention.token_indexes
                 ):
                     # Mention contains multiple tokens, some of which may be anaphors and
                     # belong to further chains.
-                    for contained_token in (
-                        token.doc[index]
-                        for index in mention.token_indexes
-                        if index != token.i
+                    indexes_to_return: Set[int] = set()
+                    for contained_index in (
+                        index for index in mention.token_indexes if index != token_index
                     ):
-                        tokens_to_return.update(resolve_recursively(contained_token))
-                    return tokens_to_return
-            for chain in token._.coref_chains.chains:
-                if (
-                    len(
-                        [
-                            mention
-                            for mention in chain.mentions
-                            if len(mention.token_indexes) > 1
-                            and token.i in mention.token_indexes
-                        ]
-                    )
-                    > 0
+                        indexes_to_return.update(resolve_recursively(contained_index))
+                    return indexes_to_return
+            for chain in chains:
+                if any(
+                    len(mention.token_indexes) > 1
+                    and token_index in mention.token_indexes
+                    for mention in chain.mentions
                 ):
                     # This token is pointing back to a multiple-token mention which should
                     # already have been dealt with further up the recursion stack
                     continue
-                return {
-                    token.doc[
-                        chain.mentions[chain.most_specific_mention_index].root_index
-                    ]
-                }
-            return {token}
-
-        resolved_set = resolve_recursively(token)
-        if len(resolved_set) == 1 and token in resolved_set:
-            return None
-        return sorted(list(resolved_set))  # type:ignore[type-var]
+                return {chain.mentions[chain.most_specific_mention_index].root_index}
+            return {token_index}
+
+        offsets = array(ResolutionTable.TYPECODE, [0])
+        referent_indexes = array(ResolutionTable.TYPECODE)
+        for token_index in range(len(doc)):
+            if token_index in token_chain_holders:
+                resolved_set = resolve_recursively(token_index)
+                if resolved_set != {token_index}:
+                    referent_indexes.extend(sorted(resolved_set))
+            offsets.append(len(referent_indexes))
+        self.resolution_table = ResolutionTable(offsets, referent_indexes)
+        return self.resolution_table
 
     @msgpack_encoders("coreferee_chain_holder")
     def serialize_obj(obj, chain=None):
         if isinstance(obj, ChainHolder):
-            serialized_chain_holder = []
-            for working_chain in obj.chains:
-                serialized_chain_holder.append(
-                    (
-                        [
-                            (mention.token_indexes, mention.pretty_representation)
-                            for mention in working_chain.mentions
-                        ],
-                        working_chain.most_specific_mention_index,
-                    )
-                )
-            return {"__coreferee_chain_holder__": serialized_chain_holder}
+            if obj._chains is None:
+                chain_columns = obj.chain_columns
+            else:
+                chain_columns = ChainColumns.from_chains(obj.chains)
+            return {
+                "__coreferee_chain_columns__": chain_columns.to_dict(),
+                "skipped_stages": list(obj.skipped_stages),
+            }
         return obj if chain is None else chain(obj)
 
     @msgpack_decoders("coreferee_chain_holder")
     def deserialize_obj(obj, chain=None):
+        if "__coreferee_chain_columns__" in obj:
+            chain_holder = ChainHolder()
+            chain_holder.chain_columns = ChainColumns.from_dict(
+                obj["__coreferee_chain_columns__"]
+            )
+            chain_holder._chains = None
+            chain_holder.skipped_stages = tuple(obj.get("skipped_stages", ()))
+            return chain_holder
         if "__coreferee_chain_holder__" in obj:
+            # written by an earlier version that serialized mentions as lists of
+            # (token_indexes, pretty_representation) tuples
             chain_holder = ChainHolder()
-            chain_holder.chains = []
-            for index, (chain_representation, most_specific_mention_index) in enumerate(
+            chain_holder.chain_columns = ChainColumns.from_legacy_representation(
                 obj["__coreferee_chain_holder__"]
-            ):
-                mentions = []
-                for (token_indexes, pretty_representation) in chain_representation:
-                    mention = Mention()
-                    mention.token_indexes = token_indexes
-                    mention.pretty_representation = pretty_representation
-                    mention.root_index = token_indexes[0]
-                    mentions.append(mention)
-                working_chain = Chain(mentions, most_specific_mention_index)
-                working_chain.index = index
-                chain_holder.chains.append(working_chain)
+            )
+            chain_holder._chains = None
             return chain_holder
         return obj if chain is None else chain(obj)
 
 
+class ChainColumns:
+    """Holds the chains of a document as flat arrays, which is the form in which they are
+    serialized. *Chain* and *Mention* objects are only created from the arrays when the
+    chains of a deserialized document are first requested.
+    """
+
+    # All integer arrays are serialized in little-endian byte order
+    TYPECODE = "i"
+
+    def __init__(
+        self,
+        *,
+        chain_offsets: array,
+        most_specific_mention_indexes: array,
+        mention_offsets: array,
+        token_indexes: array,
+        token_texts: List[str]
+    ):
+
+        # The index within *mention_offsets* of the first mention of each chain, followed by
+        # the total number of mentions
+        self.chain_offsets = chain_offsets
+
+        # The *most_specific_mention_index* of each chain
+        self.most_specific_mention_indexes = most_specific_mention_indexes
+
+        # The index within *token_indexes* of the first token of each mention, followed by the
+        # total number of mention tokens
+        self.mention_offsets = mention_offsets
+
+        # The token indexes of all mentions, chain by chain and mention by mention
+        self.token_indexes = token_indexes
+
+        # The texts of the tokens at *token_indexes*, from which the pretty representations
+        # are built
+        self.token_texts = token_texts
+
+    def __len__(self) -> int:
+        return len(self.chain_offsets) - 1
+
+    @classmethod
+    def from_chains(cls, chains: List["Chain"]) -> "ChainColumns":
+        chain_offsets = array(cls.TYPECODE, [0])
+        most_specific_mention_indexes = array(cls.TYPECODE)
+        mention_offsets = array(cls.TYPECODE, [0])
+        token_indexes = array(cls.TYPECODE)
+        token_texts: List[str] = []
+        for working_chain in chains:
+            for mention in working_chain.mentions:
+                token_indexes.extend(mention.token_indexes)
+                token_texts.extend(mention.token_texts)
+                mention_offsets.append(len(token_indexes))
+            chain_offsets.append(len(mention_offsets) - 1)
+            most_specific_mention_indexes.append(
+                working_chain.most_specific_mention_index
+            )
+        return cls(
+            chain_offsets=chain_offsets,
+            most_specific_mention_indexes=most_specific_mention_indexes,
+            mention_offsets=mention_offsets,
+            token_indexes=token_indexes,
+            token_texts=token_texts,
+        )
+
+    @classmethod
+    def from_legacy_representation(
+        cls, chain_representations: List[Tuple[List[Tuple[List[int], str]], int]]
+    ) -> "ChainColumns":
+        chain_offsets = array(cls.TYPECODE, [0])
+        most_specific_mention_indexes = array(cls.TYPECODE)
+        mention_offsets = array(cls.TYPECODE, [0])
+        token_indexes = array(cls.TYPECODE)
+        token_texts: List[str] = []
+        for mentions, most_specific_mention_index in chain_representations:
+            for mention_token_indexes, pretty_representation in mentions:
+                token_indexes.extend(mention_token_indexes)
+                # e.g. 'Peter(2)' or '[Peter(2); Richard(4)]'
+                if len(mention_token_indexes) > 1:
+                    pretty_representation = pretty_representation[1:-1]
+                token_texts.extend(
+                    token_representation[: token_representation.rindex("(")]
+                    for token_representation in pretty_representation.split("; ")
+                )
+                mention_offsets.append(len(token_indexes))
+            chain_offsets.append(len(mention_offsets) - 1)
+            most_specific_mention_indexes.append(most_specific_mention_index)
+        return cls(
+            chain_offsets=chain_offsets,
+            most_specific_mention_indexes=most_specific_mention_indexes,
+            mention_offsets=mention_offsets,
+            token_indexes=token_indexes,
+            token_texts=token_texts,
+        )
+
+    @classmethod
+    def array_to_bytes(cls, values: array) -> bytes:
+        if sys.byteorder != "little":
+            values = array(cls.TYPECODE, values)
+            values.byteswap()
+        return values.tobytes()
+
+    @classmethod
+    def array_from_bytes(cls, serialized_values: bytes) -> array:
+        values = array(cls.TYPECODE)
+        values.frombytes(serialized_values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chain_offsets": self.array_to_bytes(self.chain_offsets),
+            "most_specific_mention_indexes": self.array_to_bytes(
+                self.most_specific_mention_indexes
+            ),
+            "mention_offsets": self.array_to_bytes(self.mention_offsets),
+            "token_indexes": self.array_to_bytes(self.token_indexes),
+            "token_texts": self.token_texts,
+        }
+
+    @classmethod
+    def from_dict(cls, serialized_columns: Dict[str, Any]) -> "ChainColumns":
+        return cls(
+            chain_offsets=cls.array_from_bytes(serialized_columns["chain_offsets"]),
+            most_specific_mention_indexes=cls.array_from_bytes(
+                serialized_columns["most_specific_mention_indexes"]
+            ),
+            mention_offsets=cls.array_from_bytes(serialized_columns["mention_offsets"]),
+            token_indexes=cls.array_from_bytes(serialized_columns["token_indexes"]),
+            token_texts=list(serialized_columns["token_texts"]),
+        )
+
+    def get_chains(self) -> List["Chain"]:
+        chains = []
+        for index in range(len(self)):
+            mentions = []
+            for mention_number in range(
+                self.chain_offsets[index], self.chain_offsets[index + 1]
+            ):
+                start = self.mention_offsets[mention_number]
+                end = self.mention_offsets[mention_number + 1]
+                mention = Mention()
+                mention.token_indexes = self.token_indexes[start:end].tolist()
+                mention.token_texts = self.token_texts[start:end]
+                mention.root_index = mention.token_indexes[0]
+                mentions.append(mention)
+            working_chain = Chain(mentions, self.most_specific_mention_indexes[index])
+            working_chain.index = index
+            chains.append(working_chain)
+        return chains
+
+
+class ResolutionTable:
+    """Holds the result of *ChainHolder.resolve_all()* for a document as flat arrays: the
+    tokens to which the token at index *i* resolves are at
+    *referent_indexes[offsets[i]:offsets[i + 1]]*, an empty slice meaning that the token is
+    not an anaphor.
+    """
+
+    TYPECODE = "i"
+
+    def __init__(self, offsets: array, referent_indexes: array):
+        self.offsets = offsets
+        self.referent_indexes = referent_indexes
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_referent_indexes(self, token_index: int) -> Optional[List[int]]:
+        """Returns the indexes of the tokens to which the token at *token_index* points,
+        or *None* if the token is not an anaphor."""
+        start = self.offsets[token_index]
+        end = self.offsets[token_index + 1]
+        if start == end:
+            return None
+        return self.referent_indexes[start:end].tolist()
+
+
+class EmptyChainHolder(ChainHolder):
+    """The holder shared by all tokens that do not belong to any chains once processing of
+    their document has finished. It cannot be changed."""
+
+    __slots__ = ()
+
+    def __init__(self):
+        object.__setattr__(self, "_chains", ())
+        object.__setattr__(self, "chain_columns", None)
+        object.__setattr__(self, "resolution_table", None)
+        object.__setattr__(self, "scratch_arena", None)
+        object.__setattr__(self, "skipped_stages", ())
+        object.__setattr__(self, "token_chain_holders", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("EmptyChainHolder cannot be changed")
+
+    def __reduce__(self) -> str:
+        return "EMPTY_CHAIN_HOLDER"
+
+
+EMPTY_CHAIN_HOLDER = EmptyChainHolder()
+
+
 class Chain:
+
+    __slots__ = ("mentions", "most_specific_mention_index", "index")
+
     def __init__(self, mentions: List["Mention"], most_specific_mention_index: int):
         self.mentions = mentions
         self.most_specific_mention_index = most_specific_mention_index
@@ -159,31 +544,40 @@ class Chain:
         )
 
 
-class Mention:
+class Mention(ScratchAttributesMixin):
+
+    __slots__ = (
+        "root_index",
+        "token_indexes",
+        "token_texts",
+        "scratch_arena",
+        "true_in_training",
+    )
+
     def __init__(self, root: Token = None, include_dependent_siblings: bool = False):
+        self.scratch_arena: Optional[ScratchArena] = None
         if root is not None:  # root==None during deserialization, never otherwise
             doc = root.doc
+            self.scratch_arena = getattr(doc._.coref_chains, "scratch_arena", None)
             self.root_index = root.i
             self.token_indexes = [root.i]
             if include_dependent_siblings:
                 self.token_indexes.extend(
                     [t.i for t in root._.coref_chains.temp_dependent_siblings]
                 )
-            if len(self.token_indexes) > 1:
-                self.pretty_representation = "".join(
-                    (
-                        "[",
-                        "; ".join(
-                            "".join((doc[token_index].text, "(", str(token_index), ")"))
-                            for token_index in self.token_indexes
-                        ),
-                        "]",
-                    )
-                )
-            else:
-                self.pretty_representation = "".join(
-                    (doc[self.root_index].text, "(", str(self.root_index), ")")
-                )
+            self.token_texts = [
+                doc[token_index].text for token_index in self.token_indexes
+            ]
+
+    @property
+    def pretty_representation(self) -> str:
+        token_representations = [
+            "".join((text, "(", str(token_index), ")"))
+            for text, token_index in zip(self.token_texts, self.token_indexes)
+        ]
+        if len(token_representations) > 1:
+            return "".join(("[", "; ".join(token_representations), "]"))
+        return token_representations[0]
 
     def __eq__(self, other):
         return isinstance(other, Mention) and self.token_indexes == other.token_indexes
@@ -282,3 +676,19 @@ class FeatureTable:
 
     def __len__(self) -> int:
         return sum(len(getattr(self, property)) for property in self.__dict__)
+
+    def get_index_maps(self) -> Dict[str, Dict[str, int]]:
+        """Returns a dictionary from the name of each property to a dictionary from each value
+        of the property to the column that represents that value within a oneshot
+        representation of length *len(self)*. The maps are not stored on the feature table
+        itself so that the pickled form of the table remains unchanged.
+        """
+        index_maps = {}
+        offset = 0
+        for property in self.__dict__:
+            values = getattr(self, property)
+            index_maps[property] = {
+                value: offset + index for index, value in enumerate(values)
+            }
+            offset += len(values)
+        return index_maps
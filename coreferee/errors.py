@@ -25,3 +25,11 @@ class VectorsModelHasWrongVersionError(CorefereeError):
 
 class OutdatedCorefereeModelError(CorefereeError):
     pass
+
+
+class ModelArtifactError(CorefereeError):
+    pass
+
+
+class InvalidSettingError(CorefereeError):
+    pass
@@ -177,16 +177,9 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
 
         # avalent verbs
         if token.dep_ != self.root_dep and token.head.pos_ in ("AUX", "VERB"):
-            for avalent_verb_stem in self.avalent_verb_stems:
-                if (
-                    len(
-                        [
-                            child
-                            for child in token.head.subtree
-                            if child.lemma_.startswith(avalent_verb_stem)
-                        ]
-                    )
-                    > 0
+            for child in token.head.subtree:
+                if self.avalent_verb_stems.has_entry_that_prefixes(  # type:ignore[attr-defined]
+                    child.lemma_
                 ):
                     return False
         return True
@@ -201,11 +194,7 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
             return None
 
         def lemma_ends_with_word_in_list(token, word_list):
-            lower_lemma = token.lemma_.lower()
-            for word in word_list:
-                if word.lower().endswith(lower_lemma):
-                    return True
-            return False
+            return word_list.is_suffix_of_entry(token.lemma_)
 
         def get_gender_number_info(token):
             masc = fem = neut = plur = False
@@ -1,4 +1,4 @@
-from typing import List, Set, Tuple, Optional
+from typing import Hashable, List, Set, Tuple, Optional
 from spacy.tokens import Token
 from ...rules import RulesAnalyzer
 from ...data_model import Mention
@@ -170,6 +170,97 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
             return False
         return True
 
+    def is_lexically_compatible_pair(
+        self, referred_root: Token, referring: Token, *args: Hashable
+    ) -> int:
+        """Checks a noun antecedent against an anaphor. *args* contains a single value stating
+        whether the referred mention consists of *referred_root* alone."""
+        (is_single_token,) = args
+        uncertain = False
+        referred_lemma = referred_root.lemma_
+
+        # 'they' referring to singular non-person noun
+        if (
+            self.has_morph(referring, "Number", "Plur")
+            and is_single_token
+            and self.has_morph(referred_root, "Number", "Sing")
+        ):
+            if referred_lemma not in self.person_words:  # type:ignore[attr-defined]
+                if referred_root.tag_ != "NNP" and referred_root.ent_type_ != "PERSON":
+                    return 0
+                else:
+                    # named people who choose to refer to themselves with 'they'
+                    uncertain = True
+            if (
+                referred_lemma in self.exclusively_male_words  # type:ignore[attr-defined]
+                or referred_lemma
+                in self.exclusively_female_words  # type:ignore[attr-defined]
+            ):
+                uncertain = True
+
+        # 'he' or 'she' referring to non-person, non-animal noun
+        if (
+            (
+                self.has_morph(referring, "Gender", "Masc")
+                or self.has_morph(referring, "Gender", "Fem")
+            )
+            and referred_lemma
+            not in self.exclusively_person_words  # type:ignore[attr-defined]
+            and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
+            and referred_lemma not in self.male_names  # type:ignore[attr-defined]
+            and referred_lemma not in self.female_names  # type:ignore[attr-defined]
+            and referred_root.ent_type_ != "PERSON"
+        ):
+            if (
+                referred_root.tag_ != "NNP"
+                and referred_lemma not in self.person_words  # type:ignore[attr-defined]
+            ):
+                return 0
+            else:
+
+                uncertain = True
+        # 'it' referring to person noun or entity
+        if self.has_morph(referring, "Gender", "Neut") and (
+            referred_lemma in self.exclusively_person_words  # type:ignore[attr-defined]
+            or referred_root.ent_type_ == "PERSON"
+        ):
+            return 0
+
+        # 'it' referring to plural proper name
+        if self.has_morph(referring, "Gender", "Neut") and referred_root.tag_ == "NNPS":
+            uncertain = True
+
+        # 'he' referring to female noun
+        if (
+            self.has_morph(referring, "Gender", "Masc")
+            and referred_lemma
+            in self.exclusively_female_words  # type:ignore[attr-defined]
+            and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
+        ):
+            return 0
+
+        # 'she' referring to male noun
+        if (
+            self.has_morph(referring, "Gender", "Fem")
+            and referred_lemma
+            in self.exclusively_male_words  # type:ignore[attr-defined]
+            and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
+        ):
+            return 0
+
+        # 'it' referring to name
+        if (
+            self.has_morph(referring, "Gender", "Neut")
+            and referred_root.tag_ == "NNP"
+            and (
+                referred_lemma in self.male_names  # type:ignore[attr-defined]
+                or referred_lemma in self.female_names  # type:ignore[attr-defined]
+            )
+        ):
+            return 0
+
+        return 1 if uncertain else 2
+
     def is_potential_anaphoric_pair(
         self, referred: Mention, referring: Token, directly: bool
     ) -> int:
@@ -212,98 +303,14 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
 
         if not self.is_potential_anaphor(referred_root):
             # antecedent is a noun
-
-            referred_lemma = referred_root.lemma_
-
-            # 'they' referring to singular non-person noun
-            if (
-                self.has_morph(referring, "Number", "Plur")
-                and len(referred.token_indexes) == 1
-                and self.has_morph(referred_root, "Number", "Sing")
-            ):
-                if referred_lemma not in self.person_words:  # type:ignore[attr-defined]
-                    if (
-                        referred_root.tag_ != "NNP"
-                        and referred_root.ent_type_ != "PERSON"
-                    ):
-                        return 0
-                    else:
-                        # named people who choose to refer to themselves with 'they'
-                        uncertain = True
-                if (
-                    referred_lemma
-                    in self.exclusively_male_words  # type:ignore[attr-defined]
-                    or referred_lemma
-                    in self.exclusively_female_words  # type:ignore[attr-defined]
-                ):
-                    uncertain = True
-
-            # 'he' or 'she' referring to non-person, non-animal noun
-            if (
-                (
-                    self.has_morph(referring, "Gender", "Masc")
-                    or self.has_morph(referring, "Gender", "Fem")
-                )
-                and referred_lemma
-                not in self.exclusively_person_words  # type:ignore[attr-defined]
-                and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
-                and referred_lemma not in self.male_names  # type:ignore[attr-defined]
-                and referred_lemma not in self.female_names  # type:ignore[attr-defined]
-                and referred_root.ent_type_ != "PERSON"
-            ):
-                if (
-                    referred_root.tag_ != "NNP"
-                    and referred_lemma
-                    not in self.person_words  # type:ignore[attr-defined]
-                ):
-                    return 0
-                else:
-
-                    uncertain = True
-            # 'it' referring to person noun or entity
-            if self.has_morph(referring, "Gender", "Neut") and (
-                referred_lemma
-                in self.exclusively_person_words  # type:ignore[attr-defined]
-                or referred_root.ent_type_ == "PERSON"
-            ):
+            lexical_compatibility = self.get_lexical_compatibility(
+                referred_root, referring, len(referred.token_indexes) == 1
+            )
+            if lexical_compatibility == 0:
                 return 0
-
-            # 'it' referring to plural proper name
-            if (
-                self.has_morph(referring, "Gender", "Neut")
-                and referred_root.tag_ == "NNPS"
-            ):
+            if lexical_compatibility == 1:
                 uncertain = True
 
-            # 'he' referring to female noun
-            if (
-                self.has_morph(referring, "Gender", "Masc")
-                and referred_lemma
-                in self.exclusively_female_words  # type:ignore[attr-defined]
-                and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
-            ):
-                return 0
-
-            # 'she' referring to male noun
-            if (
-                self.has_morph(referring, "Gender", "Fem")
-                and referred_lemma
-                in self.exclusively_male_words  # type:ignore[attr-defined]
-                and referred_lemma not in self.animal_words  # type:ignore[attr-defined]
-            ):
-                return 0
-
-            # 'it' referring to name
-            if (
-                self.has_morph(referring, "Gender", "Neut")
-                and referred_root.tag_ == "NNP"
-                and (
-                    referred_lemma in self.male_names  # type:ignore[attr-defined]
-                    or referred_lemma in self.female_names  # type:ignore[attr-defined]
-                )
-            ):
-                return 0
-
             # 'he' referring to female name
             if (
                 self.has_morph(referring, "Gender", "Masc")
@@ -1,7 +1,7 @@
 # Copyright (C) 2021 Valentin-Gabriel Soumah, 2021 msg systems ag,
 # 2021-2022 ExplosionAI GmbH
 
-from typing import List, Set, Tuple, Optional, cast
+from typing import List, Set, Tuple, Optional, Hashable, cast
 from spacy.tokens import Token
 from ...rules import RulesAnalyzer
 from ...data_model import Mention
@@ -144,6 +144,18 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
 
     french_word = re.compile("[\\-\\w][\\-\\w'&\\.]*$")
 
+    def set_up_lexicons(self) -> None:
+        super().set_up_lexicons()
+        self.person_nouns = self.person_roles.union(  # type:ignore[attr-defined]
+            self.entity_noun_dictionary["PER"]
+        )
+        self.person_role_reverse_entity_noun_dictionary = {
+            noun: "PER" for noun in self.person_roles  # type:ignore[attr-defined]
+        }
+        self.person_role_reverse_entity_noun_dictionary.update(
+            self.reverse_entity_noun_dictionary
+        )
+
     def get_dependent_siblings(self, token: Token) -> List[Token]:
         def add_siblings_recursively(
             recursed_token: Token, visited_set: set
@@ -453,9 +465,9 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
                 if token.lemma_ in self.female_names:  # type:ignore[attr-defined]
                     fem = True
                 if (
-                    token.lemma_
-                    not in self.male_names  # type:ignore[attr-defined]
-                    + self.female_names  # type:ignore[attr-defined]
+                    token.lemma_ not in self.male_names  # type:ignore[attr-defined]
+                    and token.lemma_
+                    not in self.female_names  # type:ignore[attr-defined]
                 ):
                     masc = fem = True
                 if not plur:
@@ -502,15 +514,15 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
         if (
             token.ent_type_ == "PER"
             or self.is_quelqun_head(token)
-            or token.lemma_.lower()
-            in self.entity_noun_dictionary["PER"]
-            + self.person_roles  # type:ignore[attr-defined]
+            or token.lemma_.lower() in self.person_nouns  # type:ignore[attr-defined]
         ):
             return True
         if (
             token.pos_ == self.propn_pos
-            and token.lemma_
-            in self.male_names + self.female_names  # type:ignore[attr-defined]
+            and (
+                token.lemma_ in self.male_names  # type:ignore[attr-defined]
+                or token.lemma_ in self.female_names  # type:ignore[attr-defined]
+            )
             and (
                 token.ent_type_ not in ["LOC", "ORG"]
                 or token.lemma_
@@ -913,14 +925,15 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
         if self.is_potential_anaphor(referred_root):
             return False
 
-        referred_verb_ancestors = []
+        tree_index = doc._.coref_chains.temp_tree_index
+        referred_verb_ancestor_indexes = []
         # Find the ancestors of the referent that are verbs, stopping anywhere where there
         # is conjunction between verbs
         for ancestor in referred_root.ancestors:
             if ancestor.pos_ in self.clause_root_pos or any(
                 child for child in ancestor.children if child.dep_ == "cop"
             ):
-                referred_verb_ancestors.append(ancestor)
+                referred_verb_ancestor_indexes.append(ancestor.i)
             if ancestor.dep_ in self.dependent_sibling_deps:
                 break
 
@@ -942,21 +955,15 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
         for referring_verb_ancestor in (
             t
             for t in referring_inclusive_ancestors
-            if t not in referred_verb_ancestors
+            if t.i not in referred_verb_ancestor_indexes
             and t.dep_ in self.adverbial_clause_deps
             and t.pos_ in self.clause_root_pos + self.noun_pos + ("ADJ",)
         ):
             # If one of the elements of the second list has one of the elements of the first list
             # within its ancestors, we have subordination and cataphora is permissible
-            if (
-                len(
-                    [
-                        t
-                        for t in referring_verb_ancestor.ancestors
-                        if t in referred_verb_ancestors
-                    ]
-                )
-                > 0
+            if any(
+                tree_index.is_ancestor(index, referring_verb_ancestor.i)
+                for index in referred_verb_ancestor_indexes
             ):
                 return True
         return False
@@ -1218,6 +1225,13 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
             return True
         return False
 
+    def get_coreferring_noun_keys(
+        self, token: Token
+    ) -> Optional[Tuple[List[Hashable], List[Hashable]]]:
+        # *is_potential_coreferring_noun_pair()* also accepts determined non-nouns and
+        # language-dependent pairs, so every preceding token has to be examined
+        return None
+
     def is_potential_coreferring_noun_pair(
         self, referred: Token, referring: Token
     ) -> bool:
@@ -1273,9 +1287,9 @@ class LanguageSpecificRulesAnalyzer(RulesAnalyzer):
         if not self.is_potential_coreferring_pair_with_substantive(referred, referring):
             return False
         # e.g. 'Peugeot' -> 'l'entreprise'
-        new_reverse_entity_noun_dictionary = {
-            noun: "PER" for noun in self.person_roles  # type:ignore[attr-defined]
-        } | self.reverse_entity_noun_dictionary
+        new_reverse_entity_noun_dictionary = (
+            self.person_role_reverse_entity_noun_dictionary
+        )
 
         if (
             self.get_noun_core_lemma(referring) in new_reverse_entity_noun_dictionary
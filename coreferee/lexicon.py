@@ -0,0 +1,173 @@
+from typing import Any, Dict, Iterable, Iterator, FrozenSet, Optional, Sequence, Set
+from typing import Tuple
+
+
+class CharacterTrie:
+    """A trie of the characters of a list of words that answers prefix questions in time
+    proportional to the length of the word being looked up, regardless of the number of
+    words in the list.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        # Each node maps characters to child nodes; the key *None* marks the end of a word
+        self.root: Dict[Optional[str], Any] = {}
+        for word in words:
+            node = self.root
+            for character in word:
+                node = node.setdefault(character, {})
+            node[None] = True
+
+    def is_prefix_of_word(self, text: str) -> bool:
+        """Returns *True* if at least one word begins with *text*."""
+        node = self.root
+        for character in text:
+            if character not in node:
+                return False
+            node = node[character]
+        return len(node) > 0
+
+    def has_word_that_prefixes(self, text: str) -> bool:
+        """Returns *True* if at least one word is a prefix of *text*."""
+        node = self.root
+        for character in text:
+            if None in node:
+                return True
+            if character not in node:
+                return False
+            node = node[character]
+        return None in node
+
+
+class PhraseTrie:
+    """A trie of the lowercase words of a list of phrases that finds all occurrences of the
+    phrases within a sequence of words in a single pass, so that the cost of the search does
+    not depend on the number of phrases.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        # Each node maps words to child nodes; the key *None* marks the end of a phrase and
+        # maps to the positions within the phrase whose words the phrase covers, which are the
+        # positions where a word occurs for the first time within the phrase.
+        self.root: Dict[Optional[str], Any] = {}
+
+        # The number of words in the longest phrase
+        self.maximum_length = 0
+        for phrase in phrases:
+            lower_phrase = phrase.lower()
+            words = lower_phrase.split()
+            if len(words) == 0 or " ".join(words) != lower_phrase:
+                # could never equal a sequence of words joined by single spaces
+                continue
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            self.maximum_length = max(self.maximum_length, len(words))
+            node[None] = tuple(
+                position
+                for position, word in enumerate(words)
+                if words.index(word) == position
+            )
+
+    def get_covered_indexes(self, words: Sequence[str]) -> Set[int]:
+        """Returns the indexes within *words*, which must be lowercase, of the words that are
+        covered by occurrences of the phrases."""
+        covered_indexes = set()
+        for start_index in range(len(words)):
+            node = self.root
+            index = start_index
+            while index < len(words) and words[index] in node:
+                node = node[words[index]]
+                index += 1
+                if None in node:
+                    covered_indexes.update(
+                        start_index + position for position in node[None]
+                    )
+        return covered_indexes
+
+
+class Lexicon:
+    """An immutable list of words or phrases, e.g. the contents of one of the *.dat* files
+    within *lang/<language>/data*. Membership tests are hash-backed and take constant time;
+    iteration returns the entries in the order in which they were supplied.
+    """
+
+    def __init__(self, entries: Iterable[str]):
+        self.entries: Tuple[str, ...] = tuple(dict.fromkeys(entries))
+        self.entry_set: FrozenSet[str] = frozenset(self.entries)
+        self.lower_entry_set: FrozenSet[str] = frozenset(
+            entry.lower() for entry in self.entries
+        )
+        self._phrase_trie: Optional[PhraseTrie] = None
+        self._prefix_trie: Optional[CharacterTrie] = None
+        self._lower_suffix_trie: Optional[CharacterTrie] = None
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.entry_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        return str(list(self.entries))
+
+    def __repr__(self) -> str:
+        return "".join(("Lexicon(", str(self), ")"))
+
+    def contains(self, word: str, *, ignore_case: bool = False) -> bool:
+        """Returns *True* if *word* is an entry. If *ignore_case==True*, the lowercase form of
+        *word* is compared with the lowercase forms of the entries."""
+        if ignore_case:
+            return word.lower() in self.lower_entry_set
+        return word in self.entry_set
+
+    @property
+    def phrase_trie(self) -> PhraseTrie:
+        """A *PhraseTrie* of the entries, which is built the first time it is requested."""
+        if self._phrase_trie is None:
+            self._phrase_trie = PhraseTrie(self.entries)
+        return self._phrase_trie
+
+    def has_entry_that_prefixes(self, word: str) -> bool:
+        """Returns *True* if *word* begins with one of the entries, e.g. a verb lemma with
+        one of a list of verb stems."""
+        if self._prefix_trie is None:
+            self._prefix_trie = CharacterTrie(self.entries)
+        return self._prefix_trie.has_word_that_prefixes(word)
+
+    def is_suffix_of_entry(self, word: str) -> bool:
+        """Returns *True* if the lowercase form of one of the entries ends with the lowercase
+        form of *word*, e.g. if *word* is the head of a German compound noun in the lexicon.
+        The lookup uses a trie of the reversed entries and so takes time proportional to the
+        length of *word*."""
+        if self._lower_suffix_trie is None:
+            self._lower_suffix_trie = CharacterTrie(
+                entry.lower()[::-1] for entry in self.entries
+            )
+        return self._lower_suffix_trie.is_prefix_of_word(word.lower()[::-1])
+
+    def union(self, *others: Iterable[str]) -> "Lexicon":
+        """Returns a new lexicon containing the entries of this lexicon followed by any
+        further entries of *others*."""
+        entries = list(self.entries)
+        for other in others:
+            entries.extend(other)
+        return Lexicon(entries)
+
+    def difference(self, other: "Lexicon") -> "Lexicon":
+        """Returns a new lexicon containing the entries of this lexicon that are not
+        entries of *other*."""
+        return Lexicon(entry for entry in self.entries if entry not in other)
+
+    @staticmethod
+    def from_file(filename: str) -> "Lexicon":
+        """Reads a lexicon from a *.dat* file with one entry per line. Lines that begin with
+        '#' and lines with fewer than two characters are ignored."""
+        with open(filename, "r", encoding="utf-8") as file:
+            return Lexicon(
+                v.strip()
+                for v in file.read().splitlines()
+                if len(v.strip()) > 1 and not v.strip().startswith("#")
+            )
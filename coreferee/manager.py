@@ -1,21 +1,37 @@
-from typing import Dict, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    cast,
+)
+import hashlib
 import importlib
 import os
 import pickle
 import traceback
 from sys import exc_info
+from threading import Lock, RLock
 
-from numpy import absolute
+import numpy
 from packaging import version
 import spacy
+import srsly  # type:ignore[import]
 import pkg_resources
 from wasabi import Printer  # type: ignore[import]
 from spacy.language import Language
 from spacy.tokens import Doc, Token
+from spacy.vectors import Vectors
+from spacy.util import minibatch
 from thinc.api import Config
 from thinc.model import Model
 from .annotation import Annotator
-from .data_model import FeatureTable
+from .artifact import read_artifact, read_artifact_source_fingerprint, write_artifact
+from .data_model import ChainHolder, FeatureTable
 from .errors import (
     LanguageNotSupportedError,
     ModelNotSupportedError,
@@ -30,11 +46,219 @@ FEATURE_TABLE_FILENAME = "feature_table.bin"
 
 THINC_MODEL_FILENAME = "model"
 
+ARTIFACT_FILENAME = "coreferee_model.bin"
+
+
+class SharedModel:
+    """The parts of an annotator that do not depend on the pipeline it annotates for: the
+    feature table, the neural ensemble and, if the config entry specifies a separate
+    *vectors_model*, that model together with the projections of its vectors. The rules
+    analyzer and the vectors of the pipeline itself are bound per pipeline by *bind()*.
+    """
+
+    def __init__(
+        self,
+        feature_table: FeatureTable,
+        thinc_ensemble: Model,
+        *,
+        vectors_nlp: Optional[Language] = None,
+        artifact_filename: Optional[str] = None
+    ):
+        self.feature_table = feature_table
+        self.thinc_ensemble = thinc_ensemble
+        self.artifact_filename = artifact_filename
+
+        # The separate vectors model, or *None* if the vectors of each pipeline are used
+        self.vectors_nlp = vectors_nlp
+
+        # The projections of the vectors of *vectors_nlp*; projections of the vectors of a
+        # pipeline are held by the annotator bound to that pipeline
+        self.reduced_vector_tables: Dict[int, Dict[Hashable, Any]] = {}
+
+    def bind(self, nlp: Language) -> Annotator:
+        """Returns a new annotator for *nlp* that uses this model. The model keeps no
+        reference to *nlp*, so the registry does not keep pipelines alive."""
+        annotator = Annotator(
+            nlp,
+            nlp if self.vectors_nlp is None else self.vectors_nlp,
+            self.feature_table,
+            self.thinc_ensemble,
+            artifact_filename=self.artifact_filename,
+        )
+        if self.vectors_nlp is not None:
+            annotator.tendencies_analyzer.reduced_vector_tables = (
+                self.reduced_vector_tables
+            )
+        return annotator
+
+
+class AnnotatorRegistry:
+    """A thread-safe cache of shared models that allows pipelines within the same process
+    that are based on the same spaCy model to share a single copy of the neural ensemble
+    weights and of any separate vectors table. Each pipeline is given its own annotator
+    bound to its own vocabulary. Shared models are never modified after they have been
+    created apart from caches that are valid for their whole lifetime, so sharing them is
+    safe.
+
+    Evicting a shared model only removes it from the registry; pipelines that are already
+    using it go on doing so.
+    """
+
+    def __init__(self):
+        # Guards the dictionaries; each model is created under the lock for its own key so
+        # that loading one model does not hold up lookups of the others
+        self.lock = RLock()
+        self.key_to_model: Dict[Tuple[Hashable, ...], SharedModel] = {}
+        self.key_to_lock: Dict[Tuple[Hashable, ...], Lock] = {}
+
+    @staticmethod
+    def get_key(
+        nlp: Language,
+        config_entry_name: str,
+        *,
+        memory_map_vectors: bool,
+        vectors_lemmas: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[Hashable, ...]:
+        return (
+            nlp.meta["lang"],
+            config_entry_name,
+            nlp.meta["name"],
+            nlp.meta["version"],
+            memory_map_vectors,
+            None if vectors_lemmas is None else frozenset(vectors_lemmas),
+        )
+
+    def get_annotator(
+        self,
+        key: Tuple[Hashable, ...],
+        nlp: Language,
+        create_model: Callable[[], SharedModel],
+    ) -> Annotator:
+        """Returns an annotator for *nlp* that uses the model registered under *key*,
+        calling *create_model()* and registering the result if there is none."""
+        with self.lock:
+            key_lock = self.key_to_lock.setdefault(key, Lock())
+        with key_lock:
+            with self.lock:
+                model = self.key_to_model.get(key)
+            if model is None:
+                model = create_model()
+                with self.lock:
+                    self.key_to_model[key] = model
+        return model.bind(nlp)
+
+    def evict(
+        self, lang: Optional[str] = None, config_entry_name: Optional[str] = None
+    ) -> int:
+        """Removes the models for *lang* and *config_entry_name*, or all models if neither
+        is specified, and returns the number of models removed."""
+        with self.lock:
+            keys = [
+                key
+                for key in self.key_to_model
+                if (lang is None or key[0] == lang)
+                and (config_entry_name is None or key[1] == config_entry_name)
+            ]
+            for key in keys:
+                del self.key_to_model[key]
+            return len(keys)
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """Returns a dictionary from a description of each registered model to the number
+        of bytes taken up by its weights and, if it has a separate vectors model, by the
+        vectors table of that model and its projection tables. Memory-mapped weights and
+        vectors are included even though they may not be resident. Each description names
+        the spaCy model and the config entry together with any vectors options, so that
+        models registered for different options are reported separately.
+        """
+        with self.lock:
+            key_to_model = dict(self.key_to_model)
+        memory_usage = {}
+        for key, model in key_to_model.items():
+            number_of_bytes = sum(
+                node.get_param(param_name).nbytes
+                for node in model.thinc_ensemble.walk()
+                for param_name in node.param_names
+                if node.has_param(param_name)
+            )
+            if model.vectors_nlp is not None:
+                number_of_bytes += model.vectors_nlp.vocab.vectors.data.nbytes
+                number_of_bytes += sum(
+                    projection.nbytes
+                    for table in model.reduced_vector_tables.values()
+                    for projection in table.values()
+                )
+            options = [key[1]]
+            if key[4]:
+                options.append("memory-mapped vectors")
+            if key[5] is not None:
+                options.append(
+                    "".join(
+                        (
+                            str(len(key[5])),
+                            " vector lemmas ",
+                            hashlib.sha256(
+                                "\n".join(sorted(key[5])).encode("utf-8")
+                            ).hexdigest()[:8],
+                        )
+                    )
+                )
+            description = "".join(
+                (key[0], "_", key[2], "-", key[3], " (", ", ".join(options), ")")
+            )
+            memory_usage[description] = number_of_bytes
+        return memory_usage
+
+
+annotator_registry = AnnotatorRegistry()
+
 
 class CorefereeManager:
     @staticmethod
-    def get_annotator(nlp: Language) -> Annotator:
-        model_name = "_".join((nlp.meta["lang"], nlp.meta["name"]))
+    def get_annotator(
+        nlp: Language,
+        *,
+        memory_map_vectors: bool = False,
+        vectors_lemmas: Optional[Iterable[str]] = None
+    ) -> Annotator:
+        """Returns a new annotator for *nlp* that uses the model registered for it in
+        *annotator_registry*. For config entries that specify a separate *vectors_model*,
+        the arguments are passed on to *load_vectors_nlp()*.
+        """
+        config_entry_name, config_entry = CorefereeManager.get_config_entry(nlp)
+        if vectors_lemmas is not None:
+            vectors_lemmas = tuple(vectors_lemmas)
+
+        def create_model() -> SharedModel:
+            feature_table, thinc_model, artifact_filename = load_model(
+                nlp.meta["lang"], config_entry_name
+            )
+            return SharedModel(
+                feature_table,
+                thinc_model,
+                vectors_nlp=CorefereeManager.get_separate_vectors_nlp(
+                    nlp,
+                    config_entry,
+                    memory_map_vectors=memory_map_vectors,
+                    vectors_lemmas=vectors_lemmas,
+                ),
+                artifact_filename=artifact_filename,
+            )
+
+        return annotator_registry.get_annotator(
+            AnnotatorRegistry.get_key(
+                nlp,
+                config_entry_name,
+                memory_map_vectors=memory_map_vectors,
+                vectors_lemmas=vectors_lemmas,
+            ),
+            nlp,
+            create_model,
+        )
+
+    @staticmethod
+    def get_config_entry(nlp: Language) -> Tuple[str, Dict[str, str]]:
+        """Returns the name and the contents of the config entry that supports *nlp*."""
         relative_config_filename = os.sep.join(("lang", nlp.meta["lang"], "config.cfg"))
         if not pkg_resources.resource_exists(__name__, relative_config_filename):
             msg = Printer()
@@ -60,60 +284,7 @@ class CorefereeManager:
                 and version.parse(nlp.meta["version"])
                 <= version.parse(config_entry["to_version"])
             ):
-                if "vectors_model" in config_entry:
-                    try:
-                        vectors_nlp = spacy.load(
-                            "_".join((nlp.meta["lang"], config_entry["vectors_model"]))
-                        )
-                    except OSError:
-                        msg = Printer()
-                        error_msg = "".join(
-                            (
-                                "spaCy Model ",
-                                model_name,
-                                " is only supported by Coreferee in conjunction with spaCy model ",
-                                nlp.meta["lang"],
-                                "_",
-                                config_entry["vectors_model"],
-                                ", which must be loaded using the command 'python -m spacy download ",
-                                nlp.meta["lang"],
-                                "_",
-                                config_entry["vectors_model"],
-                                "'.",
-                            )
-                        )
-                        msg.fail(error_msg)
-                        raise VectorsModelNotInstalledError(error_msg)
-                    if version.parse(vectors_nlp.meta["version"]) < version.parse(
-                        config_entry["from_version"]
-                    ) or version.parse(vectors_nlp.meta["version"]) > version.parse(
-                        config_entry["to_version"]
-                    ):
-                        msg = Printer()
-                        error_msg = "".join(
-                            (
-                                "spaCy model ",
-                                model_name,
-                                " is only supported by Coreferee in conjunction with spaCy model ",
-                                nlp.meta["lang"],
-                                "_",
-                                config_entry["vectors_model"],
-                                " between versions ",
-                                config_entry["from_version"],
-                                " and ",
-                                config_entry["to_version"],
-                                " inclusive.",
-                            )
-                        )
-                        msg.fail(error_msg)
-                        raise VectorsModelHasWrongVersionError(error_msg)
-                else:
-                    vectors_nlp = nlp
-                return get_annotator(
-                    nlp=nlp,
-                    vectors_nlp=vectors_nlp,
-                    config_entry_name=config_entry_name,
-                )
+                return config_entry_name, config_entry
         msg = Printer()
         error_msg = "".join(
             (
@@ -131,51 +302,362 @@ class CorefereeManager:
         msg.fail(error_msg)
         raise ModelNotSupportedError(error_msg)
 
+    @staticmethod
+    def get_vectors_nlp(
+        nlp: Language,
+        config_entry: Dict[str, str],
+        *,
+        memory_map_vectors: bool = False,
+        vectors_lemmas: Optional[Iterable[str]] = None
+    ) -> Language:
+        """Returns the model whose vectors are used together with *nlp*, which is *nlp*
+        itself unless *config_entry* specifies a separate *vectors_model*."""
+        vectors_nlp = CorefereeManager.get_separate_vectors_nlp(
+            nlp,
+            config_entry,
+            memory_map_vectors=memory_map_vectors,
+            vectors_lemmas=vectors_lemmas,
+        )
+        return nlp if vectors_nlp is None else vectors_nlp
 
-@Language.factory("coreferee")
+    @staticmethod
+    def get_separate_vectors_nlp(
+        nlp: Language,
+        config_entry: Dict[str, str],
+        *,
+        memory_map_vectors: bool = False,
+        vectors_lemmas: Optional[Iterable[str]] = None
+    ) -> Optional[Language]:
+        """Returns the *vectors_model* specified by *config_entry* for use together with
+        *nlp*, or *None* if *config_entry* does not specify one."""
+        if "vectors_model" not in config_entry:
+            return None
+        model_name = "_".join((nlp.meta["lang"], nlp.meta["name"]))
+        try:
+            vectors_nlp = load_vectors_nlp(
+                "_".join((nlp.meta["lang"], config_entry["vectors_model"])),
+                memory_map=memory_map_vectors,
+                lemmas=vectors_lemmas,
+            )
+        except (OSError, ImportError):
+            msg = Printer()
+            error_msg = "".join(
+                (
+                    "spaCy Model ",
+                    model_name,
+                    " is only supported by Coreferee in conjunction with spaCy model ",
+                    nlp.meta["lang"],
+                    "_",
+                    config_entry["vectors_model"],
+                    ", which must be loaded using the command 'python -m spacy download ",
+                    nlp.meta["lang"],
+                    "_",
+                    config_entry["vectors_model"],
+                    "'.",
+                )
+            )
+            msg.fail(error_msg)
+            raise VectorsModelNotInstalledError(error_msg)
+        if version.parse(vectors_nlp.meta["version"]) < version.parse(
+            config_entry["from_version"]
+        ) or version.parse(vectors_nlp.meta["version"]) > version.parse(
+            config_entry["to_version"]
+        ):
+            msg = Printer()
+            error_msg = "".join(
+                (
+                    "spaCy model ",
+                    model_name,
+                    " is only supported by Coreferee in conjunction with spaCy model ",
+                    nlp.meta["lang"],
+                    "_",
+                    config_entry["vectors_model"],
+                    " between versions ",
+                    config_entry["from_version"],
+                    " and ",
+                    config_entry["to_version"],
+                    " inclusive.",
+                )
+            )
+            msg.fail(error_msg)
+            raise VectorsModelHasWrongVersionError(error_msg)
+        return vectors_nlp
+
+
+@Language.factory(
+    "coreferee",
+    default_config={
+        "memory_map_vectors": False,
+        "token_chains": True,
+        "retry_depth": None,
+        "ensemble_size": None,
+        "maximum_anaphora_sentence_referential_distance": None,
+        "maximum_coreferring_nouns_sentence_referential_distance": None,
+        "time_budget": None,
+    },
+)
 class CorefereeBroker:
-    def __init__(self, nlp: Language, name: str):
+    def __init__(
+        self,
+        nlp: Language,
+        name: str,
+        memory_map_vectors: bool,
+        token_chains: bool,
+        retry_depth: Optional[int],
+        ensemble_size: Optional[int],
+        maximum_anaphora_sentence_referential_distance: Optional[int],
+        maximum_coreferring_nouns_sentence_referential_distance: Optional[int],
+        time_budget: Optional[float],
+    ):
         self.nlp = nlp
         self.pid = os.getpid()
-        self.annotator = CorefereeManager().get_annotator(nlp)
+        self.memory_map_vectors = memory_map_vectors
+
+        # If *False*, chains are only added to *doc._.coref_chains* during annotation and
+        # *token._.coref_chains* is derived from them when it is first requested
+        self.token_chains = token_chains
+
+        # The settings passed to *Annotator.with_settings()*; *None* keeps the default
+        self.settings: Dict[str, Optional[float]] = {
+            "retry_depth": retry_depth,
+            "ensemble_size": ensemble_size,
+            "maximum_anaphora_sentence_referential_distance": maximum_anaphora_sentence_referential_distance,
+            "maximum_coreferring_nouns_sentence_referential_distance": maximum_coreferring_nouns_sentence_referential_distance,
+            "time_budget": time_budget,
+        }
+        # The state the broker was unpickled from until *self.annotator* is first requested
+        self.unpickled_state: Optional[Dict[str, Any]] = None
+        self._annotator: Optional[Annotator] = (
+            CorefereeManager()
+            .get_annotator(nlp, memory_map_vectors=memory_map_vectors)
+            .with_settings(**self.settings)
+        )
+
+    @property
+    def annotator(self) -> Annotator:
+        """The annotator used by the broker. For an unpickled broker, it is only created
+        when it is first requested, as *self.nlp* may not yet have been restored when
+        *__setstate__()* is called."""
+        if self._annotator is None:
+            self._annotator = self.create_unpickled_annotator()
+            self.unpickled_state = None
+        return self._annotator
+
+    @staticmethod
+    def warn_about_exception(message: str) -> None:
+        """Reports the exception currently being handled together with its traceback."""
+        msg = Printer()
+        msg.warn(message)
+        exception_info_parts = exc_info()
+        msg.warn(exception_info_parts[0])
+        msg.warn(exception_info_parts[1])
+        traceback.print_tb(exception_info_parts[2])
 
     def __call__(self, doc: Doc) -> Doc:
         try:
-            self.annotator.annotate(doc)
-        except:
-            msg = Printer()
-            msg.warn("Unexpected error in Coreferee annotating document, skipping ....")
-            exception_info_parts = exc_info()
-            msg.warn(exception_info_parts[0])
-            msg.warn(exception_info_parts[1])
-            traceback.print_tb(exception_info_parts[2])
+            self.annotator.annotate(doc, token_chains=self.token_chains)
+        except Exception:
+            self.warn_about_exception(
+                "Unexpected error in Coreferee annotating document, skipping ...."
+            )
         return doc
 
-    def __getstate__(self) -> Dict[str, str]:
-        return self.nlp.meta
+    def pipe(self, docs: Iterable[Doc], batch_size: int = 128) -> Iterator[Doc]:
+        """Annotates *docs* in batches of *batch_size*, scoring each batch with a single
+        call to the neural ensemble. If a batch cannot be annotated as a whole, the documents
+        whose annotation did not finish are annotated individually."""
+        for batch in minibatch(docs, size=batch_size):
+            for doc in batch:
+                # Any annotations from earlier runs are replaced, so that documents
+                # whose annotation finished can be recognised if the batch fails
+                doc._.coref_chains = None
+            try:
+                self.annotator.annotate_docs(batch, token_chains=self.token_chains)
+            except Exception:
+                self.warn_about_exception(
+                    "Unexpected error in Coreferee annotating batch, annotating unfinished documents individually ...."
+                )
+                for doc in batch:
+                    # The scratch arena is only released once annotation has finished
+                    if (
+                        doc._.coref_chains is None
+                        or doc._.coref_chains.scratch_arena is not None
+                    ):
+                        self(doc)
+            yield from batch
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Returns the state of the broker. *self.nlp* is included as an object reference
+        so that, when the broker is pickled as part of its pipeline, e.g. for
+        *nlp.pipe(n_process=...)*, it is re-bound to the unpickled pipeline rather than
+        loading a second copy. If the weights were loaded from a model artifact, only the
+        name of the artifact is included, as the unpickling process can memory-map it;
+        otherwise the feature table and the thinc model are serialized."""
+        state: Dict[str, Any] = {
+            "nlp": self.nlp,
+            "memory_map_vectors": self.memory_map_vectors,
+            "token_chains": self.token_chains,
+            "settings": self.settings,
+        }
+        if self._annotator is None:
+            # the annotator has not been created since the broker was unpickled
+            unpickled_state = cast(Dict[str, Any], self.unpickled_state)
+            for key in ("artifact_filename", "feature_table", "thinc_model"):
+                if key in unpickled_state:
+                    state[key] = unpickled_state[key]
+        elif self.annotator.artifact_filename is not None:
+            state["artifact_filename"] = self.annotator.artifact_filename
+        else:
+            state[
+                "feature_table"
+            ] = self.annotator.tendencies_analyzer.feature_table.__dict__
+            state["thinc_model"] = self.annotator.trained_thinc_ensemble.to_bytes()
+        return state
 
-    def __setstate__(self, meta: Dict[str, str]):
-        nlp_name = "_".join((meta["lang"], meta["name"]))
-        self.nlp = spacy.load(nlp_name)
-        self.annotator = CorefereeManager().get_annotator(self.nlp)
+    def __setstate__(self, state: Dict[str, Any]):
+        """Only restores the fields of the broker. When the broker is unpickled as part of
+        its pipeline, *self.nlp* is not yet fully restored at this point, so the annotator
+        is created when it is first requested."""
+        self.nlp = state["nlp"]
+        self.memory_map_vectors = state["memory_map_vectors"]
+        self.token_chains = state.get("token_chains", True)
+        self.settings = state.get("settings", {})
+        self.unpickled_state = state
+        self._annotator = None
         self.pid = os.getpid()
         CorefereeBroker.set_extensions()
 
+    def create_unpickled_annotator(self) -> Annotator:
+        """Creates the annotator for a broker from *self.unpickled_state*."""
+        state = cast(Dict[str, Any], self.unpickled_state)
+        config_entry_name, config_entry = CorefereeManager.get_config_entry(self.nlp)
+
+        def create_model() -> SharedModel:
+            vectors_nlp = CorefereeManager.get_separate_vectors_nlp(
+                self.nlp, config_entry, memory_map_vectors=self.memory_map_vectors
+            )
+            if "artifact_filename" in state:
+                feature_table, thinc_model = read_artifact(state["artifact_filename"])
+                return SharedModel(
+                    feature_table,
+                    thinc_model,
+                    vectors_nlp=vectors_nlp,
+                    artifact_filename=state["artifact_filename"],
+                )
+            return SharedModel(
+                FeatureTable(**state["feature_table"]),
+                create_thinc_model().from_bytes(state["thinc_model"]),
+                vectors_nlp=vectors_nlp,
+            )
+
+        return annotator_registry.get_annotator(
+            AnnotatorRegistry.get_key(
+                self.nlp,
+                config_entry_name,
+                memory_map_vectors=self.memory_map_vectors,
+            ),
+            self.nlp,
+            create_model,
+        ).with_settings(**self.settings)
+
     @staticmethod
     def set_extensions() -> None:
         if not Doc.has_extension("coref_chains"):
             Doc.set_extension("coref_chains", default=None)
         if not Token.has_extension("coref_chains"):
-            Token.set_extension("coref_chains", default=None)
+            Token.set_extension(
+                "coref_chains", getter=ChainHolder.get_token_chain_holder
+            )
+
+
+def load_vectors_nlp(
+    name: str, *, memory_map: bool = False, lemmas: Optional[Iterable[str]] = None
+) -> Language:
+    """Loads the vocabulary of the spaCy model package *name* into a blank pipeline.
+    Coreferee only ever looks up vectors in a vectors model, so there is no point in
+    loading its tagger, parser, etc.
+
+    If *memory_map==True*, the vectors table is memory-mapped from the installed model
+    without first being read into memory, so that processes on the same machine share
+    its pages and do not each hold their own copy.
+
+    If *lemmas* is specified, the vectors table is pruned to the vectors of those lemmas,
+    e.g. the lemmas seen in training. Lookups of other words then behave as for words that
+    have no vector. A pruned table is held in memory even if *memory_map==True*.
+    """
+    package_path = spacy.util.get_package_path(name)
+    meta = spacy.util.get_model_meta(package_path)
+    # the layout used by *spacy.util.load_model_from_init_py()*
+    data_path = package_path / "".join(
+        (meta["lang"], "_", meta["name"], "-", meta["version"])
+    )
+    vocab_path = data_path / "vocab"
+    vectors_nlp = spacy.blank(meta["lang"])
+    vectors_nlp.meta = meta
+    vectors_nlp.vocab.from_disk(vocab_path, exclude=["vectors"])
+    vectors_filename = vocab_path / "vectors"
+    vectors_config_filename = vocab_path / "vectors.cfg"
+    if (
+        (memory_map or lemmas is not None)
+        and vectors_filename.is_file()
+        and (vocab_path / "key2row").is_file()
+        and (
+            not vectors_config_filename.is_file()
+            or srsly.read_json(vectors_config_filename).get("mode", "default")
+            == "default"
+        )
+    ):
+        vectors = Vectors(data=numpy.load(str(vectors_filename), mmap_mode="r"))
+        for key, row in srsly.read_msgpack(vocab_path / "key2row").items():
+            vectors.add(key, row=row)
+    else:
+        vectors = vectors_nlp.vocab.vectors
+        vectors.from_disk(vocab_path, exclude=["strings"])
+    if lemmas is not None:
+        keys = [
+            key
+            for key in dict.fromkeys(
+                vectors_nlp.vocab.strings.add(lemma) for lemma in lemmas
+            )
+            if key in vectors
+        ]
+        # *Vectors* only accepts *strings* from spaCy 3.2 onwards; assigning the table to
+        # the vocab shares the vocab's strings with it where the table has strings
+        vectors = Vectors(
+            data=numpy.asarray([vectors[key] for key in keys], dtype=numpy.float32)
+            if len(keys) > 0
+            else numpy.zeros((0, vectors.shape[1]), dtype=numpy.float32),
+            keys=keys,
+        )
+    vectors_nlp.vocab.vectors = vectors
+    return vectors_nlp
 
 
 def get_annotator(
     *, nlp: Language, vectors_nlp: Language, config_entry_name: str
 ) -> Annotator:
+    feature_table, thinc_model, artifact_filename = load_model(
+        nlp.meta["lang"], config_entry_name
+    )
+    return Annotator(
+        nlp,
+        vectors_nlp,
+        feature_table,
+        thinc_model,
+        artifact_filename=artifact_filename,
+    )
+
+
+def load_model(
+    lang: str, config_entry_name: str
+) -> Tuple[FeatureTable, Model, Optional[str]]:
+    """Loads the installed model for *config_entry_name* and returns its feature table, its
+    thinc model and the name of the model artifact it was read from, or *None* if it was
+    read from the legacy format."""
     model_package_name = "".join(
         (
             COMMON_MODELS_PACKAGE_NAMEPART,
-            nlp.meta["lang"],
+            lang,
             ".",
             config_entry_name,
         )
@@ -187,35 +669,137 @@ def get_annotator(
         error_msg = "".join(
             (
                 "Please load the Coreferee models for language '",
-                nlp.meta["lang"],
+                lang,
                 "' with the command 'python -m coreferee install ",
-                nlp.meta["lang"],
+                lang,
                 "'.",
             )
         )
         msg.fail(error_msg)
         raise ModelNotSupportedError(error_msg)
-    this_feature_table_filename = pkg_resources.resource_filename(
-        model_package_name, FEATURE_TABLE_FILENAME
-    )
-    with open(this_feature_table_filename, "rb") as feature_table_file:
-        feature_table = pickle.load(feature_table_file)
-    absolute_thinc_model_filename = pkg_resources.resource_filename(
-        model_package_name, THINC_MODEL_FILENAME
+    artifact_filename = pkg_resources.resource_filename(
+        model_package_name, ARTIFACT_FILENAME
     )
-    if not os.path.isfile(absolute_thinc_model_filename):
+    if has_current_artifact(model_package_name):
+        feature_table, thinc_model = read_artifact(artifact_filename)
+        return feature_table, thinc_model, artifact_filename
+    legacy_model = load_legacy_model(model_package_name)
+    if legacy_model is None:
         msg = Printer()
         error_msg = "".join(
             (
                 "The Coreferee model loaded for config entry '",
                 config_entry_name,
                 "' is outdated. Please issue the command 'python -m coreferee install ",
-                nlp.meta["lang"],
+                lang,
                 "' to install the latest version.",
             )
         )
         msg.fail(error_msg)
         raise OutdatedCorefereeModelError(error_msg)
+    feature_table, thinc_model = legacy_model
+    return feature_table, thinc_model, None
+
+
+def load_legacy_model(model_package_name: str) -> Optional[Tuple[FeatureTable, Model]]:
+    """Loads a model saved as a pickled feature table and a separate thinc model file, as
+    written by earlier versions of Coreferee. Returns *None* if the thinc model file is
+    missing, which is the case for models from before the introduction of thinc."""
+    this_feature_table_filename = pkg_resources.resource_filename(
+        model_package_name, FEATURE_TABLE_FILENAME
+    )
+    absolute_thinc_model_filename = pkg_resources.resource_filename(
+        model_package_name, THINC_MODEL_FILENAME
+    )
+    if not os.path.isfile(absolute_thinc_model_filename):
+        return None
+    with open(this_feature_table_filename, "rb") as feature_table_file:
+        feature_table = pickle.load(feature_table_file)
     thinc_model = create_thinc_model()
     thinc_model.from_disk(absolute_thinc_model_filename)
-    return Annotator(nlp, vectors_nlp, feature_table, thinc_model)
+    return feature_table, thinc_model
+
+
+def get_legacy_model_fingerprint(model_package_name: str) -> Optional[str]:
+    """Returns a hash of the contents of the legacy model files in *model_package_name*, or
+    *None* if the thinc model file is missing."""
+    fingerprint = hashlib.sha256()
+    for filename in (FEATURE_TABLE_FILENAME, THINC_MODEL_FILENAME):
+        absolute_filename = pkg_resources.resource_filename(
+            model_package_name, filename
+        )
+        if not os.path.isfile(absolute_filename):
+            return None
+        with open(absolute_filename, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                fingerprint.update(block)
+    return fingerprint.hexdigest()
+
+
+def has_current_artifact(model_package_name: str) -> bool:
+    """Returns *True* if *model_package_name* contains a model artifact that is either part
+    of the package or was converted from the legacy model files the package contains now.
+
+    An artifact converted by *convert_installed_models()* is not recorded as belonging to
+    the package, so it is left behind when the package is reinstalled and would otherwise
+    shadow the newly installed weights.
+    """
+    artifact_filename = pkg_resources.resource_filename(
+        model_package_name, ARTIFACT_FILENAME
+    )
+    if not os.path.isfile(artifact_filename):
+        return False
+    source_fingerprint = read_artifact_source_fingerprint(artifact_filename)
+    return source_fingerprint is None or source_fingerprint == (
+        get_legacy_model_fingerprint(model_package_name)
+    )
+
+
+def convert_installed_models(lang: str) -> None:
+    """Writes a model artifact for each installed model for *lang* that has so far only been
+    saved in the legacy format, replacing any artifact converted from legacy model files
+    that have since been reinstalled."""
+    msg = Printer()
+    config = Config().from_disk(
+        pkg_resources.resource_filename(
+            __name__, os.sep.join(("lang", lang, "config.cfg"))
+        )
+    )
+    importlib.invalidate_caches()
+    for config_entry_name in config:
+        model_package_name = "".join(
+            (COMMON_MODELS_PACKAGE_NAMEPART, lang, ".", config_entry_name)
+        )
+        try:
+            importlib.import_module(model_package_name)
+        except ModuleNotFoundError:
+            continue
+        artifact_filename = pkg_resources.resource_filename(
+            model_package_name, ARTIFACT_FILENAME
+        )
+        if has_current_artifact(model_package_name):
+            continue
+        legacy_model = load_legacy_model(model_package_name)
+        if legacy_model is None:
+            continue
+        try:
+            write_artifact(
+                artifact_filename,
+                *legacy_model,
+                source_fingerprint=get_legacy_model_fingerprint(model_package_name)
+            )
+        except OSError as error:
+            msg.warn(
+                "".join(
+                    (
+                        "Unable to write model artifact for config entry '",
+                        config_entry_name,
+                        "': ",
+                        str(error),
+                    )
+                )
+            )
+            continue
+        msg.good(
+            "".join(("Wrote model artifact for config entry '", config_entry_name, "'"))
+        )
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from .data_model import Mention
+
+# Marks a dictionary key that was not present before or after a change
+_MISSING = object()
+
+LogEntry = Tuple[Any, Any, Any, Any]
+
+
+class MentionSets:
+    """The structures used by *Annotator* to build chains, together with a log of every change
+    made to them. The log allows the structures to be rolled back to a checkpoint in time
+    proportional to the number of changes made since the checkpoint, and rolled-back changes
+    to be reapplied, which is what *Annotator.attempt_retry()* needs to try out alternative
+    interpretations of preceding anaphors.
+
+    Each chain under construction is a set of mentions that is shared by all the dictionary
+    entries for the mentions it contains, so that finding the chain for a token index takes
+    constant time.
+    """
+
+    def __init__(self):
+
+        # Main means of generating and tracking chains; maps the root indexes of mentions to
+        # the mention sets containing them
+        self.without_coordination: Dict[int, Set[Mention]] = {}
+
+        # Tracks the ends of chains that end in a mention with coordination; maps each token
+        # index within such a mention to the mention set containing it
+        self.with_coordination: Dict[int, Set[Mention]] = {}
+
+        # Maps the index of each anaphor to the checkpoint taken immediately before an
+        # attempt was made to link it to a preceding mention
+        self.anaphor_checkpoints: Dict[int, int] = {}
+
+        # Maps the index of each anaphor that has been linked to a preceding mention to the
+        # index of that mention within the anaphor's *temp_potential_referreds*
+        self.referred_indexes: Dict[int, int] = {}
+
+        # (dictionary, key, old value, new value) or (mention set, None, added mentions, None)
+        self.log: List[LogEntry] = []
+
+    def checkpoint(self) -> int:
+        return len(self.log)
+
+    def mark_anaphor(self, token_index: int) -> None:
+        """Records a checkpoint for the anaphor at *token_index*; rolling back to the
+        checkpoint also undoes the recording."""
+        self.set_item(self.anaphor_checkpoints, token_index, self.checkpoint())
+
+    def set_item(self, dictionary: Dict[int, Any], key: int, value: Any) -> None:
+        old_value = dictionary.get(key, _MISSING)
+        if old_value is value:
+            return
+        dictionary[key] = value
+        self.log.append((dictionary, key, old_value, value))
+
+    def add_mentions(self, mention_set: Set[Mention], mentions: Iterable[Mention]) -> None:
+        added_mentions = [mention for mention in mentions if mention not in mention_set]
+        if len(added_mentions) == 0:
+            return
+        mention_set.update(added_mentions)
+        self.log.append((mention_set, None, added_mentions, None))
+
+    def rollback(self, checkpoint: int) -> List[LogEntry]:
+        """Undoes all changes made since *checkpoint* and returns them, most recent first,
+        so that they can be passed to *reapply()*."""
+        undone_entries = []
+        while len(self.log) > checkpoint:
+            entry = self.log.pop()
+            container, key, old_value, _ = entry
+            if key is None:
+                container.difference_update(old_value)
+            elif old_value is _MISSING:
+                del container[key]
+            else:
+                container[key] = old_value
+            undone_entries.append(entry)
+        return undone_entries
+
+    def reapply(self, undone_entries: List[LogEntry]) -> None:
+        """Reapplies changes returned by *rollback()*. The structures must be in the state
+        they were in immediately after the rollback."""
+        for entry in reversed(undone_entries):
+            container, key, added_mentions, new_value = entry
+            if key is None:
+                container.update(added_mentions)
+            else:
+                container[key] = new_value
+            self.log.append(entry)
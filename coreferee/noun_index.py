@@ -0,0 +1,74 @@
+from typing import Dict, Hashable, List, Optional, Set
+from bisect import bisect_left
+from spacy.tokens import Doc
+
+
+class CoreferringNounIndex:
+    """Indexes the tokens of a document by the keys returned by
+    *RulesAnalyzer.get_coreferring_noun_keys()*, so that the search for a preceding noun
+    that forms a potential coreferring noun pair with a given noun only has to examine tokens
+    that share a key with it. The index is built once per document within
+    *RulesAnalyzer.initialize()*.
+
+    Tokens for which the rules analyzer cannot supply keys are always examined.
+    """
+
+    def __init__(self, doc: Doc, rules_analyzer):
+
+        # Keys each token has when it is the referred member of a pair; *None* where unknown
+        self.referred_keys: List[Optional[Set[Hashable]]] = []
+
+        # Keys each token has when it is the referring member of a pair; *None* where unknown
+        self.referring_keys: List[Optional[Set[Hashable]]] = []
+
+        # The sorted indexes of the tokens with each referred key
+        self.key_to_indexes: Dict[Hashable, List[int]] = {}
+
+        # The sorted indexes of the tokens whose referred keys are unknown
+        self.unkeyed_indexes: List[int] = []
+
+        for token in doc:
+            keys = rules_analyzer.get_coreferring_noun_keys(token)
+            if keys is None:
+                self.referred_keys.append(None)
+                self.referring_keys.append(None)
+                self.unkeyed_indexes.append(token.i)
+                continue
+            referred_keys, referring_keys = set(keys[0]), set(keys[1])
+            self.referred_keys.append(referred_keys)
+            self.referring_keys.append(referring_keys)
+            for key in referred_keys:
+                self.key_to_indexes.setdefault(key, []).append(token.i)
+
+    def may_corefer(self, referred_index: int, referring_index: int) -> bool:
+        """Returns *False* if the tokens at *referred_index* and *referring_index* cannot form
+        a potential coreferring noun pair."""
+        referred_keys = self.referred_keys[referred_index]
+        referring_keys = self.referring_keys[referring_index]
+        return (
+            referred_keys is None
+            or referring_keys is None
+            or not referred_keys.isdisjoint(referring_keys)
+        )
+
+    def get_candidate_indexes(self, referring_index: int, start_index: int) -> List[int]:
+        """Returns the indexes from *start_index* up to but not including *referring_index*
+        of the tokens that may form a potential coreferring noun pair with the token at
+        *referring_index*, most recent first."""
+        referring_keys = self.referring_keys[referring_index]
+        if referring_keys is None:
+            return list(range(referring_index - 1, start_index - 1, -1))
+        candidate_indexes: Set[int] = set()
+        for indexes in [self.unkeyed_indexes] + [
+            self.key_to_indexes[key]
+            for key in referring_keys
+            if key in self.key_to_indexes
+        ]:
+            candidate_indexes.update(
+                indexes[
+                    bisect_left(indexes, start_index) : bisect_left(
+                        indexes, referring_index
+                    )
+                ]
+            )
+        return sorted(candidate_indexes, reverse=True)
@@ -1,13 +1,19 @@
-from typing import List, Tuple, Dict
+from typing import Any, Callable, List, Tuple, Dict, Union, Hashable, Optional
 import importlib
 import sys
+from bisect import bisect_left
 from os import sep
 from abc import ABC, abstractmethod
+from functools import wraps
+from collections import OrderedDict
 from threading import Lock
 import pkg_resources
 from spacy.language import Language
 from spacy.tokens import Token, Doc
-from .data_model import ChainHolder, Mention
+from .data_model import ChainHolder, Mention, ScratchArena
+from .lexicon import Lexicon
+from .tree_index import DependencyTreeIndex
+from .noun_index import CoreferringNounIndex
 
 language_to_rules = {}
 lock = Lock()
@@ -27,16 +33,11 @@ class RulesAnalyzerFactory:
                 full_data_filename = pkg_resources.resource_filename(
                     __name__, sep.join(("lang", directory, "data", data_filename))
                 )
-                with open(full_data_filename, "r", encoding="utf-8") as file:
-                    setattr(
-                        rules_analyzer,
-                        data_filename[:-4],
-                        [
-                            v.strip()
-                            for v in file.read().splitlines()
-                            if len(v.strip()) > 1 and not v.strip().startswith("#")
-                        ],
-                    )
+                setattr(
+                    rules_analyzer,
+                    data_filename[:-4],
+                    Lexicon.from_file(full_data_filename),
+                )
 
         language = nlp.meta["lang"]
         with lock:
@@ -51,21 +52,124 @@ class RulesAnalyzerFactory:
                 language_to_rules[language] = rules_analyzer
                 read_in_data_files(language, rules_analyzer)
                 read_in_data_files("common", rules_analyzer)
-                rules_analyzer.exclusively_male_names = [
-                    name
-                    for name in rules_analyzer.male_names
-                    if name not in rules_analyzer.female_names
-                ]
-                rules_analyzer.exclusively_female_names = [
-                    name
-                    for name in rules_analyzer.female_names
-                    if name not in rules_analyzer.male_names
-                ]
+                rules_analyzer.set_up_lexicons()
             return language_to_rules[language]
 
 
+class PairPredicateCache:
+    """Stores the results of the pair predicates of a *RulesAnalyzer* for a single document,
+    together with the number of times stored results were reused (*hits*) and the number of
+    times results had to be calculated (*misses*) for each predicate.
+    """
+
+    def __init__(self):
+        self.results: Dict[Tuple, Any] = {}
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def hit_rate(self, predicate_name: str) -> float:
+        hits = self.hits.get(predicate_name, 0)
+        calls = hits + self.misses.get(predicate_name, 0)
+        return hits / calls if calls > 0 else 0.0
+
+
+class LexicalCompatibilityCache:
+    """A least-recently-used cache for the results of
+    *RulesAnalyzer.is_lexically_compatible_pair()*. It belongs to a *RulesAnalyzer* and is
+    therefore shared by all documents the analyzer processes, including documents processed
+    in different threads.
+    """
+
+    def __init__(self, maximum_size: int):
+        self.maximum_size = maximum_size
+        self.results: "OrderedDict[Tuple, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def get(self, key: Tuple, calculate: Callable[[], int]) -> int:
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return self.results[key]
+            self.misses += 1
+        result = calculate()
+        with self.lock:
+            self.results[key] = result
+            if len(self.results) > self.maximum_size:
+                self.results.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self.lock:
+            self.results.clear()
+            self.hits = self.misses = 0
+
+
+def _get_pair_member_key(member: Union[Mention, Token]) -> Hashable:
+    if isinstance(member, Mention):
+        return tuple(member.token_indexes)
+    return member.i
+
+
+def memoise_pair_predicate(predicate: Callable) -> Callable:
+    """Wraps a pair predicate so that its results are stored in the *PairPredicateCache*
+    of the document *RulesAnalyzer.initialize()* has been called for. The results of pair
+    predicates may only depend on the token indexes of their arguments and on any further
+    arguments.
+    """
+
+    @wraps(predicate)
+    def memoised_predicate(self, referred, referring, *args, **kwargs):
+        pair_predicate_cache = getattr(
+            referring.doc._.coref_chains, "temp_pair_predicate_cache", None
+        )
+        if pair_predicate_cache is None:
+            return predicate(self, referred, referring, *args, **kwargs)
+        key = (
+            predicate,
+            _get_pair_member_key(referred),
+            _get_pair_member_key(referring),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        results = pair_predicate_cache.results
+        if key in results:
+            pair_predicate_cache.hits[predicate.__name__] = (
+                pair_predicate_cache.hits.get(predicate.__name__, 0) + 1
+            )
+            return results[key]
+        pair_predicate_cache.misses[predicate.__name__] = (
+            pair_predicate_cache.misses.get(predicate.__name__, 0) + 1
+        )
+        result = results[key] = predicate(self, referred, referring, *args, **kwargs)
+        return result
+
+    return memoised_predicate
+
+
 class RulesAnalyzer(ABC):
 
+    # Pair predicates whose results are stored per document in a *PairPredicateCache*.
+    # Implementations in subclasses are wrapped automatically.
+    memoised_pair_predicates = (
+        "is_potential_anaphoric_pair",
+        "is_potential_reflexive_pair",
+        "is_potential_cataphoric_pair",
+        "is_potential_coreferring_noun_pair",
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)  # type: ignore[call-arg]
+        for predicate_name in cls.memoised_pair_predicates:
+            if predicate_name in cls.__dict__:
+                setattr(
+                    cls,
+                    predicate_name,
+                    memoise_pair_predicate(cls.__dict__[predicate_name]),
+                )
+
     ### MUST BE IMPLEMENTED BY IMPLEMENTING SUBCLASSES:
 
     # A word in the language that will have a vector in any model that has vectors
@@ -200,25 +304,81 @@ class RulesAnalyzer(ABC):
     ### COULD BE OVERRIDDEN BY IMPLEMENTING CLASSES, BUT THIS IS NOT EXPECTED
     ### TO BE NECESSARY:
 
+    # The maximum number of results held by the cache used by *get_lexical_compatibility()*
+    lexical_compatibility_cache_size = 50000
+
     def __init__(self):
+        self.lexical_compatibility_cache = LexicalCompatibilityCache(
+            self.lexical_compatibility_cache_size
+        )
         self.reverse_entity_noun_dictionary = {}
         for entity_type, values in self.entity_noun_dictionary.items():
             for value in values:
                 assert value not in self.reverse_entity_noun_dictionary
                 self.reverse_entity_noun_dictionary[value.lower()] = entity_type
 
+    def is_lexically_compatible_pair(
+        self, referred_root: Token, referring: Token, *args: Hashable
+    ) -> int:
+        """Returns the part of the decision taken in *is_potential_anaphoric_pair()* that only
+        depends on the lexical and morphological features returned by *get_lexical_signature()*
+        for *referred_root* and *referring* and on *args*: *2* if the two tokens are
+        compatible, *1* if they are unlikely to be compatible and *0* if they are incompatible.
+        Implementing subclasses that override this method must not use any other information
+        about the tokens, because results are shared between documents.
+        """
+        return 2
+
+    def get_lexical_signature(self, token: Token) -> Tuple[str, str, str, str, str]:
+        return token.lemma_, token.pos_, str(token.morph), token.ent_type_, token.tag_
+
+    def get_lexical_compatibility(
+        self, referred_root: Token, referring: Token, *args: Hashable
+    ) -> int:
+        """Returns the result of *is_lexically_compatible_pair()*, which is cached across
+        documents for each combination of lexical signatures and *args*."""
+        key = (
+            self.get_lexical_signature(referred_root),
+            self.get_lexical_signature(referring),
+        ) + args
+        return self.lexical_compatibility_cache.get(
+            key,
+            lambda: self.is_lexically_compatible_pair(referred_root, referring, *args),
+        )
+
+    def set_up_lexicons(self) -> None:
+        """Called once the *.dat* files have been read in as *Lexicon* objects. Derives further
+        lexicons from the ones that have been read in. Implementing subclasses that override
+        this method must call the superclass method."""
+        self.exclusively_male_names = self.male_names.difference(  # type: ignore[attr-defined]
+            self.female_names  # type: ignore[attr-defined]
+        )
+        self.exclusively_female_names = self.female_names.difference(  # type: ignore[attr-defined]
+            self.male_names  # type: ignore[attr-defined]
+        )
+
     def initialize(self, doc: Doc) -> None:
-        """Adds *ChainHolder* objects to *doc* as well as to each token in *doc*
-        and stores temporary information on the objects that will be required during further
-        processing."""
+        """Adds a *ChainHolder* object to *doc*, within which the *ChainHolder* objects for
+        the tokens in *doc* are created as they are requested, and stores temporary information
+        on the objects that will be required during further processing. The temporary
+        information is held in a *ScratchArena* shared by all the objects."""
 
-        doc._.coref_chains = ChainHolder()
-        for token in doc:
-            token._.coref_chains = ChainHolder()
+        doc._.coref_chains = ChainHolder(ScratchArena())
+        doc._.coref_chains.token_chain_holders = {}
+
+        # Adds to *doc* a dictionary from lexicons to the indexes of the tokens covered by
+        # the phrases they contain, which is filled by *is_token_in_one_of_phrases()*.
+        doc._.coref_chains.temp_phrase_coverage = {}  # type: ignore[attr-defined]
+
+        # Adds to *doc* a cache for the results of the pair predicates.
+        doc._.coref_chains.temp_pair_predicate_cache = PairPredicateCache()  # type: ignore[attr-defined]
 
         # Adds to *doc* a list of the start indexes of the sentences it contains.
         doc._.coref_chains.temp_sent_starts = [s[0].i for s in doc.sents]  # type: ignore[attr-defined]
 
+        # Adds to *doc* an index answering questions about its dependency trees.
+        doc._.coref_chains.temp_tree_index = DependencyTreeIndex(doc, self.verb_pos)  # type: ignore[attr-defined]
+
         # Adds to each token in *doc* the index of the sentence that contains it.
         for index, sent in enumerate(doc.sents):
             for token in sent:
@@ -228,9 +388,11 @@ class RulesAnalyzer(ABC):
         # *CorefChainHolder* instance of the token a list containing them, otherwise an empty list.
         # Wherever token B is added as a dependent sibling of token A, A is also added to B as a
         # governing sibling.
+        has_dependent_siblings = []
         for token in doc:
             siblings_list = self.get_dependent_siblings(token)
             token._.coref_chains.temp_dependent_siblings = siblings_list
+            has_dependent_siblings.append(len(siblings_list) > 0)
             for sibling in (
                 sibling for sibling in siblings_list if sibling.i != token.i
             ):
@@ -251,83 +413,86 @@ class RulesAnalyzer(ABC):
                     working_quote_array[index] = 0
             token._.coref_chains.temp_quote_array = working_quote_array[:]
 
-        # Adds to each potential anaphora a list of potential referred mentions.
+        # Evaluates the predicates used for candidate generation once for each token; the tokens
+        # that can be referred to by anaphors are those for which either predicate is true.
+        sent_starts = doc._.coref_chains.temp_sent_starts  # type: ignore[attr-defined]
+        is_potential_anaphor = []
+        potentially_referred_indexes = []
         for token in doc:
-            token._.coref_chains.temp_potentially_referring = self.is_independent_noun(
-                token
+            is_independent_noun = self.is_independent_noun(token)
+            token._.coref_chains.temp_potentially_referring = is_independent_noun
+            is_potential_anaphor.append(self.is_potential_anaphor(token))
+            if is_potential_anaphor[-1] or is_independent_noun:
+                potentially_referred_indexes.append(token.i)
+
+        # Adds to each potential anaphora a list of potential referred mentions.
+        for token in (doc[index] for index in potentially_referred_indexes):
+            if not is_potential_anaphor[token.i]:
+                continue
+            potential_referreds = []
+            this_sentence_number = token._.coref_chains.temp_sent_index
+            start_sentence_number = max(
+                0,
+                this_sentence_number - self.maximum_anaphora_sentence_referential_distance,
             )
-            if self.is_potential_anaphor(token):
-                potential_referreds = []
-                this_sentence_start_index = token.sent[0].i
-                this_sentence_number = doc._.coref_chains.temp_sent_starts.index(  # type: ignore[attr-defined]
-                    this_sentence_start_index
-                )
-                start_sentence_number = 0
-                if (
-                    this_sentence_number
-                    > self.maximum_anaphora_sentence_referential_distance
-                ):
-                    start_sentence_number = (
-                        this_sentence_number
-                        - self.maximum_anaphora_sentence_referential_distance
-                    )
-                for preceding_token in (
-                    t
-                    for t in doc[
-                        doc._.coref_chains.temp_sent_starts[  # type: ignore[attr-defined]
-                            start_sentence_number
-                        ] : token.i
-                    ]
-                    if (self.is_potential_anaphor(t) or self.is_independent_noun(t))
+            if this_sentence_number + 1 == len(sent_starts):
+                end_index = len(doc)
+            else:
+                end_index = sent_starts[this_sentence_number + 1]
+            preceding_position = bisect_left(
+                potentially_referred_indexes, sent_starts[start_sentence_number]
+            )
+            this_position = bisect_left(potentially_referred_indexes, token.i)
+            for preceding_token in (
+                doc[index]
+                for index in potentially_referred_indexes[
+                    preceding_position:this_position
+                ]
+            ):
+                simple_referred = Mention(preceding_token, False)
+                if self.language_independent_is_potential_anaphoric_pair(
+                    simple_referred, token
+                ) > 0 and not self.is_potential_reflexive_pair(
+                    Mention(token, False), doc[simple_referred.root_index]
                 ):
-                    simple_referred = Mention(preceding_token, False)
-                    if self.language_independent_is_potential_anaphoric_pair(
-                        simple_referred, token
-                    ) > 0 and not self.is_potential_reflexive_pair(
-                        Mention(token, False), doc[simple_referred.root_index]
+                    potential_referreds.append(simple_referred)
+                if has_dependent_siblings[preceding_token.i]:
+                    complex_referred = Mention(preceding_token, True)
+                    if (
+                        self.language_independent_is_potential_anaphoric_pair(
+                            complex_referred, token
+                        )
+                        > 0
                     ):
-                        potential_referreds.append(simple_referred)
-                    if len(preceding_token._.coref_chains.temp_dependent_siblings) > 0:
-                        complex_referred = Mention(preceding_token, True)
-                        if (
-                            self.language_independent_is_potential_anaphoric_pair(
-                                complex_referred, token
-                            )
-                            > 0
-                        ):
-                            potential_referreds.append(complex_referred)
-                if this_sentence_number + 1 == len(doc._.coref_chains.temp_sent_starts):  # type: ignore[attr-defined]
-                    succeeding_tokens = doc[token.i + 1 :]
-                else:
-                    succeeding_tokens = doc[
-                        token.i
-                        + 1 : doc._.coref_chains.temp_sent_starts[  # type: ignore[attr-defined]
-                            this_sentence_number + 1
-                        ]
-                    ]
-                for succeeding_token in (
-                    t
-                    for t in succeeding_tokens
-                    if (self.is_potential_anaphor(t) or self.is_independent_noun(t))
+                        potential_referreds.append(complex_referred)
+            for succeeding_token in (
+                doc[index]
+                for index in potentially_referred_indexes[
+                    this_position
+                    + 1 : bisect_left(potentially_referred_indexes, end_index)
+                ]
+            ):
+                simple_referred = Mention(succeeding_token, False)
+                if self.language_independent_is_potential_anaphoric_pair(
+                    simple_referred, token
+                ) > 0 and (
+                    self.is_potential_cataphoric_pair(simple_referred, token)
+                    or self.is_potential_reflexive_pair(simple_referred, token)
                 ):
-                    simple_referred = Mention(succeeding_token, False)
+                    potential_referreds.append(simple_referred)
+                if has_dependent_siblings[succeeding_token.i]:
+                    complex_referred = Mention(succeeding_token, True)
                     if self.language_independent_is_potential_anaphoric_pair(
+                        complex_referred, token
+                    ) > 0 and self.is_potential_cataphoric_pair(
                         simple_referred, token
-                    ) > 0 and (
-                        self.is_potential_cataphoric_pair(simple_referred, token)
-                        or self.is_potential_reflexive_pair(simple_referred, token)
                     ):
-                        potential_referreds.append(simple_referred)
-                    if len(succeeding_token._.coref_chains.temp_dependent_siblings) > 0:
-                        complex_referred = Mention(succeeding_token, True)
-                        if self.language_independent_is_potential_anaphoric_pair(
-                            complex_referred, token
-                        ) > 0 and self.is_potential_cataphoric_pair(
-                            simple_referred, token
-                        ):
-                            potential_referreds.append(complex_referred)
-                if len(potential_referreds) > 0:
-                    token._.coref_chains.temp_potential_referreds = potential_referreds
+                        potential_referreds.append(complex_referred)
+            if len(potential_referreds) > 0:
+                token._.coref_chains.temp_potential_referreds = potential_referreds
+
+        # Adds to *doc* an index of the tokens that can form potential coreferring noun pairs.
+        doc._.coref_chains.temp_coreferring_noun_index = CoreferringNounIndex(doc, self)  # type: ignore[attr-defined]
 
     def has_non_determiner_non_conjunction_children(self, token: Token) -> bool:
         return any(
@@ -381,6 +546,7 @@ class RulesAnalyzer(ABC):
             )
         )
 
+    @memoise_pair_predicate
     def is_potential_coreferring_noun_pair(
         self, referred: Token, referring: Token
     ) -> bool:
@@ -443,6 +609,57 @@ class RulesAnalyzer(ABC):
             return True
         return False
 
+    def get_coreferring_noun_keys(
+        self, token: Token
+    ) -> Optional[Tuple[List[Hashable], List[Hashable]]]:
+        """Returns a list of keys *token* has as the referred member of a potential coreferring
+        noun pair and a list of keys it has as the referring member. For any *referred* and
+        *referring*, *is_potential_coreferring_noun_pair(referred, referring)* may only return
+        *True* if the referred keys of *referred* and the referring keys of *referring* have a
+        member in common. Implementing subclasses that override
+        *is_potential_coreferring_noun_pair()* must override this method too or return *None*,
+        which means that *token* is compared with every other token.
+        """
+        if token.pos_ not in self.noun_pos:
+            return [], []
+        referred_keys: List[Hashable] = []
+        referring_keys: List[Hashable] = []
+        number = tuple(token.morph.get(self.number_morph_key))
+
+        # The last three characters of the text of a proper-name subtree, which must be the
+        # same for both members of a pair if the text of the referring subtree is long enough
+        propn_subtree = self.get_propn_subtree(token)
+        if len(propn_subtree) > 0:
+            for key_type, text in (
+                ("propn_text", " ".join(t.text for t in propn_subtree)),
+                ("propn_lemma", " ".join(t.lemma_.lower() for t in propn_subtree)),
+            ):
+                referred_keys.append((key_type, text[-3:]))
+                referring_keys.append(
+                    (key_type, text[-3:]) if len(text) >= 3 else "propn"
+                )
+            referred_keys.append("propn")
+        if token.pos_ in self.propn_pos:
+            referred_keys.append(("entity", token.ent_type_))
+        if token.lemma_.lower() in self.reverse_entity_noun_dictionary:
+            if self.is_potentially_definite(token):
+                referring_keys.append(
+                    (
+                        "entity",
+                        self.reverse_entity_noun_dictionary[token.lemma_.lower()],
+                    )
+                )
+        is_potentially_referring_back_noun = self.is_potentially_referring_back_noun(
+            token
+        )
+        if is_potentially_referring_back_noun:
+            referring_keys.append(("lemma", token.lemma_, number))
+        if is_potentially_referring_back_noun or self.is_potentially_introducing_noun(
+            token
+        ):
+            referred_keys.append(("lemma", token.lemma_, number))
+        return referred_keys, referring_keys
+
     def language_independent_is_potential_anaphoric_pair(
         self, referred: Mention, referring: Token
     ) -> int:
@@ -463,13 +680,14 @@ class RulesAnalyzer(ABC):
         # is closer to *referring* in the structure than *referred* is and the two tokens form
         # a potential coreferring noun pair.
         if result == 2 and not self.is_potential_anaphor(referred_root):
-            doc = referring.doc
+            tree_index = doc._.coref_chains.temp_tree_index
             referring_or_governor = referring
             while True:
-                referring_or_governor_subtree = list(referring_or_governor.subtree)
-                if referred_root in referring_or_governor_subtree:
+                if tree_index.is_in_subtree(referring_or_governor.i, referred_root.i):
                     break
-                for referring_sub_token in referring_or_governor_subtree:
+                for referring_sub_token in (
+                    doc[i] for i in tree_index.subtree_indexes(referring_or_governor.i)
+                ):
                     for referred_token in (doc[i] for i in referred.token_indexes):
                         if self.is_potential_coreferring_noun_pair(
                             referred_token, referring_sub_token
@@ -497,7 +715,7 @@ class RulesAnalyzer(ABC):
         return result
 
     def has_list_member_in_propn_subtree(
-        self, token: Token, word_list: List[str]
+        self, token: Token, word_list: Union[Lexicon, List[str]]
     ) -> bool:
         """Returns *True* if a member of the proper-name subtree of *Token*
         corresponds to a member of *word_list*.
@@ -562,23 +780,35 @@ class RulesAnalyzer(ABC):
         return False
 
     @staticmethod
-    def is_token_in_one_of_phrases(token: Token, phrases: List[str]) -> bool:
-        """Checks whether *token* is part of a phrase that is listed in *phrases*."""
+    def is_token_in_one_of_phrases(
+        token: Token, phrases: Union[Lexicon, List[str]]
+    ) -> bool:
+        """Checks whether *token* is part of a phrase that is listed in *phrases*. The
+        tokens covered by the phrases of a lexicon are found in a single pass over the
+        document the first time a lexicon is used for that document."""
         doc = token.doc
-        token_text = token.text.lower()
-        for phrase in phrases:
-            phrase_words = phrase.lower().split()
-            if token_text not in phrase_words:
-                continue
-            possible_index = phrase_words.index(token_text)
-            start_index = max(0, token.i - possible_index)
-            end_index = token.i + len(phrase_words) - possible_index
-            if phrase.lower() == " ".join(
-                [t.text.lower() for t in doc[start_index:end_index]]
-            ):
-                return True
-        return False
+        phrase_coverage = getattr(doc._.coref_chains, "temp_phrase_coverage", None)
+        if phrase_coverage is None or not isinstance(phrases, Lexicon):
+            # only look at the surrounding tokens
+            if not isinstance(phrases, Lexicon):
+                phrases = Lexicon(phrases)
+            start_index = max(0, token.i - phrases.phrase_trie.maximum_length + 1)
+            covered_indexes = phrases.phrase_trie.get_covered_indexes(
+                [
+                    t.text.lower()
+                    for t in doc[
+                        start_index : token.i + phrases.phrase_trie.maximum_length
+                    ]
+                ]
+            )
+            return token.i - start_index in covered_indexes
+        if phrases not in phrase_coverage:
+            phrase_coverage[phrases] = phrases.phrase_trie.get_covered_indexes(
+                [t.text.lower() for t in doc]
+            )
+        return token.i in phrase_coverage[phrases]
 
+    @memoise_pair_predicate
     def is_potential_cataphoric_pair(self, referred: Mention, referring: Token) -> bool:
         """Checks whether *referring* can refer cataphorically to *referred*, i.e.
         where *referring* precedes *referred* in the text. That *referring* precedes
@@ -593,12 +823,13 @@ class RulesAnalyzer(ABC):
         if self.is_potential_anaphor(referred_root):
             return False
 
-        referred_verb_ancestors = []
+        tree_index = doc._.coref_chains.temp_tree_index
+        referred_verb_ancestor_indexes = []
         # Find the ancestors of the referent that are verbs, stopping anywhere where there
         # is conjunction between verbs
         for ancestor in referred_root.ancestors:
             if ancestor.pos_ in self.clause_root_pos:
-                referred_verb_ancestors.append(ancestor)
+                referred_verb_ancestor_indexes.append(ancestor.i)
             if ancestor.dep_ in self.dependent_sibling_deps:
                 break
 
@@ -620,19 +851,14 @@ class RulesAnalyzer(ABC):
         for referring_verb_ancestor in (
             t
             for t in referring_inclusive_ancestors
-            if t.pos_ in self.clause_root_pos and t not in referred_verb_ancestors
+            if t.pos_ in self.clause_root_pos
+            and t.i not in referred_verb_ancestor_indexes
         ):
             # If one of the elements of the second list has one of the elements of the first list
             # within its ancestors, we have subordination and cataphora is permissible
-            if (
-                len(
-                    [
-                        t
-                        for t in referring_verb_ancestor.ancestors
-                        if t in referred_verb_ancestors
-                    ]
-                )
-                > 0
+            if any(
+                tree_index.is_ancestor(index, referring_verb_ancestor.i)
+                for index in referred_verb_ancestor_indexes
             ):
                 return True
         return False
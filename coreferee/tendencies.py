@@ -1,11 +1,14 @@
-from typing import List, Tuple, Callable, cast, Union, Dict, Set
-from copy import copy
+from typing import List, Tuple, Callable, cast, Union, Dict, Set, Iterable
+from typing import Hashable, Optional
 from dataclasses import dataclass
+import numpy
 from thinc.model import Model
 from thinc.layers import Relu, concatenate, chain, clone
 from thinc.layers import Linear, noop, tuplify
 from thinc.backends import Ops, get_current_ops
-from thinc.types import Floats2d, Ints1d, Ragged
+from thinc.types import Floats1d, Floats2d, Ints1d, Ragged
+from thinc.initializers import glorot_uniform_init, zero_init
+from thinc.util import get_width
 from spacy.tokens import Token, Doc
 from spacy.language import Language
 from .data_model import FeatureTable, Mention
@@ -13,6 +16,15 @@ from .rules import RulesAnalyzerFactory, RulesAnalyzer
 
 ENSEMBLE_SIZE = 5
 
+# The number of entries in the lists returned by *TendenciesAnalyzer.get_position_map()* and
+# *TendenciesAnalyzer.get_compatibility_map()*
+POSITION_MAP_LENGTH = 7
+COMPATIBILITY_MAP_LENGTH = 5
+
+# The maximum number of projections held in *VectorsToSqueeze.tables* for each layer. Once a
+# table is full, the projections of further lemmas are recalculated each time they occur.
+REDUCED_VECTOR_TABLE_SIZE = 100000
+
 
 class TendenciesAnalyzer:
     def __init__(
@@ -31,6 +43,14 @@ class TendenciesAnalyzer:
             self.vector_length = len(vectors_nlp(rules_analyzer.random_word)[0].vector)
         assert self.vector_length > 0
         self.feature_table = feature_table
+        self.feature_index_maps = feature_table.get_index_maps()
+        self.feature_map_length = len(feature_table)
+
+        # Projections of vectors through the first layer of each vector squeezer, keyed by
+        # layer ID and by lemma, or *None* if projections are not to be reused. The tables
+        # are only valid for a single set of model weights and are therefore only set up by
+        # *Annotator*.
+        self.reduced_vector_tables: Optional[Dict[int, Dict[Hashable, Floats1d]]] = None
 
     def get_feature_map(
         self, token_or_mention: Union[Token, Mention], doc: Doc
@@ -39,147 +59,95 @@ class TendenciesAnalyzer:
         the token or any of the tokens within the mention has. The list is also
         added as *token._.coref_chains.temp_feature_map* or *mention.temp_feature_map*.
         """
+        if isinstance(token_or_mention, Token):
+            if hasattr(token_or_mention._.coref_chains, "temp_feature_map"):
+                return token_or_mention._.coref_chains.temp_feature_map
+        elif hasattr(token_or_mention, "temp_feature_map"):
+            return token_or_mention.temp_feature_map  # type:ignore[attr-defined]
+        feature_map = cast(
+            List[Union[int, float]],
+            self.get_feature_array(token_or_mention, doc).tolist(),
+        )
+        if isinstance(token_or_mention, Token):
+            token_or_mention._.coref_chains.temp_feature_map = feature_map
+        else:
+            token_or_mention.temp_feature_map = feature_map  # type:ignore[attr-defined]
+        return feature_map
 
-        def convert_to_oneshot(reference_list, actual_list):
-            """
-            Returns a list of the same length as 'reference_list' where positions corresponding to
-            entries in 'reference_list' that are also contained within 'actual_list' have the
-            value '1' and other positions have the value '0'.
-            """
-            return [
-                1 if reference in actual_list else 0 for reference in reference_list
-            ]
+    def get_feature_array(
+        self, token_or_mention: Union[Token, Mention], doc: Doc
+    ) -> numpy.ndarray:
+        """Returns the information returned by *get_feature_map()* as an *int8* array. The array
+        is also added as *token._.coref_chains.temp_feature_array* or
+        *mention.temp_feature_array*.
+        """
 
-        def get_oneshot_for_token_and_siblings(prop, func):
-            """Executes a logical AND between the values for the respective siblings."""
-            oneshot = convert_to_oneshot(prop, func(token))
+        def set_features(property: str, values: Iterable[str]) -> None:
+            """Sets the columns corresponding to those of *values* that are contained within
+            the feature table list *property*."""
+            index_map = self.feature_index_maps[property]
+            for value in values:
+                column = index_map.get(value)
+                if column is not None:
+                    feature_array[column] = 1
+
+        def set_features_for_token_and_siblings(
+            property: str, func: Callable[[Token], Iterable[str]]
+        ) -> None:
+            """Executes a logical OR between the values for the respective siblings."""
+            set_features(property, func(token))
             for sibling in siblings:
-                sibling_oneshot = convert_to_oneshot(prop, func(sibling))
-                oneshot = [
-                    1 if (entry == 1 or sibling_oneshot[index] == 1) else 0
-                    for (index, entry) in enumerate(oneshot)
-                ]
-            return oneshot
+                set_features(property, func(sibling))
 
         siblings = []
         if isinstance(token_or_mention, Token):
-            if hasattr(token_or_mention._.coref_chains, "temp_feature_map"):
-                return token_or_mention._.coref_chains.temp_feature_map
+            if hasattr(token_or_mention._.coref_chains, "temp_feature_array"):
+                return token_or_mention._.coref_chains.temp_feature_array
             token = token_or_mention
         else:
-            if hasattr(token_or_mention, "temp_feature_map"):
-                return token_or_mention.temp_feature_map  # type:ignore[attr-defined]
+            if hasattr(token_or_mention, "temp_feature_array"):
+                return token_or_mention.temp_feature_array  # type:ignore[attr-defined]
             token = doc[token_or_mention.root_index]
             if len(token_or_mention.token_indexes) > 1:
                 siblings = [doc[i] for i in token_or_mention.token_indexes[1:]]
 
-        feature_map = convert_to_oneshot(self.feature_table.tags, [token.tag_])
+        feature_array = numpy.zeros(self.feature_map_length, dtype=numpy.int8)
 
-        feature_map.extend(
-            get_oneshot_for_token_and_siblings(
-                self.feature_table.morphs, lambda token: token.morph
-            )
+        set_features("tags", (token.tag_,))
+        set_features_for_token_and_siblings("morphs", lambda token: token.morph)
+        set_features("ent_types", (token.ent_type_,))
+        set_features_for_token_and_siblings(
+            "lefthand_deps_to_children",
+            lambda token: [child.dep_ for child in token.children if child.i < token.i],
         )
-
-        feature_map.extend(
-            convert_to_oneshot(self.feature_table.ent_types, [token.ent_type_])
+        set_features_for_token_and_siblings(
+            "righthand_deps_to_children",
+            lambda token: [child.dep_ for child in token.children if child.i > token.i],
         )
 
-        feature_map.extend(
-            get_oneshot_for_token_and_siblings(
-                self.feature_table.lefthand_deps_to_children,
-                lambda token: [
-                    child.dep_ for child in token.children if child.i < token.i
-                ],
-            )
-        )
-
-        feature_map.extend(
-            get_oneshot_for_token_and_siblings(
-                self.feature_table.righthand_deps_to_children,
-                lambda token: [
-                    child.dep_ for child in token.children if child.i > token.i
-                ],
-            )
-        )
-
-        if token.dep_ != self.rules_analyzer.root_dep and token.i < token.head.i:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.lefthand_deps_to_parents, [token.dep_]
-                )
-            )
-        else:
-            feature_map.extend(
-                convert_to_oneshot(self.feature_table.lefthand_deps_to_parents, [])
-            )
-
-        if token.dep_ != self.rules_analyzer.root_dep and token.i > token.head.i:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.righthand_deps_to_parents, [token.dep_]
-                )
-            )
-        else:
-            feature_map.extend(
-                convert_to_oneshot(self.feature_table.righthand_deps_to_parents, [])
-            )
-
         if token.dep_ != self.rules_analyzer.root_dep:
-            feature_map.extend(
-                convert_to_oneshot(self.feature_table.parent_tags, [token.head.tag_])
+            if token.i < token.head.i:
+                set_features("lefthand_deps_to_parents", (token.dep_,))
+            elif token.i > token.head.i:
+                set_features("righthand_deps_to_parents", (token.dep_,))
+            set_features("parent_tags", (token.head.tag_,))
+            set_features("parent_morphs", token.head.morph)
+            set_features(
+                "parent_lefthand_deps_to_children",
+                [child.dep_ for child in token.head.children if child.i < token.head.i],
             )
-        else:
-            feature_map.extend(convert_to_oneshot(self.feature_table.parent_tags, []))
-
-        if token.dep_ != self.rules_analyzer.root_dep:
-            feature_map.extend(
-                convert_to_oneshot(self.feature_table.parent_morphs, token.head.morph)
-            )
-        else:
-            feature_map.extend(convert_to_oneshot(self.feature_table.parent_morphs, []))
-
-        if token.dep_ != self.rules_analyzer.root_dep:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.parent_lefthand_deps_to_children,
-                    [
-                        child.dep_
-                        for child in token.head.children
-                        if child.i < token.head.i
-                    ],
-                )
-            )
-        else:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.parent_lefthand_deps_to_children, []
-                )
-            )
-
-        if token.dep_ != self.rules_analyzer.root_dep:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.parent_righthand_deps_to_children,
-                    [
-                        child.dep_
-                        for child in token.head.children
-                        if child.i > token.head.i
-                    ],
-                )
-            )
-        else:
-            feature_map.extend(
-                convert_to_oneshot(
-                    self.feature_table.parent_righthand_deps_to_children, []
-                )
+            set_features(
+                "parent_righthand_deps_to_children",
+                [child.dep_ for child in token.head.children if child.i > token.head.i],
             )
 
         if isinstance(token_or_mention, Token):
-            token_or_mention._.coref_chains.temp_feature_map = feature_map
+            token_or_mention._.coref_chains.temp_feature_array = feature_array
         else:
-            token_or_mention.temp_feature_map = feature_map  # type:ignore[attr-defined]
-        return feature_map
+            token_or_mention.temp_feature_array = (  # type:ignore[attr-defined]
+                feature_array
+            )
+        return feature_array
 
     def get_position_map(
         self, token_or_mention: Union[Token, Mention], doc: Doc
@@ -198,49 +166,15 @@ class TendenciesAnalyzer:
                 return token_or_mention.temp_position_map  # type:ignore[attr-defined]
             token = doc[token_or_mention.root_index]
 
-        # This token is the nth word within its sentence
-        position_map = [
-            token.i
-            - token.doc._.coref_chains.temp_sent_starts[
-                token._.coref_chains.temp_sent_index
-            ]
-        ]
-
-        # This token is at depth n from the root
-        position_map.append(len(list(token.ancestors)))
-
-        # This token is n verbs from the root
-        position_map.append(
-            len(
-                [
-                    ancestor
-                    for ancestor in token.ancestors
-                    if ancestor.pos_ in self.rules_analyzer.verb_pos
-                ]
-            )
-        )
-
-        # This token is the nth token at its depth within its sentence
-        position_map.append(
-            len(
-                [
-                    1
-                    for token_in_sentence in token.sent
-                    if token_in_sentence.i < token.i
-                    and len(list(token_in_sentence.ancestors))
-                    == len(list(token.ancestors))
-                ]
-            )
+        sent_index = token._.coref_chains.temp_sent_index
+        sent_start = doc._.coref_chains.temp_sent_starts[sent_index]
+        position_map = cast(
+            List[Union[int, float]],
+            self.get_sentence_position_array(sent_index, doc)[
+                token.i - sent_start
+            ].tolist(),
         )
 
-        # This token is the nth child of its parents
-        if token.dep_ != self.rules_analyzer.root_dep:
-            position_map.append(
-                sorted([child.i for child in token.head.children]).index(token.i)
-            )
-        else:
-            position_map.append(-1)
-
         # Number of dependent siblings, or -1 if the method was passed a mention that is within
         # a coordination phrase but only covers one token within that phrase
         if token._.coref_chains.temp_governing_sibling is not None or (
@@ -266,6 +200,79 @@ class TendenciesAnalyzer:
             )
         return position_map
 
+    def get_sentence_position_array(self, sent_index: int, doc: Doc) -> numpy.ndarray:
+        """Returns an integer array with a row for each token in the sentence at *sent_index*
+        whose columns are the first five entries of the token's position map. The array is
+        computed for the whole sentence in one pass and cached in
+        *doc._.coref_chains.temp_sentence_position_arrays*.
+        """
+        if not hasattr(doc._.coref_chains, "temp_sentence_position_arrays"):
+            doc._.coref_chains.temp_sentence_position_arrays = {}
+        sentence_position_arrays = doc._.coref_chains.temp_sentence_position_arrays
+        if sent_index in sentence_position_arrays:
+            return sentence_position_arrays[sent_index]
+
+        def get_ranks_within_groups(keys: numpy.ndarray) -> numpy.ndarray:
+            """Returns for each position the number of preceding positions with the same key."""
+            order = numpy.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            group_starts = numpy.flatnonzero(
+                numpy.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            )
+            group_lengths = numpy.diff(numpy.append(group_starts, len(keys)))
+            ranks = numpy.empty(len(keys), dtype=numpy.int64)
+            ranks[order] = numpy.arange(len(keys)) - numpy.repeat(
+                group_starts, group_lengths
+            )
+            return ranks
+
+        tree_index = doc._.coref_chains.temp_tree_index
+        sent_starts = doc._.coref_chains.temp_sent_starts
+        sent_start = sent_starts[sent_index]
+        sent_end = (
+            sent_starts[sent_index + 1]
+            if sent_index + 1 < len(sent_starts)
+            else len(doc)
+        )
+        indexes = numpy.arange(sent_start, sent_end)
+        depths = numpy.array(tree_index.depths[sent_start:sent_end], dtype=numpy.int64)
+        heads = numpy.array(
+            [doc[index].head.i for index in range(sent_start, sent_end)],
+            dtype=numpy.int64,
+        )
+        is_root = numpy.array(
+            [
+                doc[index].dep_ == self.rules_analyzer.root_dep
+                for index in range(sent_start, sent_end)
+            ]
+        )
+        # spaCy makes the root its own head; giving each token that is its own head a
+        # negative key that no other token shares stops it being ranked among its children.
+        # Tokens with the same head are ordered by their indexes because the sort is stable.
+        child_ranks = get_ranks_within_groups(
+            numpy.where(heads == indexes, -1 - indexes, heads)
+        )
+        sentence_position_array = numpy.stack(
+            (
+                # This token is the nth word within its sentence
+                indexes - sent_start,
+                # This token is at depth n from the root
+                depths,
+                # This token is n verbs from the root
+                numpy.array(
+                    tree_index.verb_ancestor_counts[sent_start:sent_end],
+                    dtype=numpy.int64,
+                ),
+                # This token is the nth token at its depth within its sentence
+                get_ranks_within_groups(depths),
+                # This token is the nth child of its parents
+                numpy.where(is_root, -1, child_ranks),
+            ),
+            axis=1,
+        )
+        sentence_position_arrays[sent_index] = sentence_position_array
+        return sentence_position_array
+
     def get_compatibility_map(
         self, referred: Mention, referring: Token
     ) -> List[Union[int, float]]:
@@ -293,22 +300,26 @@ class TendenciesAnalyzer:
 
         # Whether the referred mention, its lefthand sibling or its head is among the ancestors
         # of the referring element
+        tree_index = doc._.coref_chains.temp_tree_index
         compatibility_map.append(
             1
-            if referred_root in referring.ancestors
+            if tree_index.is_ancestor(referred_root.i, referring.i)
             or (
                 referred_root.dep_ != self.rules_analyzer.root_dep
-                and referred_root.head in referring.ancestors
+                and tree_index.is_ancestor(referred_root.head.i, referring.i)
             )
             or referred_root._.coref_chains.temp_governing_sibling is not None
             and (
-                referred_root._.coref_chains.temp_governing_sibling
-                in referring.ancestors
+                tree_index.is_ancestor(
+                    referred_root._.coref_chains.temp_governing_sibling.i, referring.i
+                )
                 or (
                     referred_root._.coref_chains.temp_governing_sibling.dep_
                     != self.rules_analyzer.root_dep
-                    and referred_root._.coref_chains.temp_governing_sibling.head
-                    in referring.ancestors
+                    and tree_index.is_ancestor(
+                        referred_root._.coref_chains.temp_governing_sibling.head.i,
+                        referring.i,
+                    )
                 )
             )
             else 0
@@ -333,15 +344,16 @@ class TendenciesAnalyzer:
             compatibility_map.append(-1)
 
         # The number of common true values in the feature maps of *referred.root* and *referring*.
-        referred_feature_map = self.get_feature_map(referred, referring.doc)
-        referring_feature_map = self.get_feature_map(
-            Mention(referring, False), referring.doc
+        referred_feature_array = self.get_feature_array(referred, doc)
+        referring_feature_array = self.get_feature_array(
+            Mention(referring, False), doc
         )
         compatibility_map.append(
-            [
-                1 if (entry == 1 and referring_feature_map[index] == 1) else 0
-                for (index, entry) in enumerate(referred_feature_map)
-            ].count(1)
+            int(
+                numpy.dot(
+                    referred_feature_array.astype(numpy.int32), referring_feature_array
+                )
+            )
         )
 
         referred.temp_compatibility_map = compatibility_map  # type:ignore[attr-defined]
@@ -352,10 +364,26 @@ class TendenciesAnalyzer:
         outside this method because the possible pairs on each anaphor are sorted within
         this method with the more likely interpretations at the front of the list.
         """
-        document_pair_info = DocumentPairInfo.from_doc(doc, self, ENSEMBLE_SIZE)
-        if len(document_pair_info.candidates.dataXd) > 0:
-            scores = thinc_ensemble.predict([document_pair_info])
-            referring_scores_iterator = iter(scores)
+        self.score_docs([doc], thinc_ensemble)
+
+    def score_docs(self, docs: List[Doc], thinc_ensemble: Model) -> None:
+        """Scores all possible anaphoric pairs in each of *docs* with a single call to
+        *thinc_ensemble* and sorts the possible pairs on each anaphor as described for
+        *score()*.
+        """
+        document_pair_infos = [
+            document_pair_info
+            for document_pair_info in (
+                DocumentPairInfo.from_doc(doc, self, ENSEMBLE_SIZE) for doc in docs
+            )
+            if len(document_pair_info.candidates.dataXd) > 0
+        ]
+        if len(document_pair_infos) == 0:
+            return
+        scores = thinc_ensemble.predict(document_pair_infos)
+        referring_scores_iterator = iter(scores)
+        for document_pair_info in document_pair_infos:
+            doc = document_pair_info.doc
             for referring in (
                 t for t in doc if hasattr(t._.coref_chains, "temp_potential_referreds")
             ):
@@ -376,16 +404,17 @@ class TendenciesAnalyzer:
                 assert (
                     is_last
                 ), "Mismatch between potential referreds and neural network output."
-            is_last = False
-            try:
-                next(referring_scores_iterator)
-            except StopIteration:
-                is_last = True
-            assert (
-                is_last
-            ), "Mismatch between referring anaphors and neural network output."
+        is_last = False
+        try:
+            next(referring_scores_iterator)
+        except StopIteration:
+            is_last = True
+        assert is_last, "Mismatch between referring anaphors and neural network output."
+        for document_pair_info in document_pair_infos:
             for referring in (
-                t for t in doc if hasattr(t._.coref_chains, "temp_potential_referreds")
+                t
+                for t in document_pair_info.doc
+                if hasattr(t._.coref_chains, "temp_potential_referreds")
             ):
                 referring._.coref_chains.temp_potential_referreds.sort(
                     key=lambda potential_referred: (
@@ -499,6 +528,11 @@ class DocumentPairInfo:
     static_infos: Floats2d
     training_outputs: List[Floats2d]
 
+    # The tables within which the first layer of each vector squeezer stores the projections
+    # of the vectors it has already processed, or *None* if the full vectors are to be passed
+    # through the network as is the case during training.
+    reduced_vector_tables: Optional[Dict[int, Dict[Hashable, Floats1d]]] = None
+
     @classmethod
     def from_doc(
         cls,
@@ -514,7 +548,7 @@ class DocumentPairInfo:
         referrers_list: List[int] = []
         antecedents_list: List[List[int]] = []
         candidates_list: List[List[int]] = []
-        static_infos_list: List[List[Union[float, int]]] = []
+        pairs: List[Tuple[Token, Mention]] = []
         training_outputs_list: List[List[float]] = []
         candidates2antecedents: Dict[Tuple[int, ...], int] = {}
         for token in doc:
@@ -547,20 +581,45 @@ class DocumentPairInfo:
                         _set_vectors(
                             tendencies_analyzer.vectors_nlp, ops, token.doc[token_index]
                         )
-                static_info = copy(tendencies_analyzer.get_feature_map(token, doc))
-                static_info.extend(tendencies_analyzer.get_position_map(token, doc))
-                static_info.extend(tendencies_analyzer.get_feature_map(mention, doc))
-                static_info.extend(tendencies_analyzer.get_position_map(mention, doc))
-                static_info.extend(
-                    tendencies_analyzer.get_compatibility_map(mention, token)
-                )
-                static_infos_list.append(static_info)
+                pairs.append((token, mention))
                 if is_train:
                     training_outputs_list.append(
                         [1.0] * ensemble_size
                         if hasattr(mention, "true_in_training")
                         else [0.0] * ensemble_size
                     )
+        # Each row of *static_infos* is made up of the feature map and the position map of the
+        # referrer, the feature map and the position map of the candidate and the compatibility
+        # map of the pair
+        feature_map_length = tendencies_analyzer.feature_map_length
+        static_infos = numpy.zeros(
+            (
+                len(pairs),
+                2 * (feature_map_length + POSITION_MAP_LENGTH)
+                + COMPATIBILITY_MAP_LENGTH,
+            ),
+            dtype=numpy.float32,
+        )
+        for static_info, (token, mention) in zip(static_infos, pairs):
+            static_info[:feature_map_length] = tendencies_analyzer.get_feature_array(
+                token, doc
+            )
+            offset = feature_map_length
+            static_info[
+                offset : offset + POSITION_MAP_LENGTH
+            ] = tendencies_analyzer.get_position_map(token, doc)
+            offset += POSITION_MAP_LENGTH
+            static_info[
+                offset : offset + feature_map_length
+            ] = tendencies_analyzer.get_feature_array(mention, doc)
+            offset += feature_map_length
+            static_info[
+                offset : offset + POSITION_MAP_LENGTH
+            ] = tendencies_analyzer.get_position_map(mention, doc)
+            offset += POSITION_MAP_LENGTH
+            static_info[offset:] = tendencies_analyzer.get_compatibility_map(
+                mention, token
+            )
         candidates = (
             _list2ragged(ops, candidates_list)
             if len(candidates_list) > 0
@@ -592,8 +651,11 @@ class DocumentPairInfo:
                     for item in sublist
                 ]
             ),
-            static_infos=ops.asarray2f(static_infos_list),
+            static_infos=ops.asarray2f(static_infos),
             training_outputs=training_outputs,
+            reduced_vector_tables=None
+            if is_train
+            else tendencies_analyzer.reduced_vector_tables,
         )
 
 
@@ -606,7 +668,7 @@ def create_thinc_model() -> Model[List["DocumentPairInfo"], Tuple]:
         map inputs during training.
         """
         return chain(
-            Relu(24),
+            reduced_vector_relu(24),
             Relu(3),
         )
 
@@ -642,6 +704,27 @@ def create_thinc_model() -> Model[List["DocumentPairInfo"], Tuple]:
         return chain(noop() & ensemble, apply_softmax_sequences())
 
 
+def get_ensemble_members(thinc_ensemble: Model) -> List[Model]:
+    """Returns the members of an ensemble created by *create_thinc_model()*."""
+    return thinc_ensemble.layers[0].layers[1].layers
+
+
+def create_partial_ensemble(
+    thinc_ensemble: Model, ensemble_size: int
+) -> Model[List["DocumentPairInfo"], Tuple]:
+    """Returns an ensemble made up of the first *ensemble_size* members of an ensemble
+    created by *create_thinc_model()*. The members, and with them their weights, are shared
+    with *thinc_ensemble*."""
+    ensemble_members = get_ensemble_members(thinc_ensemble)
+    if ensemble_size == len(ensemble_members):
+        return thinc_ensemble
+    with Model.define_operators({"&": tuplify}):
+        ensemble: Model[List["DocumentPairInfo"], Tuple] = concatenate(
+            *ensemble_members[:ensemble_size]
+        )
+        return chain(noop() & ensemble, apply_softmax_sequences())
+
+
 def apply_softmax_sequences() -> Model[
     Tuple[List["DocumentPairInfo"], Floats2d], Floats2d
 ]:
@@ -670,6 +753,101 @@ def apply_softmax_sequences_forward(
     return model.ops.xp.split(softmax_output, cumsums.tolist()), backprop
 
 
+@dataclass
+class VectorsToSqueeze:
+    """The input passed to the first layer of each vector squeezer at inference time. Rather
+    than repeating the vector of a referrer or antecedent for each candidate pair in which it
+    occurs, each distinct vector is supplied once together with the indexes needed to expand
+    the squeezed rows to one row per candidate pair.
+    """
+
+    # One row for each referrer or antecedent
+    vectors: Floats2d
+
+    # For each row of *vectors*, the lemma or tuple of lemmas from whose vectors it was built,
+    # or *None* if the row cannot be reused, e.g. because it stems from a contextual vector
+    keys: List[Optional[Hashable]]
+
+    # For each candidate pair, the row of *vectors* it uses
+    indexes: Ints1d
+
+    tables: Dict[int, Dict[Hashable, Floats1d]]
+
+
+def reduced_vector_relu(nO: int) -> Model[Floats2d, Floats2d]:
+    """Returns a layer that is equivalent to, and serializes identically to, *Relu(nO)*,
+    except that at inference time it also accepts *VectorsToSqueeze*. In this case, the
+    projection of each vector is calculated only once for each layer and lemma and then
+    looked up from *VectorsToSqueeze.tables*, so that the full-width vectors are multiplied
+    with the weights only the first time a lemma is encountered rather than once for each
+    candidate pair in each document.
+    """
+    return Model(
+        "relu",
+        reduced_vector_relu_forward,
+        init=reduced_vector_relu_init,
+        dims={"nO": nO, "nI": None},
+        params={"W": None, "b": None},
+    )
+
+
+def reduced_vector_relu_init(
+    model: Model, X: Optional[Floats2d] = None, Y: Optional[Floats2d] = None
+) -> None:
+    if X is not None:
+        model.set_dim("nI", get_width(X))
+    if Y is not None:
+        model.set_dim("nO", get_width(Y))
+    model.set_param(
+        "W",
+        glorot_uniform_init(model.ops, (model.get_dim("nO"), model.get_dim("nI"))),
+    )
+    model.set_param("b", zero_init(model.ops, (model.get_dim("nO"),)))
+
+
+def reduced_vector_relu_forward(
+    model: Model, X: Union[Floats2d, VectorsToSqueeze], is_train: bool
+) -> Tuple[Floats2d, Callable]:
+    W = model.get_param("W")
+    b = model.get_param("b")
+    if isinstance(X, VectorsToSqueeze):
+
+        def backprop_vectors_to_squeeze(dY: Floats2d) -> Floats2d:
+            raise ValueError("VectorsToSqueeze is only supported at inference time.")
+
+        table = X.tables.setdefault(model.id, {})
+        projections: List[Optional[Floats1d]] = [
+            None if key is None else table.get(key) for key in X.keys
+        ]
+        missing_indexes = [
+            index for index, projection in enumerate(projections) if projection is None
+        ]
+        if len(missing_indexes) > 0:
+            for index, projection in zip(
+                missing_indexes,
+                model.ops.gemm(
+                    X.vectors[model.ops.asarray1i(missing_indexes)], W, trans2=True
+                ),
+            ):
+                projections[index] = projection
+                key = X.keys[index]
+                if key is not None and len(table) < REDUCED_VECTOR_TABLE_SIZE:
+                    # a copy, as a row would keep the whole output of *gemm()* alive
+                    table[key] = projection.copy()
+        Y = model.ops.relu(model.ops.xp.stack(projections) + b)
+        return Y[X.indexes], backprop_vectors_to_squeeze
+
+    Y = model.ops.relu(model.ops.gemm(X, W, trans2=True) + b)
+
+    def backprop(dY: Floats2d) -> Floats2d:
+        dY = model.ops.backprop_relu(dY, Y)
+        model.inc_grad("b", dY.sum(axis=0))
+        model.inc_grad("W", model.ops.gemm(dY, X, trans1=True))
+        return model.ops.gemm(dY, W)
+
+    return Y, backprop
+
+
 def get_referrers() -> Model[List["DocumentPairInfo"], List[Floats2d]]:
     return Model("get_referrers", referrers_forward)
 
@@ -682,6 +860,26 @@ def referrers_forward(
     def backprop(d_vectors: Floats2d) -> List["DocumentPairInfo"]:
         return []
 
+    if not is_train and document_pair_infos[0].reduced_vector_tables is not None:
+        return (
+            _get_vectors_to_squeeze(
+                model.ops,
+                document_pair_infos,
+                [
+                    [
+                        document_pair_info.doc[referrer]
+                        for referrer in document_pair_info.referrers.tolist()
+                    ]
+                    for document_pair_info in document_pair_infos
+                ],
+                [
+                    document_pair_info.referrers2candidates_pointers
+                    for document_pair_info in document_pair_infos
+                ],
+            ),
+            backprop,
+        )
+
     vectors_to_return = []
 
     for document_pair_info in document_pair_infos:
@@ -734,6 +932,31 @@ def antecedents_forward(
     def backprop(d_vectors: Floats2d) -> List["DocumentPairInfo"]:
         return []
 
+    if not is_train and document_pair_infos[0].reduced_vector_tables is not None:
+        return (
+            _get_vectors_to_squeeze(
+                model.ops,
+                document_pair_infos,
+                [
+                    [
+                        [
+                            document_pair_info.doc[cast(int, index[0])]
+                            for index in document_pair_info.antecedents[
+                                i
+                            ].dataXd.tolist()
+                        ]
+                        for i in range(len(document_pair_info.antecedents))
+                    ]
+                    for document_pair_info in document_pair_infos
+                ],
+                [
+                    cast(Ints1d, document_pair_info.candidates.dataXd)
+                    for document_pair_info in document_pair_infos
+                ],
+            ),
+            backprop,
+        )
+
     vectors_to_return = []
 
     for document_pair_info in document_pair_infos:
@@ -819,13 +1042,64 @@ def _empty_Ragged(ops: Ops, dtype: str) -> Ragged:
     return Ragged(ops.xp.zeros((0,), dtype=dtype), ops.alloc1i(0))
 
 
+def _get_vectors_to_squeeze(
+    ops: Ops,
+    document_pair_infos: List["DocumentPairInfo"],
+    tokens_or_token_lists: List[List[Union[Token, List[Token]]]],
+    indexes: List[Ints1d],
+) -> VectorsToSqueeze:
+    """Builds the input for the first layer of each vector squeezer at inference time.
+    *tokens_or_token_lists* contains, for each document pair info, the referrers or the
+    antecedents; each antecedent is a list of tokens whose vectors are averaged. *indexes*
+    contains, for each document pair info, the referrer or antecedent used by each candidate
+    pair.
+    """
+    vectors = []
+    keys: List[Optional[Hashable]] = []
+    offset_indexes = []
+    offset = 0
+    for this_document_tokens_or_token_lists, this_document_indexes in zip(
+        tokens_or_token_lists, indexes
+    ):
+        for token_or_token_list in this_document_tokens_or_token_lists:
+            if isinstance(token_or_token_list, Token):
+                vectors.append(token_or_token_list._.coref_chains.temp_vector)
+                keys.append(token_or_token_list._.coref_chains.temp_vector_key)
+            else:
+                vectors.append(
+                    ops.asarray1f(
+                        [token._.coref_chains.temp_vector for token in token_or_token_list]
+                    ).mean(  # type: ignore
+                        axis=0
+                    )
+                )
+                token_keys = tuple(
+                    token._.coref_chains.temp_vector_key for token in token_or_token_list
+                )
+                keys.append(None if None in token_keys else token_keys)
+        offset_indexes.append(ops.asarray1i(this_document_indexes) + offset)
+        offset += len(this_document_tokens_or_token_lists)
+    return VectorsToSqueeze(
+        vectors=ops.asarray2f(vectors),
+        keys=keys,
+        indexes=ops.xp.concatenate(offset_indexes),
+        tables=cast(
+            Dict[int, Dict[Hashable, Floats1d]],
+            document_pair_infos[0].reduced_vector_tables,
+        ),
+    )
+
+
 def _set_vectors(vectors_nlp: Language, ops: Ops, token: Token) -> None:
     if hasattr(token._.coref_chains, "temp_vector"):
         return
     if (not vectors_nlp.vocab[token.lemma_].has_vector) and len(token.vector) > 0:
         token._.coref_chains.temp_vector = token.vector
+        # The vector may depend on the context, so it is not associated with the lemma
+        token._.coref_chains.temp_vector_key = None
     else:
         token._.coref_chains.temp_vector = vectors_nlp.vocab[token.lemma_].vector
+        token._.coref_chains.temp_vector_key = token.lemma_
     if token != token.head:
         if (not vectors_nlp.vocab[token.head.lemma_].has_vector) and len(
             token.head.vector
@@ -4,7 +4,6 @@ import bisect
 import shutil
 import sys
 import time
-import pickle
 from datetime import datetime
 from random import Random
 from tqdm import tqdm  # type:ignore[import]
@@ -21,8 +20,9 @@ from thinc.types import Floats2d
 from .loaders import GenericLoader
 from ..annotation import Annotator
 from ..data_model import FeatureTable, Mention
-from ..manager import COMMON_MODELS_PACKAGE_NAMEPART, get_annotator
-from ..manager import FEATURE_TABLE_FILENAME, THINC_MODEL_FILENAME
+from ..manager import COMMON_MODELS_PACKAGE_NAMEPART, get_annotator, load_vectors_nlp
+from ..manager import ARTIFACT_FILENAME
+from ..artifact import write_artifact
 from ..rules import RulesAnalyzerFactory
 from ..tendencies import TendenciesAnalyzer, generate_feature_table, create_thinc_model
 from ..tendencies import DocumentPairInfo, ENSEMBLE_SIZE
@@ -129,8 +129,8 @@ class TrainingManager:
         if name not in self.nlp_dict:
             print("Loading model", name, "...")
             try:
-                nlp = spacy.load(name)
-            except OSError:
+                nlp = load_vectors_nlp(name) if is_vector_model else spacy.load(name)
+            except (OSError, ImportError):
                 if is_vector_model:
                     print(
                         "Config entry",
@@ -172,7 +172,7 @@ class TrainingManager:
             self.writeln(setup_cfg_file, "include_package_data = True")
             self.writeln(setup_cfg_file)
             self.writeln(setup_cfg_file, "[options.package_data]")
-            self.writeln(setup_cfg_file, "* = feature_table.bin, model")
+            self.writeln(setup_cfg_file, "* = ", ARTIFACT_FILENAME)
         pyproject_toml_filename = os.sep.join((self.models_dirname, "pyproject.toml"))
         with open(pyproject_toml_filename, "w") as pyproject_toml_file:
             self.writeln(pyproject_toml_file, "[build-system]")
@@ -476,15 +476,9 @@ class TrainingManager:
             init_py_filename = os.sep.join((this_model_dir, "__init__.py"))
             with open(init_py_filename, "w") as init_py_file:
                 self.writeln(init_py_file)
-            feature_table_filename = os.sep.join(
-                (this_model_dir, FEATURE_TABLE_FILENAME)
+            write_artifact(
+                os.sep.join((this_model_dir, ARTIFACT_FILENAME)), feature_table, model
             )
-            with open(feature_table_filename, "wb") as feature_table_file:
-                pickle.dump(feature_table, feature_table_file)
-            thinc_model_filename = "".join(
-                (this_model_dir, os.sep, THINC_MODEL_FILENAME)
-            )
-            model.to_disk(thinc_model_filename)
 
     def train_models(self):
         assert self.train_not_check
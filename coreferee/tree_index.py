@@ -0,0 +1,90 @@
+from typing import List, Tuple, Union
+from spacy.tokens import Doc
+
+
+class DependencyTreeIndex:
+    """Answers ancestor, depth and subtree questions about the dependency trees of a document
+    in constant time. The index is built once per document within *RulesAnalyzer.initialize()*
+    and is then queried instead of repeatedly materializing *token.ancestors* and
+    *token.subtree*.
+
+    Each token is assigned a position in a preorder (Euler-tour) traversal of its tree; the
+    subtree of a token then occupies the contiguous interval of positions starting at its
+    own position, so that ancestry can be decided by comparing two intervals.
+    """
+
+    def __init__(self, doc: Doc, verb_pos: Union[str, Tuple[str, ...]]):
+        token_count = len(doc)
+        heads = [token.head.i for token in doc]
+        children: List[List[int]] = [[] for _ in range(token_count)]
+        roots = []
+        for index, head_index in enumerate(heads):
+            if head_index == index:
+                roots.append(index)
+            else:
+                children[head_index].append(index)
+        is_verb = [token.pos_ in verb_pos for token in doc]
+
+        # Number of ancestors of each token
+        self.depths = [0] * token_count
+
+        # Number of ancestors of each token that are verbs
+        self.verb_ancestor_counts = [0] * token_count
+
+        # Position of each token within the preorder traversal
+        self.preorder_positions = [0] * token_count
+
+        # Number of tokens in the subtree of each token, including the token itself
+        self.subtree_sizes = [1] * token_count
+
+        # Token indexes in preorder traversal order
+        self.preorder: List[int] = []
+
+        for root_index in roots:
+            stack = [root_index]
+            while len(stack) > 0:
+                index = stack.pop()
+                self.preorder_positions[index] = len(self.preorder)
+                self.preorder.append(index)
+                for child_index in reversed(children[index]):
+                    self.depths[child_index] = self.depths[index] + 1
+                    self.verb_ancestor_counts[child_index] = self.verb_ancestor_counts[
+                        index
+                    ] + (1 if is_verb[index] else 0)
+                    stack.append(child_index)
+        for index in reversed(self.preorder):
+            if heads[index] != index:
+                self.subtree_sizes[heads[index]] += self.subtree_sizes[index]
+
+    def depth(self, token_index: int) -> int:
+        """Returns the number of ancestors of the token at *token_index*."""
+        return self.depths[token_index]
+
+    def verb_ancestor_count(self, token_index: int) -> int:
+        """Returns the number of ancestors of the token at *token_index* that are verbs."""
+        return self.verb_ancestor_counts[token_index]
+
+    def is_in_subtree(self, root_index: int, token_index: int) -> bool:
+        """Returns *True* if the token at *token_index* is within the subtree of the token at
+        *root_index*, which includes the case where the two indexes are the same."""
+        root_position = self.preorder_positions[root_index]
+        return (
+            root_position
+            <= self.preorder_positions[token_index]
+            < root_position + self.subtree_sizes[root_index]
+        )
+
+    def is_ancestor(self, ancestor_index: int, token_index: int) -> bool:
+        """Returns *True* if the token at *ancestor_index* is one of the ancestors of the
+        token at *token_index*."""
+        return ancestor_index != token_index and self.is_in_subtree(
+            ancestor_index, token_index
+        )
+
+    def subtree_indexes(self, root_index: int) -> List[int]:
+        """Returns the sorted indexes of the tokens within the subtree of the token at
+        *root_index*."""
+        root_position = self.preorder_positions[root_index]
+        return sorted(
+            self.preorder[root_position : root_position + self.subtree_sizes[root_index]]
+        )
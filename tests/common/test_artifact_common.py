@@ -0,0 +1,122 @@
+import os
+import pickle
+import sys
+import tempfile
+import pytest
+import spacy
+import coreferee.artifact
+from coreferee.artifact import read_artifact, write_artifact
+from coreferee.errors import ModelArtifactError
+from coreferee.manager import get_legacy_model_fingerprint, has_current_artifact
+from coreferee.manager import load_model
+from coreferee.rules import RulesAnalyzerFactory
+from coreferee.tendencies import TendenciesAnalyzer, DocumentPairInfo
+from coreferee.tendencies import create_thinc_model, generate_feature_table
+from thinc.backends import get_current_ops
+
+ops = get_current_ops()
+
+
+@pytest.fixture
+def setup_model():
+    nlp = spacy.load("en_core_web_sm")
+    rules_analyzer = RulesAnalyzerFactory().get_rules_analyzer(nlp)
+    doc = nlp("Sarah's sister flew to Silicon Valley via Berlin. She loved it.")
+    rules_analyzer.initialize(doc)
+    feature_table = generate_feature_table([doc], nlp)
+    tendencies_analyzer = TendenciesAnalyzer(rules_analyzer, nlp, feature_table)
+    doc[10]._.coref_chains.temp_potential_referreds[2].true_in_training = True
+    doc[12]._.coref_chains.temp_potential_referreds[0].true_in_training = True
+    training_dpi = DocumentPairInfo.from_doc(
+        doc, tendencies_analyzer, 5, is_train=True
+    )
+    model = create_thinc_model()
+    model.initialize(X=[training_dpi], Y=training_dpi.training_outputs)
+    dpi = DocumentPairInfo.from_doc(doc, tendencies_analyzer, 5)
+    return feature_table, model, dpi
+
+
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_artifact_round_trip(setup_model, memory_map):
+    feature_table, model, dpi = setup_model
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.sep.join((temp_dir, "coreferee_model.bin"))
+        write_artifact(filename, feature_table, model)
+        read_feature_table, read_model = read_artifact(
+            filename, memory_map=memory_map
+        )
+        assert read_feature_table.__dict__ == feature_table.__dict__
+        for expected, actual in zip(model.predict([dpi]), read_model.predict([dpi])):
+            assert ops.xp.allclose(expected, actual)
+        del read_model
+
+
+def test_artifact_wrong_file(setup_model):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.sep.join((temp_dir, "model"))
+        setup_model[1].to_disk(filename)
+        with pytest.raises(ModelArtifactError):
+            read_artifact(filename)
+
+
+def test_artifact_node_names_mismatch(setup_model, monkeypatch):
+    def create_renamed_thinc_model():
+        model = create_thinc_model()
+        list(model.walk())[1].name = "renamed"
+        return model
+
+    feature_table, model, _ = setup_model
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.sep.join((temp_dir, "coreferee_model.bin"))
+        write_artifact(filename, feature_table, model)
+        monkeypatch.setattr(
+            coreferee.artifact, "create_thinc_model", create_renamed_thinc_model
+        )
+        with pytest.raises(ModelArtifactError, match="node 1 is '.*' in the artifact"):
+            read_artifact(filename, memory_map=False)
+
+
+def test_converted_artifact_stale_after_reinstall(setup_model, monkeypatch):
+    def install_legacy_model(package_dirname, feature_table, model):
+        with open(os.sep.join((package_dirname, "feature_table.bin")), "wb") as file:
+            pickle.dump(feature_table, file)
+        model.to_disk(os.sep.join((package_dirname, "model")))
+
+    feature_table, model, _ = setup_model
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_dirname = os.sep.join((temp_dir, "coreferee_model_xx", "reinstall"))
+        os.makedirs(package_dirname)
+        for dirname in (os.path.dirname(package_dirname), package_dirname):
+            open(os.sep.join((dirname, "__init__.py")), "w").close()
+        monkeypatch.syspath_prepend(temp_dir)
+        monkeypatch.delitem(sys.modules, "coreferee_model_xx", raising=False)
+        monkeypatch.delitem(sys.modules, "coreferee_model_xx.reinstall", raising=False)
+        install_legacy_model(package_dirname, feature_table, model)
+        package_name = "coreferee_model_xx.reinstall"
+        # as written by *convert_installed_models()*
+        write_artifact(
+            os.sep.join((package_dirname, "coreferee_model.bin")),
+            feature_table,
+            model,
+            source_fingerprint=get_legacy_model_fingerprint(package_name),
+        )
+        assert has_current_artifact(package_name)
+        _, _, artifact_filename = load_model("xx", "reinstall")
+        assert artifact_filename is not None
+
+        # reinstalling the package replaces the legacy files but not the artifact
+        new_model = create_thinc_model().from_bytes(model.to_bytes())
+        node = next(node for node in new_model.walk() if len(node.param_names) > 0)
+        param_name = next(
+            param_name for param_name in node.param_names if node.has_param(param_name)
+        )
+        node.set_param(param_name, node.get_param(param_name) * 2)
+        install_legacy_model(package_dirname, feature_table, new_model)
+        assert not has_current_artifact(package_name)
+        _, read_model, artifact_filename = load_model("xx", "reinstall")
+        assert artifact_filename is None
+        read_node = list(read_model.walk())[list(new_model.walk()).index(node)]
+        assert ops.xp.allclose(
+            node.get_param(param_name), read_node.get_param(param_name)
+        )
+        del read_model
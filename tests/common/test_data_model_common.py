@@ -1,5 +1,5 @@
 import unittest
-from coreferee.data_model import Mention
+from coreferee.data_model import EMPTY_CHAIN_HOLDER, Mention
 from coreferee.rules import RulesAnalyzerFactory
 from coreferee.test_utils import get_nlps
 
@@ -87,6 +87,27 @@ class CommonDataModelTest(unittest.TestCase):
                     found = True
         self.assertTrue(found)
 
+    def test_resolve_all(self):
+        doc = self.sm_nlp(
+            "I spoke to Mr. Platt. The man and Richard came in. They and Peter said hello. They were all here."
+        )
+        resolution_table = doc._.coref_chains.resolve_all(doc)
+        self.assertEqual(len(doc), len(resolution_table))
+        self.assertEqual([4, 9, 15], resolution_table.get_referent_indexes(19))
+        self.assertIsNone(resolution_table.get_referent_indexes(4))
+        self.assertIsNone(resolution_table.get_referent_indexes(1))
+        for token in doc:
+            resolved_tokens = doc._.coref_chains.resolve(token)
+            self.assertEqual(
+                None
+                if resolved_tokens is None
+                else [resolved_token.i for resolved_token in resolved_tokens],
+                resolution_table.get_referent_indexes(token.i),
+            )
+        self.assertIs(resolution_table, doc._.coref_chains.resolve_all(doc))
+        doc._.coref_chains.chains = doc._.coref_chains.chains[:]
+        self.assertIsNot(resolution_table, doc._.coref_chains.resolve_all(doc))
+
     def test_representations_cataphora(self):
         doc = self.sm_nlp("Although he had gone out, Richard came back")
         self.assertEqual("[0: [1], [6]]", str(doc._.coref_chains))
@@ -120,3 +141,50 @@ class CommonDataModelTest(unittest.TestCase):
         self.assertEqual(1, doc._.coref_chains[0].most_specific_mention_index)
         self.assertEqual([doc[6]], doc._.coref_chains.resolve(doc[1]))
         self.assertEqual(None, doc._.coref_chains.resolve(doc[6]))
+
+    def test_temporary_attributes_discarded(self):
+        doc = self.sm_nlp("I saw Peter. He and Richard came in. They had arrived")
+        self.assertIsNone(doc._.coref_chains.scratch_arena)
+        self.assertFalse(hasattr(doc._.coref_chains, "temp_sent_starts"))
+        for token in doc:
+            self.assertFalse(hasattr(token._.coref_chains, "temp_potential_referreds"))
+            self.assertIsNone(token._.coref_chains.scratch_arena)
+            for chain in token._.coref_chains:
+                for mention in chain:
+                    self.assertIsNone(mention.scratch_arena)
+
+    def test_token_chain_holders(self):
+        doc = self.sm_nlp("I saw Peter. He and Richard came in. They had arrived")
+        self.assertEqual(
+            [2, 4, 6, 10], sorted(doc._.coref_chains.token_chain_holders)
+        )
+        self.assertIs(doc._.coref_chains.token_chain_holders[4], doc[4]._.coref_chains)
+        self.assertIs(EMPTY_CHAIN_HOLDER, doc[1]._.coref_chains)
+        self.assertIs(doc[1]._.coref_chains, doc[5]._.coref_chains)
+        self.assertEqual(0, len(doc[1]._.coref_chains))
+        with self.assertRaises(AttributeError):
+            doc[1]._.coref_chains.chains = []
+        with self.assertRaises(AttributeError):
+            doc[1]._.coref_chains.temp_governing_sibling = doc[0]
+        self.assertFalse(hasattr(doc[4]._.coref_chains, "__dict__"))
+        self.assertFalse(hasattr(doc._.coref_chains[0], "__dict__"))
+        self.assertFalse(hasattr(doc._.coref_chains[0][0], "__dict__"))
+
+    def test_temporary_attributes_held_in_arena(self):
+        doc = self.sm_nlp.make_doc("Peter came in. He sat down")
+        for name, processor in self.sm_nlp.pipeline:
+            if name != "coreferee":
+                doc = processor(doc)
+        self.sm_rules_analyzer.initialize(doc)
+        scratch_arena = doc._.coref_chains.scratch_arena
+        self.assertIs(scratch_arena, doc[4]._.coref_chains.scratch_arena)
+        self.assertEqual(
+            doc[4]._.coref_chains.temp_potential_referreds,
+            scratch_arena.get_entries(doc[4]._.coref_chains)[
+                "temp_potential_referreds"
+            ],
+        )
+        self.assertIs(doc[4]._.coref_chains, doc[4]._.coref_chains)
+        self.assertIsNone(doc[0]._.coref_chains.temp_governing_sibling)
+        scratch_arena.clear()
+        self.assertFalse(hasattr(doc[4]._.coref_chains, "temp_potential_referreds"))
@@ -0,0 +1,61 @@
+import unittest
+from coreferee.lexicon import Lexicon
+
+
+class CommonLexiconTest(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon(["Peter", "Richard", "Mary", "Peter"])
+
+    def test_membership(self):
+        self.assertIn("Peter", self.lexicon)
+        self.assertNotIn("peter", self.lexicon)
+        self.assertNotIn("Paul", self.lexicon)
+
+    def test_membership_ignoring_case(self):
+        self.assertTrue(self.lexicon.contains("peter", ignore_case=True))
+        self.assertTrue(self.lexicon.contains("PETER", ignore_case=True))
+        self.assertFalse(self.lexicon.contains("peter"))
+        self.assertFalse(self.lexicon.contains("paul", ignore_case=True))
+
+    def test_iteration_order_and_length(self):
+        self.assertEqual(["Peter", "Richard", "Mary"], list(self.lexicon))
+        self.assertEqual(3, len(self.lexicon))
+
+    def test_union(self):
+        union = self.lexicon.union(["Paul", "Mary"], Lexicon(["Jane"]))
+        self.assertEqual(["Peter", "Richard", "Mary", "Paul", "Jane"], list(union))
+
+    def test_difference(self):
+        difference = self.lexicon.difference(Lexicon(["Richard", "Jane"]))
+        self.assertEqual(["Peter", "Mary"], list(difference))
+
+    def test_phrase_trie(self):
+        phrases = Lexicon(
+            ["Of course", "the fact that", "that is that", "broken  phrase"]
+        )
+        words = "of course the fact that that is that is".split()
+        self.assertEqual(
+            {0, 1, 2, 3, 4, 5, 6}, phrases.phrase_trie.get_covered_indexes(words)
+        )
+        self.assertEqual(3, phrases.phrase_trie.maximum_length)
+        self.assertEqual(
+            set(), phrases.phrase_trie.get_covered_indexes(["broken", "phrase"])
+        )
+        self.assertIs(phrases.phrase_trie, phrases.phrase_trie)
+
+    def test_is_suffix_of_entry(self):
+        words = Lexicon(["Mädchen", "Fräulein"])
+        self.assertTrue(words.is_suffix_of_entry("Mädchen"))
+        self.assertTrue(words.is_suffix_of_entry("chen"))
+        self.assertTrue(words.is_suffix_of_entry("LEIN"))
+        self.assertFalse(words.is_suffix_of_entry("Kindermädchen"))
+        self.assertFalse(words.is_suffix_of_entry("Mäd"))
+        self.assertFalse(Lexicon([]).is_suffix_of_entry("chen"))
+
+    def test_has_entry_that_prefixes(self):
+        stems = Lexicon(["regn", "schnei"])
+        self.assertTrue(stems.has_entry_that_prefixes("regnen"))
+        self.assertTrue(stems.has_entry_that_prefixes("schnei"))
+        self.assertFalse(stems.has_entry_that_prefixes("Regnen"))
+        self.assertFalse(stems.has_entry_that_prefixes("reg"))
+        self.assertFalse(stems.has_entry_that_prefixes(""))
@@ -0,0 +1,63 @@
+import unittest
+from coreferee.mention_sets import MentionSets
+
+
+class CommonMentionSetsTest(unittest.TestCase):
+    def setUp(self):
+        self.mention_sets = MentionSets()
+        first_set = {"a"}
+        self.mention_sets.set_item(self.mention_sets.without_coordination, 0, first_set)
+        self.mention_sets.add_mentions(first_set, ["b"])
+        self.mention_sets.set_item(self.mention_sets.without_coordination, 2, first_set)
+
+    def get_state(self):
+        return {
+            key: sorted(value)
+            for key, value in self.mention_sets.without_coordination.items()
+        }, dict(self.mention_sets.referred_indexes)
+
+    def make_changes(self):
+        self.mention_sets.mark_anaphor(5)
+        self.mention_sets.set_item(self.mention_sets.referred_indexes, 5, 1)
+        mention_set = self.mention_sets.without_coordination[0]
+        self.mention_sets.add_mentions(mention_set, ["c", "a"])
+        self.mention_sets.set_item(self.mention_sets.without_coordination, 5, mention_set)
+        self.mention_sets.set_item(self.mention_sets.without_coordination, 0, {"d"})
+
+    def test_rollback(self):
+        before = self.get_state()
+        checkpoint = self.mention_sets.checkpoint()
+        self.make_changes()
+        self.assertEqual(checkpoint, self.mention_sets.anaphor_checkpoints[5])
+        self.assertNotEqual(before, self.get_state())
+        self.mention_sets.rollback(checkpoint)
+        self.assertEqual(before, self.get_state())
+        self.assertEqual({}, self.mention_sets.anaphor_checkpoints)
+        self.assertEqual(checkpoint, self.mention_sets.checkpoint())
+
+    def test_rollback_and_reapply(self):
+        checkpoint = self.mention_sets.checkpoint()
+        self.make_changes()
+        after = self.get_state()
+        undone_entries = self.mention_sets.rollback(checkpoint)
+        self.mention_sets.set_item(self.mention_sets.referred_indexes, 5, 2)
+        self.mention_sets.add_mentions(self.mention_sets.without_coordination[0], ["e"])
+        self.mention_sets.rollback(checkpoint)
+        self.mention_sets.reapply(undone_entries)
+        self.assertEqual(after, self.get_state())
+        self.assertEqual({5: checkpoint}, self.mention_sets.anaphor_checkpoints)
+        self.assertEqual(
+            ["a", "b", "c"], sorted(self.mention_sets.without_coordination[2])
+        )
+
+    def test_unchanged_values_not_logged(self):
+        checkpoint = self.mention_sets.checkpoint()
+        self.mention_sets.set_item(
+            self.mention_sets.without_coordination,
+            2,
+            self.mention_sets.without_coordination[0],
+        )
+        self.mention_sets.add_mentions(
+            self.mention_sets.without_coordination[0], ["a", "b"]
+        )
+        self.assertEqual(checkpoint, self.mention_sets.checkpoint())
@@ -225,9 +225,72 @@ class CommonRulesTest(unittest.TestCase):
                 ),
                 nlp.meta["name"],
             )
+            if expected_truth:
+                noun_index = doc._.coref_chains.temp_coreferring_noun_index
+                self.assertTrue(
+                    noun_index.may_corefer(referred_index, referring_index),
+                    nlp.meta["name"],
+                )
+                self.assertIn(
+                    referred_index,
+                    noun_index.get_candidate_indexes(referring_index, 0),
+                    nlp.meta["name"],
+                )
 
         self.all_nlps(func)
 
+    def test_coreferring_noun_index_candidates(self):
+        def func(nlp):
+            doc = nlp("Peter Smith saw a dog. The company and Smith liked the dog")
+            rules_analyzer = RulesAnalyzerFactory().get_rules_analyzer(nlp)
+            rules_analyzer.initialize(doc)
+            noun_index = doc._.coref_chains.temp_coreferring_noun_index
+            self.assertEqual([1], noun_index.get_candidate_indexes(9, 0))
+            self.assertEqual([4], noun_index.get_candidate_indexes(12, 0))
+            self.assertEqual([], noun_index.get_candidate_indexes(12, 6))
+            self.assertFalse(noun_index.may_corefer(4, 9))
+
+        self.all_nlps(func)
+
+    def test_pair_predicate_cache(self):
+        doc = self.sm_nlp("Richard arrived. He said he was tired")
+        self.sm_rules_analyzer.initialize(doc)
+        pair_predicate_cache = doc._.coref_chains.temp_pair_predicate_cache
+        hits = pair_predicate_cache.hits.get("is_potential_anaphoric_pair", 0)
+        result = self.sm_rules_analyzer.is_potential_anaphoric_pair(
+            Mention(doc[0], False), doc[5], False
+        )
+        self.assertEqual(
+            result,
+            self.sm_rules_analyzer.is_potential_anaphoric_pair(
+                Mention(doc[0], False), doc[5], False
+            ),
+        )
+        self.assertEqual(
+            hits + 1, pair_predicate_cache.hits["is_potential_anaphoric_pair"]
+        )
+        self.assertGreater(
+            pair_predicate_cache.hit_rate("is_potential_anaphoric_pair"), 0.0
+        )
+        self.assertEqual(0.0, pair_predicate_cache.hit_rate("unknown"))
+
+    def test_lexical_compatibility_cache_shared_between_docs(self):
+        cache = self.sm_rules_analyzer.lexical_compatibility_cache
+        cache.clear()
+        results = []
+        for text in ("The company arrived. He was tired", "A company came. He was tired"):
+            doc = self.sm_nlp.make_doc(text)
+            for name, processor in self.sm_nlp.pipeline:
+                if name != "coreferee":
+                    doc = processor(doc)
+            self.sm_rules_analyzer.initialize(doc)
+            results.append(
+                self.sm_rules_analyzer.get_lexical_compatibility(doc[1], doc[4], True)
+            )
+        self.assertEqual([0, 0], results)
+        self.assertGreater(cache.hits, 0)
+        self.assertLessEqual(len(cache.results), cache.maximum_size)
+
     def test_potential_noun_pair_proper_noun_referred(self):
         self.compare_potential_noun_pair("This is Peter. Peter is here", 2, 4, True)
 
@@ -1,12 +1,19 @@
 import unittest
 import os
+import gc
+import weakref
+import pickle
 from multiprocessing import Process, Manager, Queue as m_Queue
 from queue import Queue
-from threading import Thread
+from threading import Event, Thread
+from unittest.mock import patch
 import spacy
 from spacy.tokens import Doc
 from thinc.util import prefer_gpu, require_cpu
 from coreferee.test_utils import get_nlps
+from coreferee.errors import InvalidSettingError
+from coreferee.manager import annotator_registry, AnnotatorRegistry
+from coreferee.manager import CorefereeBroker, CorefereeManager
 
 NUMBER_OF_THREADS = 50
 NUMBER_OF_PROCESSES = 2
@@ -111,6 +118,27 @@ class CommonUtilsTest(unittest.TestCase):
         self.assertEqual(0, doc2._.coref_chains[0].most_specific_mention_index)
         self.assertEqual([doc2[0]], doc2._.coref_chains.resolve(doc2[2]))
 
+    def test_serialization_columns(self):
+        doc = self.sm_nlp("I saw Peter. He and Richard came in. They had arrived")
+        b = doc.to_bytes()
+        doc = None
+        doc2 = Doc(self.sm_nlp.vocab).from_bytes(b)
+        chain_columns = doc2._.coref_chains.chain_columns
+        self.assertEqual([0, 2, 4], chain_columns.chain_offsets.tolist())
+        self.assertEqual([0, 1, 2, 4, 5], chain_columns.mention_offsets.tolist())
+        self.assertEqual([2, 4, 4, 6, 10], chain_columns.token_indexes.tolist())
+        self.assertEqual(
+            ["Peter", "He", "He", "Richard", "They"], chain_columns.token_texts
+        )
+        self.assertIsNone(doc2._.coref_chains._chains)
+        self.assertEqual(2, len(doc2._.coref_chains))
+        self.assertEqual(
+            "0: Peter(2), He(4); 1: [He(4); Richard(6)], They(10)",
+            doc2._.coref_chains.pretty_representation,
+        )
+        self.assertIs(doc2._.coref_chains[1], doc2[6]._.coref_chains[0])
+        self.assertEqual("[]", str(doc2[5]._.coref_chains))
+
     def test_processing_in_pipe_1_cpu(self):
         doc_texts = [
             "Peter told Paul he was dissatisfied.",
@@ -126,6 +154,37 @@ class CommonUtilsTest(unittest.TestCase):
         self.assertEqual("[]", str(docs[1][1]._.coref_chains))
         self.assertEqual("[0: [0], [2]]", str(docs[1][2]._.coref_chains))
 
+    def test_processing_in_pipe_after_batch_failure(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee")
+        annotator = nlp.get_pipe("coreferee").annotator
+        annotate_scored_doc = annotator.annotate_scored_doc
+        failed_docs = []
+
+        def fail_once_on_second_doc(doc, *args, **kwargs):
+            if doc.text.startswith("Richard") and len(failed_docs) == 0:
+                failed_docs.append(doc)
+                raise RuntimeError("Simulated failure")
+            return annotate_scored_doc(doc, *args, **kwargs)
+
+        doc_texts = [
+            "Peter told Paul he was dissatisfied.",
+            "Richard said he was dissatisfied",
+            "Peter said he was dissatisfied",
+        ]
+        with patch.object(
+            annotator, "annotate_scored_doc", side_effect=fail_once_on_second_doc
+        ), patch.object(annotator, "annotate", wraps=annotator.annotate) as annotate:
+            docs = list(nlp.pipe(doc_texts))
+        self.assertEqual(1, len(failed_docs))
+        self.assertEqual(
+            ["Richard said he was dissatisfied", "Peter said he was dissatisfied"],
+            [call[0][0].text for call in annotate.call_args_list],
+        )
+        self.assertEqual("[0: [0], [3]]", str(docs[0]._.coref_chains))
+        self.assertEqual("[0: [0], [2]]", str(docs[1]._.coref_chains))
+        self.assertEqual("[0: [0], [2]]", str(docs[2]._.coref_chains))
+
     def test_processing_in_pipe_2_cpu(self):
         nlp = spacy.load("en_core_web_sm")
         nlp.add_pipe("coreferee")
@@ -143,6 +202,246 @@ class CommonUtilsTest(unittest.TestCase):
         self.assertEqual("[]", str(docs[1][1]._.coref_chains))
         self.assertEqual("[0: [0], [2]]", str(docs[1][2]._.coref_chains))
 
+    def test_token_chains_disabled(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee", config={"token_chains": False})
+        doc = nlp("Peter told Paul he was dissatisfied.")
+        self.assertEqual("[0: [0], [3]]", str(doc._.coref_chains))
+        self.assertIsNone(doc._.coref_chains.token_chain_holders)
+        self.assertEqual("[0: [0], [3]]", str(doc[0]._.coref_chains))
+        self.assertEqual("[]", str(doc[2]._.coref_chains))
+        self.assertEqual("[0: [0], [3]]", str(doc[3]._.coref_chains))
+        self.assertEqual([doc[0]], doc._.coref_chains.resolve(doc[3]))
+
+    def test_settings(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe(
+            "coreferee",
+            config={
+                "retry_depth": 2,
+                "ensemble_size": 1,
+                "maximum_anaphora_sentence_referential_distance": 3,
+            },
+        )
+        annotator = nlp.get_pipe("coreferee").annotator
+        self.assertEqual(2, annotator.RETRY_DEPTH)
+        self.assertEqual(
+            3, annotator.rules_analyzer.maximum_anaphora_sentence_referential_distance
+        )
+        self.assertEqual(
+            2,
+            annotator.rules_analyzer.maximum_coreferring_nouns_sentence_referential_distance,
+        )
+        self.assertIsNot(annotator.thinc_ensemble, annotator.trained_thinc_ensemble)
+        shared_annotator = CorefereeManager.get_annotator(nlp)
+        self.assertEqual(5, shared_annotator.RETRY_DEPTH)
+        self.assertEqual(
+            5,
+            shared_annotator.rules_analyzer.maximum_anaphora_sentence_referential_distance,
+        )
+        self.assertIs(annotator.trained_thinc_ensemble, shared_annotator.thinc_ensemble)
+        doc = nlp("Peter said he was dissatisfied.")
+        self.assertEqual("[0: [0], [2]]", str(doc._.coref_chains))
+
+    def test_invalid_settings(self):
+        nlp = spacy.load("en_core_web_sm")
+        with self.assertRaises(InvalidSettingError):
+            nlp.add_pipe("coreferee", config={"ensemble_size": 6})
+        with self.assertRaises(InvalidSettingError):
+            nlp.add_pipe("coreferee", config={"retry_depth": 0})
+        with self.assertRaises(InvalidSettingError):
+            nlp.add_pipe(
+                "coreferee",
+                config={"maximum_coreferring_nouns_sentence_referential_distance": -1},
+            )
+        with self.assertRaises(InvalidSettingError):
+            nlp.add_pipe("coreferee", config={"time_budget": 0})
+
+    def test_time_budget_used_up(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee", config={"time_budget": 1e-9})
+        doc = nlp("Peter said he was dissatisfied.")
+        self.assertEqual("[]", str(doc._.coref_chains))
+        self.assertEqual(
+            ("retries", "scoring", "annotation"), doc._.coref_chains.skipped_stages
+        )
+        doc2 = Doc(nlp.vocab).from_bytes(doc.to_bytes())
+        self.assertEqual(
+            ("retries", "scoring", "annotation"), doc2._.coref_chains.skipped_stages
+        )
+
+    def test_time_budget_not_used_up(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee", config={"time_budget": 60.0})
+        doc = nlp("Peter said he was dissatisfied.")
+        self.assertEqual("[0: [0], [2]]", str(doc._.coref_chains))
+        self.assertEqual((), doc._.coref_chains.skipped_stages)
+
+    def test_time_budget_charged_per_doc_in_pipe(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee", config={"time_budget": 0.5})
+        annotator = nlp.get_pipe("coreferee").annotator
+        initialize = annotator.rules_analyzer.initialize
+        score_docs = annotator.tendencies_analyzer.score_docs
+        # a fake clock that only advances when the work below says so
+        clock = [0.0]
+
+        def initialize_slowly_for_first_doc(doc):
+            if doc.text.startswith("Richard"):
+                clock[0] += 0.6
+            initialize(doc)
+
+        def score_docs_slowly(docs, thinc_ensemble):
+            clock[0] += 0.2
+            score_docs(docs, thinc_ensemble)
+
+        with patch(
+            "coreferee.annotation.perf_counter", side_effect=lambda: clock[0]
+        ), patch.object(
+            annotator.rules_analyzer,
+            "initialize",
+            side_effect=initialize_slowly_for_first_doc,
+        ), patch.object(
+            annotator.tendencies_analyzer, "score_docs", side_effect=score_docs_slowly
+        ):
+            docs = list(
+                nlp.pipe(
+                    [
+                        "Richard said he was dissatisfied.",
+                        "Peter said he was dissatisfied.",
+                    ]
+                )
+            )
+        self.assertEqual(
+            ("retries", "scoring", "annotation"), docs[0]._.coref_chains.skipped_stages
+        )
+        # only the second document was scored, so it is charged all the scoring time
+        self.assertEqual("[0: [0], [2]]", str(docs[1]._.coref_chains))
+        self.assertEqual(("retries",), docs[1]._.coref_chains.skipped_stages)
+
+    def test_order_by_rules(self):
+        doc = self.sm_nlp.make_doc("Peter told Paul he was dissatisfied.")
+        for name, processor in self.sm_nlp.pipeline:
+            if name != "coreferee":
+                doc = processor(doc)
+        annotator = self.sm_nlp.get_pipe("coreferee").annotator
+        annotator.rules_analyzer.initialize(doc)
+        annotator.order_by_rules(doc)
+        annotator.annotate_scored_doc(doc)
+        self.assertEqual("[0: [2], [3]]", str(doc._.coref_chains))
+
+    def test_pickling_rebinds_to_unpickled_pipeline(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee")
+        unpickled_nlp = pickle.loads(pickle.dumps(nlp))
+        self.assertIs(unpickled_nlp, unpickled_nlp.get_pipe("coreferee").nlp)
+        doc = unpickled_nlp("Peter told Paul he was dissatisfied.")
+        self.assertEqual("[0: [0], [3]]", str(doc._.coref_chains))
+
+    def test_unpickling_does_not_access_pipeline(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee")
+        broker = nlp.get_pipe("coreferee")
+        state = broker.__getstate__()
+        unpickled_broker = CorefereeBroker.__new__(CorefereeBroker)
+        # the pipeline is not yet restored when the broker is unpickled with it
+        unpickled_broker.__setstate__(dict(state, nlp=None))
+        self.assertIsNone(unpickled_broker.nlp)
+        self.assertEqual(broker.settings, unpickled_broker.settings)
+        unpickled_broker.nlp = nlp
+        repickled_broker = pickle.loads(pickle.dumps(unpickled_broker))
+        doc = nlp.make_doc("Peter told Paul he was dissatisfied.")
+        for _, component in nlp.pipeline:
+            if component is not broker:
+                doc = component(doc)
+        doc = repickled_broker(doc)
+        self.assertEqual("[0: [0], [3]]", str(doc._.coref_chains))
+
+    def test_annotator_shared_between_pipelines(self):
+        first_nlp = spacy.load("en_core_web_sm")
+        first_nlp.add_pipe("coreferee")
+        second_nlp = spacy.load("en_core_web_sm")
+        second_nlp.add_pipe("coreferee")
+        first_annotator = first_nlp.get_pipe("coreferee").annotator
+        second_annotator = second_nlp.get_pipe("coreferee").annotator
+        self.assertIsNot(first_annotator, second_annotator)
+        self.assertIs(
+            first_annotator.trained_thinc_ensemble,
+            second_annotator.trained_thinc_ensemble,
+        )
+        self.assertIs(
+            first_annotator.tendencies_analyzer.feature_table,
+            second_annotator.tendencies_analyzer.feature_table,
+        )
+        self.assertIs(first_nlp, first_annotator.tendencies_analyzer.vectors_nlp)
+        self.assertIs(second_nlp, second_annotator.tendencies_analyzer.vectors_nlp)
+        memory_usage = annotator_registry.get_memory_usage()
+        self.assertTrue(
+            any(
+                description.startswith("en_core_web_sm") and number_of_bytes > 0
+                for description, number_of_bytes in memory_usage.items()
+            )
+        )
+        CorefereeManager.get_annotator(first_nlp, memory_map_vectors=True)
+        CorefereeManager.get_annotator(first_nlp, vectors_lemmas=["house"])
+        self.assertGreaterEqual(
+            len(
+                [
+                    description
+                    for description in annotator_registry.get_memory_usage()
+                    if description.startswith("en_core_web_sm")
+                ]
+            ),
+            3,
+        )
+        self.assertGreaterEqual(annotator_registry.evict("en"), 3)
+        third_nlp = spacy.load("en_core_web_sm")
+        third_nlp.add_pipe("coreferee")
+        self.assertIsNot(
+            first_annotator.trained_thinc_ensemble,
+            third_nlp.get_pipe("coreferee").annotator.trained_thinc_ensemble,
+        )
+        doc = first_nlp("Peter told Paul he was dissatisfied.")
+        self.assertEqual("[0: [0], [3]]", str(doc._.coref_chains))
+
+    def test_registry_loads_models_for_different_keys_concurrently(self):
+        class FakeModel:
+            def bind(self, nlp):
+                return nlp
+
+        registry = AnnotatorRegistry()
+        first_model_requested = Event()
+        release_first_model = Event()
+
+        def create_first_model():
+            first_model_requested.set()
+            release_first_model.wait(10)
+            return FakeModel()
+
+        thread = Thread(
+            target=registry.get_annotator, args=(("first",), None, create_first_model)
+        )
+        thread.start()
+        try:
+            self.assertTrue(first_model_requested.wait(10))
+            # would wait for the first model if all models were created under one lock
+            self.assertEqual(
+                "nlp", registry.get_annotator(("second",), "nlp", FakeModel)
+            )
+            self.assertFalse(release_first_model.is_set())
+        finally:
+            release_first_model.set()
+            thread.join()
+        self.assertEqual(2, len(registry.key_to_model))
+
+    def test_registry_does_not_keep_pipelines_alive(self):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.add_pipe("coreferee")
+        nlp_reference = weakref.ref(nlp)
+        del nlp
+        gc.collect()
+        self.assertIsNone(nlp_reference())
+
     def test_use_in_multithreading_context(self):
         def parse(text, queue):
             queue.put(self.sm_nlp(text))
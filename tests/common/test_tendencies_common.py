@@ -595,6 +595,44 @@ class CommonTendenciesTest(unittest.TestCase):
         )
         self.assertEqual([2, 2, 2, 0, 0, 0, 0], position_map)
 
+    def test_get_position_map_matches_per_token_calculation(self):
+
+        doc = self.sm_nlp(
+            "He saw her. Peter told Paul that he had seen them in the big house yesterday."
+        )
+        self.sm_rules_analyzer.initialize(doc)
+        for token in doc:
+            ancestor_count = len(list(token.ancestors))
+            expected_position_map = [
+                token.i - token.sent.start,
+                ancestor_count,
+                len(
+                    [
+                        ancestor
+                        for ancestor in token.ancestors
+                        if ancestor.pos_ in self.sm_rules_analyzer.verb_pos
+                    ]
+                ),
+                len(
+                    [
+                        1
+                        for token_in_sentence in token.sent
+                        if token_in_sentence.i < token.i
+                        and len(list(token_in_sentence.ancestors)) == ancestor_count
+                    ]
+                ),
+                -1
+                if token.dep_ == self.sm_rules_analyzer.root_dep
+                else sorted([child.i for child in token.head.children]).index(
+                    token.i
+                ),
+            ]
+            self.assertEqual(
+                expected_position_map,
+                self.sm_tendencies_analyzer.get_position_map(token, doc)[:5],
+                token.text,
+            )
+
     def test_get_position_map_root_token(self):
 
         doc = self.sm_nlp("Richard said he was entering the big house")
@@ -2,6 +2,7 @@ from logging import debug
 from xml.dom.minidom import Document
 import pytest
 import spacy
+import coreferee.tendencies
 from coreferee.rules import RulesAnalyzerFactory
 from coreferee.tendencies import *
 from coreferee.test_utils import get_nlps
@@ -84,7 +85,7 @@ def test_dpi_normal(setup_simple_example):
         referrer = document_pair_info.referrers[pointed_to_referrer]
         referrer_feature_map = document_pair_info.doc[
             referrer
-        ]._.coref_chains.temp_feature_map
+        ]._.coref_chains.temp_feature_array
         assert list(document_pair_info.static_infos[index][:33]) == list(
             referrer_feature_map
         )
@@ -98,7 +99,7 @@ def test_dpi_normal(setup_simple_example):
         working_mention = document_pair_info.doc[
             referrer
         ]._.coref_chains.temp_potential_referreds[working_antecedent_index]
-        antecedent_feature_map = working_mention.temp_feature_map
+        antecedent_feature_map = working_mention.temp_feature_array
         assert list(document_pair_info.static_infos[index][40:73]) == list(
             antecedent_feature_map
         )
@@ -203,6 +204,50 @@ def test_referrer_vectors(setup_three_sentences_with_conjunction):
         )
 
 
+def test_reduced_vector_relu(setup_three_sentences_with_conjunction):
+    document_pair_info, _ = setup_three_sentences_with_conjunction
+    for forward, layer in (
+        (referrers_forward, get_referrers()),
+        (antecedents_forward, get_antecedents()),
+    ):
+        document_pair_info.reduced_vector_tables = None
+        vectors, _ = forward(layer, [document_pair_info], False)
+        relu = reduced_vector_relu(24)
+        relu.initialize(X=vectors)
+        expected = relu.predict(vectors)
+        document_pair_info.reduced_vector_tables = {}
+        vectors_to_squeeze, _ = forward(layer, [document_pair_info], False)
+        assert len(vectors_to_squeeze.vectors) <= len(vectors)
+        assert ops.xp.allclose(relu.predict(vectors_to_squeeze), expected, atol=1e-5)
+        # the second time, any projections of lemma vectors are looked up from the tables
+        assert ops.xp.allclose(relu.predict(vectors_to_squeeze), expected, atol=1e-5)
+
+
+def test_reduced_vector_tables_hold_bounded_copies(
+    setup_three_sentences_with_conjunction, monkeypatch
+):
+    document_pair_info, _ = setup_three_sentences_with_conjunction
+    document_pair_info.reduced_vector_tables = {}
+    vectors_to_squeeze, _ = antecedents_forward(
+        get_antecedents(), [document_pair_info], False
+    )
+    relu = reduced_vector_relu(24)
+    relu.initialize(X=vectors_to_squeeze.vectors)
+    relu.predict(vectors_to_squeeze)
+    for table in document_pair_info.reduced_vector_tables.values():
+        for projection in table.values():
+            assert projection.base is None
+    monkeypatch.setattr(coreferee.tendencies, "REDUCED_VECTOR_TABLE_SIZE", 1)
+    document_pair_info.reduced_vector_tables = {}
+    vectors_to_squeeze, _ = antecedents_forward(
+        get_antecedents(), [document_pair_info], False
+    )
+    relu.predict(vectors_to_squeeze)
+    assert all(
+        len(table) <= 1 for table in document_pair_info.reduced_vector_tables.values()
+    )
+
+
 def test_referrer_head_vectors(setup_three_sentences_with_conjunction):
     document_pair_info, nlp = setup_three_sentences_with_conjunction
     vector_size = 96 if nlp.meta["name"].endswith("sm") else 300
@@ -275,3 +320,7 @@ def test_generate_feature_table(setup_simple_example):
     }
 
     assert len(feature_table) == 33
+    index_maps = feature_table.get_index_maps()
+    assert index_maps["tags"] == {"NN": 0, "NNP": 1, "PRP": 2}
+    assert index_maps["morphs"]["Case=Nom"] == 4
+    assert index_maps["parent_righthand_deps_to_children"]["punct"] == 32